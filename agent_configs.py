@@ -0,0 +1,278 @@
+"""
+Talos agency endpoints and prompt builders for every agent.
+Each page imports its API_CONFIGS from here, and the full-analysis pipeline
+uses them all to chain upstream outputs into downstream prompts.
+"""
+import os
+
+# ===============================
+# 🌐 Talos Endpoint
+# ===============================
+
+# Set TALOS_BASE_URL to send every agency call to another host, e.g. a local
+# talos_stub.py server for offline runs and benchmarks
+TALOS_BASE_URL = os.environ.get("TALOS_BASE_URL", "https://eoc.mu-sigma.com").rstrip("/")
+REASONING_API_URL = f"{TALOS_BASE_URL}/talos-engine/agency/reasoning_api"
+SOCIETY_ID = "1757657318406"
+
+
+def agency_url(agency_id, level=1):
+    """Reasoning endpoint URL of one agency"""
+    return f"{REASONING_API_URL}?society_id={SOCIETY_ID}&agency_id={agency_id}&level={level}"
+
+
+# ===============================
+# 📚 Vocabulary
+# ===============================
+
+VOCAB_API_URL = agency_url("1758548233201")
+
+VOCABULARY_API_CONFIGS = [
+    {
+        "name": "vocabulary",
+        "url": VOCAB_API_URL,
+        "multiround_convo": 3,
+        "description": "vocabulary",
+        "prompt": lambda problem, outputs: (
+            f"{problem}\n\nExtract the vocabulary from this problem statement."
+        )
+    }
+]
+
+
+# Problem-independent vocabulary for an account's industry, precomputed by talos_warmup
+ACCOUNT_BASELINE_CONFIG = {
+    "name": "account_baseline",
+    "url": VOCAB_API_URL,
+    "multiround_convo": 3,
+    "description": "industry vocabulary baseline",
+    "prompt": lambda account_context, outputs: (
+        f"{account_context}\n\nExtract the vocabulary that is standard for this account and its industry, "
+        "independent of any single business problem."
+    )
+}
+
+
+# ===============================
+# ⚙️ Current System
+# ===============================
+
+CURRENT_SYSTEM_API_URL = agency_url("1758549095254")
+
+CURRENT_SYSTEM_API_CONFIGS = [
+    {
+        "name": "current_system",
+        "url": CURRENT_SYSTEM_API_URL,
+        "multiround_convo": 2,
+        "description": "Current System in Place",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            f"Context from vocabulary:\n{outputs.get('vocabulary', '')}\n\n"
+            "Describe the current system, inputs, outputs, and pain points in detail with clear sections."
+        )
+    }
+]
+
+
+# ===============================
+# 📈 Volatility (Q1-Q3)
+# ===============================
+
+VOLATILITY_API_CONFIGS = [
+    {
+        "name": "Q1",
+        "url": agency_url("1758555344231"),
+        "multiround_convo": 2,
+        "description": "What is the frequency and pace of change in the key inputs driving the business?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            "What is the frequency and pace of change in the key inputs driving the business? "
+            "Provide detailed analysis, score 0–5, and justification."
+        )
+    },
+    {
+        "name": "Q2", 
+        "url": agency_url("1758549615986"),
+        "multiround_convo": 2,
+        "description": "To what extent are these changes cyclical and predictable versus sporadic and unpredictable?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            "To what extent are these changes cyclical and predictable versus sporadic and unpredictable? "
+            "Provide detailed analysis, score 0–5, and justification."
+        )
+    },
+    {
+        "name": "Q3",
+        "url": agency_url("1758614550482"),
+        "multiround_convo": 2,
+        "description": "How resilient is the current system in absorbing these changes without requiring significant rework or disruption?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            "How resilient is the current system in absorbing these changes without requiring significant rework or disruption? "
+            "Provide detailed analysis, score 0–5, and justification."
+        )
+    }
+]
+
+
+# ===============================
+# 🔍 Ambiguity (Q4-Q6)
+# ===============================
+
+AMBIGUITY_API_CONFIGS = [
+    {
+        "name": "Q4",
+        "url": agency_url("1758614809984"),
+        "multiround_convo": 2,
+        "description": "To what extent do stakeholders share a common understanding of the key terms and concepts?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "To what extent do stakeholders share a common understanding and goals about the problem? Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q5",
+        "url": agency_url("1758615038050"),
+        "multiround_convo": 2,
+        "description": "Are there any conflicting definitions or interpretations that could create confusion",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "Are there significant conflicts or tradeoffs between stakeholders or system elements? Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q6",
+        "url": agency_url("1758615386880"),
+        "multiround_convo": 2,
+        "description": "Are objectives, priorities, and constraints clearly communicated and well-defined?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "How clear is the problem definition and scope? Score 0–5. Provide justification."
+        )
+    }
+]
+
+
+# ===============================
+# ⚠️ Uncertainty (Q10-Q12)
+# ===============================
+
+UNCERTAINTY_API_CONFIGS = [
+    {
+        "name": "Q10",
+        "url": agency_url("1758618002158"),
+        "multiround_convo": 2,
+        "description": "What are the key sources of uncertainty in the problem environment?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "Identify and analyze the primary sources of uncertainty in this business context. Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q11",
+        "url": agency_url("1758618230246"),
+        "multiround_convo": 2,
+        "description": "How predictable are the outcomes and impacts of potential solutions?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "Assess the predictability of outcomes and solution impacts. Score 0–5. Provide justification."
+        )
+    },
+    {
+        "name": "Q12",
+        "url": agency_url("1758618458334"),
+        "multiround_convo": 2,
+        "description": "What data gaps or knowledge limitations contribute to uncertainty?",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\nContext from Current System:\n{outputs.get('current_system','')}\n\n"
+            "Evaluate data gaps and knowledge limitations that increase uncertainty. Score 0–5. Provide justification."
+        )
+    }
+]
+
+
+# ===============================
+# 🔗 Interconnectedness
+# ===============================
+
+# No Q7-Q9 agencies exist yet - the Interconnectedness page asks the same
+# Q10-Q12 questions as Uncertainty, so it shares that list.
+INTERCONNECTEDNESS_API_CONFIGS = UNCERTAINTY_API_CONFIGS
+
+
+# ===============================
+# 📊 Hardness Summary
+# ===============================
+
+# Question names whose answers feed the hardness assessment, in display order
+DIMENSION_QUESTIONS = [
+    cfg["name"] for cfg in VOLATILITY_API_CONFIGS + AMBIGUITY_API_CONFIGS + UNCERTAINTY_API_CONFIGS
+]
+
+
+def format_dimension_context(outputs):
+    """Render the dimension answers present in outputs as prompt context ("" when there are none)"""
+    answers = [f"{name}:\n{outputs[name]}" for name in DIMENSION_QUESTIONS if outputs.get(name)]
+    if not answers:
+        return ""
+    return "Dimension analysis so far:\n\n" + "\n\n".join(answers) + "\n\n"
+
+
+def format_computed_scores(outputs):
+    """Scores already averaged locally from Q1-Q12 (talos_scores), so the model only writes the narrative"""
+    if not outputs.get("computed_scores"):
+        return ""
+    return (
+        "Computed scores (already averaged from the dimension answers - report these exact values "
+        "and do not recalculate or show any calculation):\n"
+        f"{outputs['computed_scores']}\n\n"
+    )
+
+
+HARDNESS_API_CONFIGS = [
+    {
+        "name": "hardness_summary",
+        "url": agency_url("1758619658634"),
+        "multiround_convo": 2,
+        "description": "Hardness Level, Summary & Key Takeaways",
+        "prompt": lambda problem, outputs: (
+            f"Problem statement - {problem}\n\n"
+            f"{format_dimension_context(outputs)}"
+            f"{format_computed_scores(outputs)}"
+            "Based on the comprehensive analysis of the business problem, provide a hardness assessment with the following sections IN THIS EXACT FORMAT:\n\n"
+            
+            "Overall Difficulty Score\n"
+            "[Provide a single numerical score between 0-5 based on your assessment of the problem complexity]\n\n"
+            "Hardness Level\n"
+            "[Easy: 0-3.0, Moderate: 3.1-4.0, or Hard: 4.1-5.0]\n\n"
+            "SME Justification\n"
+            "[Provide detailed justification analyzing the problem across multiple dimensions - complexity, ambiguity, interconnectedness, and uncertainty]\n\n"
+            "Summary\n"
+            "[Provide a concise summary of the overall assessment in 2-3 sentences]\n\n"
+            "Key Takeaways\n"
+            "[Provide 3-5 bullet points with actionable insights]\n\n"
+            "IMPORTANT: Make sure each section is clearly labeled with its header as shown above. Provide actual scores and analysis, not placeholders."
+        )
+    }
+]
+
+
+# ===============================
+# 🗂️ All Endpoints
+# ===============================
+
+# Every question of every agent (Interconnectedness shares Uncertainty's list)
+ALL_API_CONFIGS = (
+    VOCABULARY_API_CONFIGS + CURRENT_SYSTEM_API_CONFIGS + VOLATILITY_API_CONFIGS
+    + AMBIGUITY_API_CONFIGS + UNCERTAINTY_API_CONFIGS + HARDNESS_API_CONFIGS
+)
+
+
+def endpoint_labels():
+    """Map each agency URL to the question name(s) that call it"""
+    labels = {}
+    for cfg in ALL_API_CONFIGS:
+        names = labels.setdefault(cfg["url"], [])
+        if cfg["name"] not in names:
+            names.append(cfg["name"])
+    return {url: ", ".join(names) for url, names in labels.items()}
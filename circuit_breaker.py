@@ -0,0 +1,140 @@
+"""
+Per-endpoint circuit breakers for Talos agency calls.
+A breaker opens after consecutive failures (errors, retryable statuses and
+timeouts) and then fails fast instead of making
+every user wait out a degraded agency. After a cool-down it half-opens and
+lets a single probe through; a healthy probe closes it again. Slow answers
+are not failures - reasoning calls routinely take 10-60s, and a call that
+outlasts the request timeout already counts as one.
+State lives at module level, so it is shared by every session in the process.
+"""
+import threading
+import time
+
+# ================================
+# ⚙️ Breaker Settings
+# ================================
+
+FAILURE_THRESHOLD = 5        # consecutive failures that open the breaker
+OPEN_SECONDS = 60            # how long to fail fast before probing again
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose breaker is open"""
+
+    def __init__(self, url, retry_in):
+        super().__init__(f"Circuit open for {url} (next probe in {retry_in:.0f}s)")
+        self.url = url
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe"""
+
+    def __init__(self, url, failure_threshold=FAILURE_THRESHOLD, open_seconds=OPEN_SECONDS):
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.last_latency = None
+        self.last_error = ""
+        self.times_opened = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through right now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            waited = time.time() - self.opened_at
+            if self.state == OPEN and waited >= self.open_seconds:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            raise CircuitOpenError(self.url, max(0.0, self.open_seconds - waited))
+
+    def record_success(self, latency):
+        """A completed call, however slow"""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.last_latency = latency
+            self._probe_in_flight = False
+
+    def record_failure(self, reason, latency=None):
+        """A failed call; opens the breaker at the threshold or on a failed probe"""
+        with self._lock:
+            self.failures += 1
+            self.last_error = reason
+            if latency is not None:
+                self.last_latency = latency
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = time.time()
+            self._probe_in_flight = False
+
+    def reset(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def snapshot(self):
+        """Plain-dict view of the breaker for display"""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.open_seconds - (time.time() - self.opened_at))
+            return {
+                "url": self.url,
+                "state": self.state,
+                "failures": self.failures,
+                "times_opened": self.times_opened,
+                "last_latency": self.last_latency,
+                "last_error": self.last_error,
+                "retry_in": retry_in,
+            }
+
+
+# ================================
+# 🗂️ Process-wide Registry
+# ================================
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url):
+    """The shared breaker for an endpoint URL, created on first use"""
+    with _breakers_lock:
+        breaker = _breakers.get(url)
+        if breaker is None:
+            breaker = _breakers[url] = CircuitBreaker(url)
+        return breaker
+
+
+def breaker_snapshots():
+    """Snapshots of every breaker that has seen traffic"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
+
+
+def reset_breakers():
+    """Close every breaker (admin override)"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    for breaker in breakers:
+        breaker.reset()
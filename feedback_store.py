@@ -0,0 +1,179 @@
+"""
+Append-only feedback storage backed by SQLite in WAL mode.
+Each submission is a single-row INSERT (O(1), no read-modify-write of the
+whole history), and SQLite's locking keeps concurrent sessions and server
+processes from losing rows. Rows keep the canonical 11 feedback columns;
+an existing feedback.csv is imported once when the database is created.
+Schema v2 collapses the duplicate rows older pages wrote for every
+submission (one copy with the Agent column and one without); v3 indexes
+the columns the admin browser filters on so it can page through the table
+in SQL instead of loading it into pandas.
+"""
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+import streamlit as st
+
+# ================================
+# ⚙️ Store Settings
+# ================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FEEDBACK_DB = os.environ.get("FEEDBACK_DB", os.path.join(BASE_DIR, "feedback.db"))
+LEGACY_FEEDBACK_CSV = os.path.join(BASE_DIR, "feedback.csv")
+
+FEEDBACK_COLUMNS = ["Timestamp", "Name", "Email", "Feedback", "FeedbackType",
+                    "OffDefinitions", "Suggestions", "Account", "Industry",
+                    "ProblemStatement", "Agent"]
+
+# PRAGMA user_version after each schema step; bump when adding a migration
+SCHEMA_VERSION = 3
+
+# Columns that identify one submission; Agent is left out because the legacy
+# duplicate copy of each row had no Agent value
+DEDUPE_COLUMNS = [col for col in FEEDBACK_COLUMNS if col != "Agent"]
+
+# Columns the admin browser filters and sorts on
+INDEXED_COLUMNS = ["Agent", "FeedbackType", "Account", "Timestamp"]
+
+# Rows per page in the admin feedback browser
+DEFAULT_PAGE_SIZE = 50
+
+
+class FeedbackStore:
+    """Thread-safe append-only feedback table"""
+
+    def __init__(self, path=FEEDBACK_DB, legacy_csv=LEGACY_FEEDBACK_CSV):
+        self.path = path
+        self.persistent = True
+        self._lock = threading.Lock()
+        try:
+            self._conn = self._connect(path)
+        except (sqlite3.Error, OSError):
+            # Read-only filesystem (e.g. Streamlit Cloud) - keep rows for this process only
+            self.persistent = False
+            self._conn = self._connect(":memory:")
+        self._migrate(legacy_csv)
+
+    def _connect(self, path):
+        conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # FULL fsyncs the WAL on every commit so acknowledged feedback survives a crash
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def _migrate(self, legacy_csv):
+        with self._lock, self._conn:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                columns = ", ".join(f'"{col}" TEXT NOT NULL DEFAULT \'\'' for col in FEEDBACK_COLUMNS)
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS feedback (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})")
+                self._import_legacy_csv(legacy_csv)
+            if version < 2:
+                self._collapse_duplicates()
+            if version < 3:
+                for col in INDEXED_COLUMNS:
+                    self._conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_feedback_{col}" ON feedback ("{col}")')
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _import_legacy_csv(self, legacy_csv):
+        if not legacy_csv or not os.path.exists(legacy_csv):
+            return
+        try:
+            legacy = pd.read_csv(legacy_csv, dtype=str, keep_default_na=False)
+        except Exception:
+            return
+        if 'Agent' not in legacy.columns:
+            legacy['Agent'] = 'Unknown Agent'
+        for col in FEEDBACK_COLUMNS:
+            if col not in legacy.columns:
+                legacy[col] = ''
+        self._conn.executemany(self._insert_sql(), legacy[FEEDBACK_COLUMNS].itertuples(index=False, name=None))
+
+    def _collapse_duplicates(self):
+        """Keep one row per submission, preferring the copy that names its agent"""
+        partition = ", ".join(f'"{col}"' for col in DEDUPE_COLUMNS)
+        self._conn.execute(f"""
+            DELETE FROM feedback WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (
+                        PARTITION BY {partition}
+                        ORDER BY ("Agent" IN ('', 'Unknown Agent')), id
+                    ) AS copy
+                    FROM feedback
+                ) WHERE copy > 1
+            )
+        """)
+
+    @staticmethod
+    def _insert_sql():
+        names = ", ".join(f'"{col}"' for col in FEEDBACK_COLUMNS)
+        marks = ", ".join("?" for _ in FEEDBACK_COLUMNS)
+        return f"INSERT INTO feedback ({names}) VALUES ({marks})"
+
+    def append(self, row):
+        """Insert one feedback row given as a dict keyed by FEEDBACK_COLUMNS"""
+        values = tuple("" if row.get(col) is None else str(row.get(col)) for col in FEEDBACK_COLUMNS)
+        with self._lock, self._conn:
+            self._conn.execute(self._insert_sql(), values)
+
+    @staticmethod
+    def _where(filters):
+        """WHERE clause and parameters for {column: value} equality filters (falsy values are ignored)"""
+        clauses, params = [], []
+        for col, value in (filters or {}).items():
+            if col not in FEEDBACK_COLUMNS:
+                raise ValueError(f"Unknown feedback column: {col}")
+            if value:
+                clauses.append(f'"{col}" = ?')
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def read_all(self, filters=None):
+        """Every matching feedback row, oldest first, as a DataFrame with the canonical columns"""
+        names = ", ".join(f'"{col}"' for col in FEEDBACK_COLUMNS)
+        where, params = self._where(filters)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {names} FROM feedback{where} ORDER BY id", params).fetchall()
+        return pd.DataFrame(rows, columns=FEEDBACK_COLUMNS)
+
+    def query(self, filters=None, limit=DEFAULT_PAGE_SIZE, offset=0):
+        """One page of matching rows, newest first - only that page is materialized"""
+        names = ", ".join(f'"{col}"' for col in FEEDBACK_COLUMNS)
+        where, params = self._where(filters)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {names} FROM feedback{where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                params + [int(limit), int(offset)]
+            ).fetchall()
+        return pd.DataFrame(rows, columns=FEEDBACK_COLUMNS)
+
+    def count(self, filters=None):
+        where, params = self._where(filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM feedback{where}", params).fetchone()[0]
+
+    def summary(self, month_prefix):
+        """Total rows, distinct agents and rows whose Timestamp starts with month_prefix ('YYYY-MM')"""
+        with self._lock:
+            total, agents = self._conn.execute('SELECT COUNT(*), COUNT(DISTINCT "Agent") FROM feedback').fetchone()
+            # Range on the indexed Timestamp column rather than LIKE, which cannot use the index
+            this_month = self._conn.execute(
+                'SELECT COUNT(*) FROM feedback WHERE "Timestamp" >= ? AND "Timestamp" < ?',
+                (month_prefix, month_prefix + "~")
+            ).fetchone()[0]
+        return {"total": total, "agents": agents, "this_month": this_month}
+
+    def version(self):
+        """Id of the newest row; changes whenever feedback is added"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM feedback").fetchone()[0]
+
+
+@st.cache_resource(show_spinner=False)
+def get_feedback_store():
+    """Process-wide feedback store shared across sessions and reruns"""
+    return FeedbackStore()
@@ -0,0 +1,191 @@
+"""
+Content-addressed response cache for Talos reasoning calls.
+Entries are keyed on a hash of (agency URL, agency_goal prompt, tenant),
+expire after a TTL and are evicted least-recently-used past a size cap.
+One cache is shared by every session in the process; setting
+TALOS_CACHE_DIR adds an on-disk tier that survives restarts. The disk tier is
+pruned as it is written: expired files go first, then the oldest past
+TALOS_CACHE_DISK_MAX_ENTRIES.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+# ================================
+# ⚙️ Cache Settings
+# ================================
+
+CACHE_TTL_SECONDS = int(os.environ.get("TALOS_CACHE_TTL", 6 * 60 * 60))
+CACHE_MAX_ENTRIES = int(os.environ.get("TALOS_CACHE_MAX_ENTRIES", 256))
+CACHE_DIR = os.environ.get("TALOS_CACHE_DIR", "")
+CACHE_DISK_MAX_ENTRIES = int(os.environ.get("TALOS_CACHE_DISK_MAX_ENTRIES", 4096))
+
+# Disk writes between prunes of the cache directory (the first write prunes too)
+DISK_PRUNE_INTERVAL = 64
+
+
+def make_cache_key(url, goal, tenant):
+    """Hash the agency URL, prompt and tenant into a stable cache key"""
+    digest = hashlib.sha256()
+    for part in (url, goal, tenant):
+        digest.update((part or "").encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache of decoded JSON payloads with an optional disk tier"""
+
+    def __init__(self, ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, cache_dir=CACHE_DIR,
+                 disk_max_entries=CACHE_DISK_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.disk_max_entries = disk_max_entries
+        self.hits = 0
+        self.misses = 0
+        self._disk_writes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.cache_dir:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except OSError:
+                # Read-only filesystem (e.g. Streamlit Cloud) - memory tier only
+                self.cache_dir = ""
+
+    def get(self, key):
+        """Return the cached payload for key, or None on a miss or expiry"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, payload = entry
+                if now - stored_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return payload
+                del self._entries[key]
+
+        disk_entry = self._read_disk(key, now)
+        with self._lock:
+            if disk_entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, *disk_entry)
+            return disk_entry[1]
+
+    def peek(self, key):
+        """Cached payload for key without touching the hit/miss counters or LRU order (display lookups)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                return entry[1]
+        disk_entry = self._read_disk(key, now)
+        return disk_entry[1] if disk_entry is not None else None
+
+    def set(self, key, payload):
+        """Store a payload in memory and, when enabled, on disk"""
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, stored_at, payload)
+        self._write_disk(key, stored_at, payload)
+
+    def stats(self):
+        """Hit/miss counters and current in-memory size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self):
+        """Drop every in-memory entry (disk files are pruned on later writes)"""
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key, stored_at, payload):
+        self._entries[key] = (stored_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_disk(self, key, now):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                record = json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+        stored_at = record.get("stored_at", 0)
+        if now - stored_at > self.ttl:
+            _remove_file(path)
+            return None
+        return stored_at, record.get("payload")
+
+    def _write_disk(self, key, stored_at, payload):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump({"stored_at": stored_at, "payload": payload}, fh)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError):
+            _remove_file(tmp_path)
+            return
+
+        with self._lock:
+            self._disk_writes += 1
+            prune = (self._disk_writes - 1) % DISK_PRUNE_INTERVAL == 0
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete expired files (stale temp files too), then the oldest past disk_max_entries"""
+        cutoff = time.time() - self.ttl
+        files = []
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith((".json", ".tmp")):
+                        continue
+                    try:
+                        # Files are written at stored_at, so mtime ages them without reading them
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        continue
+                    if mtime < cutoff:
+                        _remove_file(entry.path)
+                    elif entry.name.endswith(".json"):
+                        files.append((mtime, entry.path))
+        except OSError:
+            return
+        files.sort()
+        for _, path in files[:max(0, len(files) - self.disk_max_entries)]:
+            _remove_file(path)
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache():
+    """Process-wide response cache shared across sessions and reruns"""
+    return ResponseCache()
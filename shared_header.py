@@ -4,18 +4,24 @@ Provides fixed header with logo, title, theme toggle, and admin access.
 """
 import streamlit as st
 import streamlit.components.v1 as components
+import hashlib
+import json
 import os
 import pandas as pd
+from functools import lru_cache
 from urllib.parse import unquote
 from datetime import datetime
 
+from agent_configs import endpoint_labels
+from feedback_store import get_feedback_store, FEEDBACK_COLUMNS, DEFAULT_PAGE_SIZE
+from circuit_breaker import breaker_snapshots, reset_breakers, OPEN, HALF_OPEN
+from response_cache import get_response_cache
+from talos_jobs import get_job_runner
+import talos_metrics
+
 # Logo URL for the header
 LOGO_URL = "https://yt3.googleusercontent.com/ytc/AIdro_k-7HkbByPWjKpVPO3LCF8XYlKuQuwROO0vf3zo1cqgoaE=s900-c-k-c0x00ffffff-no-rj"
 
-# Feedback file path for admin section
-BASE_DIR = os.path.dirname(os.path.dirname(__file__))
-FEEDBACK_FILE = os.path.join(BASE_DIR, "feedback.csv")
-
 # ================================
 # 🏢 Account & Industry Mapping
 # ================================
@@ -87,12 +93,6 @@ INDUSTRIES = ["Select Industry"] + INDUSTRIES
 
 def init_admin_session():
     """Initialize admin session state for all agents"""
-    if 'admin_feedback_data' not in st.session_state:
-        st.session_state.admin_feedback_data = pd.DataFrame(
-            columns=["Timestamp", "Name", "Email", "Feedback", "FeedbackType", 
-                    "OffDefinitions", "Suggestions", "Account", "Industry", 
-                    "ProblemStatement", "Agent"]
-        )
     if 'admin_authenticated' not in st.session_state:
         st.session_state.admin_authenticated = False
     if 'admin_access_requested' not in st.session_state:
@@ -102,118 +102,99 @@ def init_admin_session():
     if 'show_admin_panel' not in st.session_state:
         st.session_state.show_admin_panel = False
 
-def save_feedback_to_admin_session(feedback_data, agent_name="Vocabulary Agent"):
+def submit_agent_feedback(agent_name, feedback_type, name="", email="", off_definitions="", suggestions="",
+                          additional_feedback="", account="", industry="", problem_statement=""):
     """
-    Save feedback data to admin session storage for all agents
+    Single entry point for agent-page feedback: builds one row with the
+    canonical FEEDBACK_COLUMNS schema and writes it to the store exactly once.
+    The admin dashboard reads the same store, so no session copy is kept.
     """
-    init_admin_session()  # Ensure session is initialized
-    
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    # Add agent information to feedback data
-    feedback_data_with_agent = feedback_data.copy()
-    feedback_data_with_agent['Agent'] = agent_name
-    feedback_data_with_agent['Timestamp'] = timestamp
-    
-    # Convert to DataFrame if not already
-    if not isinstance(feedback_data_with_agent, pd.DataFrame):
-        feedback_data_with_agent = pd.DataFrame([feedback_data_with_agent])
-    
-    # Append to admin session storage
-    st.session_state.admin_feedback_data = pd.concat(
-        [st.session_state.admin_feedback_data, feedback_data_with_agent], 
-        ignore_index=True
-    )
-    
-    # Also save to file for persistence
-    save_feedback_to_file(feedback_data_with_agent)
-    
-    return True
+    row = {
+        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "Name": name,
+        "Email": email,
+        "Feedback": additional_feedback,
+        "FeedbackType": feedback_type,
+        "OffDefinitions": off_definitions,
+        "Suggestions": suggestions,
+        "Account": account,
+        "Industry": industry,
+        "ProblemStatement": problem_statement,
+        "Agent": agent_name,
+    }
+    return save_feedback_to_file(row)
 
 def save_feedback_to_file(feedback_data):
     """
-    Save feedback to CSV file with fallback to session state
+    Append feedback rows to the shared feedback store (one INSERT per row)
     """
+    if isinstance(feedback_data, pd.DataFrame):
+        rows = feedback_data.to_dict("records")
+    else:
+        rows = [feedback_data]
+
     try:
-        # Ensure the feedback data has all required columns including 'Agent'
-        required_columns = ["Timestamp", "Name", "Email", "Feedback", "FeedbackType", 
-                           "OffDefinitions", "Suggestions", "Account", "Industry", 
-                           "ProblemStatement", "Agent"]
-        
-        # Add missing columns with empty values
-        for col in required_columns:
-            if col not in feedback_data.columns:
-                feedback_data[col] = ''
-        
-        if os.path.exists(FEEDBACK_FILE):
-            existing = pd.read_csv(FEEDBACK_FILE)
-            
-            # Handle schema mismatch - ensure existing data also has all columns
-            for col in required_columns:
-                if col not in existing.columns:
-                    existing[col] = ''
-            
-            # Reorder both dataframes to match required columns
-            existing = existing[required_columns]
-            feedback_data = feedback_data[required_columns]
-            
-            updated = pd.concat([existing, feedback_data], ignore_index=True)
-        else:
-            # Create new file with all required columns
-            updated = feedback_data[required_columns]
-        
-        updated.to_csv(FEEDBACK_FILE, index=False)
-        return True
-        
-    except (PermissionError, OSError) as e:
-        # Fallback to session state on Streamlit Cloud
-        if 'file_feedback_data' not in st.session_state:
-            st.session_state.file_feedback_data = pd.DataFrame(columns=feedback_data.columns)
-        
-        st.session_state.file_feedback_data = pd.concat(
-            [st.session_state.file_feedback_data, feedback_data], 
-            ignore_index=True
-        )
+        store = get_feedback_store()
+        for row in rows:
+            store.append(row)
         return True
-        
     except Exception as e:
         st.error(f"Error saving feedback to file: {str(e)}")
         return False
 
 def get_all_feedback_data():
     """
-    Get combined feedback data from both file and session state
+    Get all feedback rows from the shared feedback store
     """
-    file_data = pd.DataFrame()
-    session_data = pd.DataFrame()
-    
-    # Try to load from file
     try:
-        if os.path.exists(FEEDBACK_FILE):
-            file_data = pd.read_csv(FEEDBACK_FILE)
-            # Ensure the file data has Agent column
-            if 'Agent' not in file_data.columns:
-                file_data['Agent'] = 'Unknown Agent'
+        return get_feedback_store().read_all()
     except Exception as e:
-        st.warning(f"Could not read feedback file: {e}")
-    
-    # Get from session state
-    if 'admin_feedback_data' in st.session_state and not st.session_state.admin_feedback_data.empty:
-        session_data = st.session_state.admin_feedback_data.copy()
-    
-    if 'file_feedback_data' in st.session_state and not st.session_state.file_feedback_data.empty:
-        session_data = pd.concat([session_data, st.session_state.file_feedback_data], ignore_index=True)
-    
-    # Combine data, preferring session data for duplicates
-    if not file_data.empty and not session_data.empty:
-        combined = pd.concat([file_data, session_data], ignore_index=True).drop_duplicates()
-        return combined
-    elif not file_data.empty:
-        return file_data
-    elif not session_data.empty:
-        return session_data
-    else:
-        return pd.DataFrame()
+        st.warning(f"Could not read feedback store: {e}")
+        return pd.DataFrame(columns=FEEDBACK_COLUMNS)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _feedback_csv(filter_items, version):
+    """CSV export of the filtered feedback; rebuilt only when filters or data (version) change"""
+    return get_feedback_store().read_all(dict(filter_items)).to_csv(index=False).encode("utf-8")
+
+def render_feedback_browser(filters, key_prefix, download_filename, height=400):
+    """
+    Paginated feedback table backed by indexed SQL queries.
+    Only the visible page is loaded; returns the number of matching rows.
+    """
+    store = get_feedback_store()
+    matched = store.count(filters)
+    if not matched:
+        return 0
+
+    pages = (matched + DEFAULT_PAGE_SIZE - 1) // DEFAULT_PAGE_SIZE
+    page_key = f"{key_prefix}_feedback_page"
+    # Narrower filters can leave the stored page number past the end
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = 1
+
+    col_page1, col_page2 = st.columns([1, 3])
+    with col_page1:
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key=page_key)
+    with col_page2:
+        first = (page - 1) * DEFAULT_PAGE_SIZE
+        st.caption(f"Rows {first + 1}–{min(first + DEFAULT_PAGE_SIZE, matched)} of {matched}, newest first")
+
+    st.dataframe(store.query(filters, limit=DEFAULT_PAGE_SIZE, offset=first),
+                 use_container_width=True, height=height)
+
+    col_dl1, col_dl2, col_dl3 = st.columns([1, 2, 1])
+    with col_dl2:
+        st.download_button(
+            "⬇️ Download Filtered Feedback Report",
+            _feedback_csv(tuple(sorted(filters.items())), store.version()),
+            download_filename,
+            "text/csv",
+            use_container_width=True,
+            type="primary",
+            key=f"{key_prefix}_feedback_download"
+        )
+    return matched
 
 def _safe_rerun():
     """Safely rerun the app without causing errors."""
@@ -228,44 +209,110 @@ def _safe_rerun():
                 height=0
             )
 
+def fragment(func):
+    """
+    Run func as a Streamlit fragment: its widgets rerun only func, not the page.
+    Uses st.fragment (1.37+) or st.experimental_fragment (1.33-1.36); older
+    releases just call func as part of the full-page run.
+    """
+    decorator = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+    return decorator(func) if decorator else func
+
+# ================================
+# 🎨 Static Assets
+# ================================
+
+# Served by Streamlit at app/static/ (server.enableStaticServing in .streamlit/config.toml)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+HEADER_ASSETS = ("talos_header.css", "talos_theme.js")
+
+# Installs each asset into the app document once; page assets missing from a later call are removed
+_ASSET_LOADER = """
+<script>
+(function () {
+    const win = window.parent, doc = win.document;
+    const assets = __ASSETS__;
+    const wanted = new Set(assets.map(function (a) { return a.name; }));
+    doc.head.querySelectorAll('[data-talos-page]').forEach(function (el) {
+        if (!wanted.has(el.dataset.talosAsset)) { el.remove(); }
+    });
+    function current(asset) {
+        const el = doc.head.querySelector('[data-talos-asset="' + asset.name + '"]');
+        return el && el.dataset.version === asset.version ? el : null;
+    }
+    function fetchText(asset) {
+        if (current(asset)) { return Promise.resolve(null); }
+        if (asset.text !== null) { return Promise.resolve(asset.text); }
+        const url = new URL('app/static/' + asset.name + '?v=' + asset.version, win.location.href);
+        return fetch(url).then(function (r) { return r.ok ? r.text() : null; }).catch(function () { return null; });
+    }
+    Promise.all(assets.map(fetchText)).then(function (texts) {
+        texts.forEach(function (text, i) {
+            const asset = assets[i];
+            if (text === null || current(asset)) { return; }
+            doc.head.querySelectorAll('[data-talos-asset="' + asset.name + '"]').forEach(function (el) { el.remove(); });
+            const el = doc.createElement(asset.name.endsWith('.js') ? 'script' : 'style');
+            el.dataset.talosAsset = asset.name;
+            el.dataset.version = asset.version;
+            if (asset.page) { el.dataset.talosPage = ''; }
+            el.textContent = text;
+            doc.head.appendChild(el);
+        });
+        if (win.talosTheme) { win.talosTheme.init(); }
+    });
+})();
+</script>
+"""
+
+
+@lru_cache(maxsize=None)
+def _static_asset(name):
+    """(content hash, text) of a file in STATIC_DIR, read once per process"""
+    with open(os.path.join(STATIC_DIR, name), encoding="utf-8") as f:
+        text = f.read()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12], text
+
+
+def _static_serving_enabled():
+    try:
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def load_static_assets(shared=(), page=()):
+    """
+    Install CSS/JS files from static/ into the app document.
+    With static serving on, only names and content hashes go over the websocket
+    and the browser fetches (and caches) each file once per tab; otherwise the
+    text is inlined. Identical calls keep the same iframe across reruns.
+    """
+    inline = not _static_serving_enabled()
+    assets = []
+    for name in tuple(shared) + tuple(page):
+        version, text = _static_asset(name)
+        assets.append({"name": name, "version": version, "page": name in page, "text": text if inline else None})
+    components.html(_ASSET_LOADER.replace("__ASSETS__", json.dumps(assets)), height=0)
+
+
 def sync_theme_with_session():
-    """Sync theme between localStorage and Streamlit session state"""
-    # Initialize theme in session state if not present
+    """Initialize the theme flag; the header's theme script applies the saved theme in the browser"""
     if 'dark_mode' not in st.session_state:
         st.session_state.dark_mode = False
-    
-    # Try to get theme from localStorage via JavaScript
-    try:
-        # This component will read localStorage and set session state
-        components.html("""
-        <script>
-        (function() {
-            const savedTheme = localStorage.getItem('appTheme') || 'light';
-            const isDark = savedTheme === 'dark';
-            
-            // Send to Streamlit
-            if (window.parent.Streamlit) {
-                window.parent.Streamlit.setComponentValue({
-                    dark_mode: isDark,
-                    theme: savedTheme
-                });
-            }
-        })();
-        </script>
-        """, height=0)
-    except:
-        pass
 
 def render_header(
     agent_name="Business Problem Analysis Platform",
     agent_subtitle="Specialized AI agents to extract, classify, and analyze key dimensions of your business challenges",
     enable_admin_access=True,
-    header_height=85
+    header_height=85,
+    page_styles=()
 ):
     """
     Fixed header (shared across agents).
     - enable_admin_access: if True, clicking the logo toggles admin view via URL param.
     - header_height: header height in px (default 85).
+    - page_styles: static/ stylesheets of the calling view, removed again when a later view omits them.
     """
     # Initialize admin session
     init_admin_session()
@@ -320,425 +367,15 @@ def render_header(
     if st.session_state.get('current_page', '') == 'admin':
         admin_badge_html = '<span style="margin-left:8px;padding:4px 8px;background:rgba(255,255,255,0.95);color:#8b1e1e;font-weight:700;border-radius:12px;font-size:0.75rem;white-space:nowrap;">ADMIN</span>'
 
-       # Apply comprehensive CSS with Mu Sigma colors and NO GAPS
-    st.markdown(f"""
-    <style>
-    /* Reset Streamlit built-in header COMPLETELY */
-    [data-testid="stHeader"], 
-    header[data-testid="stHeader"],
-    .stApp > header {{
-        height: 0 !important;
-        background: transparent !important;
-        display: none !important;
-        visibility: hidden !important;
-        padding: 0 !important;
-        margin: 0 !important;
-    }}
-
-    /* Fixed Header - ABSOLUTELY NO GAPS */
-    .fixed-header {{
-        position: fixed;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: {header_height}px;
-        background: linear-gradient(135deg, #8b1e1e 0%, #6b1515 100%);
-        box-shadow: 0 2px 20px rgba(0,0,0,0.4);
-        z-index: 999999;
-        display: flex !important;
-        align-items: center;
-        justify-content: space-between;
-        padding: 0 2rem;
-        border-bottom: 3px solid #ff6b35;
-    }}
-
-    .header-logo {{
-        display: flex;
-        align-items: center;
-        cursor: pointer;
-        transition: transform 0.3s ease;
-    }}
-
-    .header-logo:hover {{
-        transform: scale(1.05);
-    }}
-
-    .header-logo img {{
-        width: 48px;
-        height: 48px;
-        border-radius: 50%;
-        border: 2px solid rgba(255,255,255,0.5);
-        box-shadow: 0 2px 8px rgba(0,0,0,0.3);
-    }}
-
-    .header-title {{
-        position: absolute;
-        left: 50%;
-        transform: translateX(-50%);
-        text-align: center;
-    }}
-
-    .header-title h1 {{
-        color: #ffffff !important;
-        font-size: 1.7rem;
-        font-weight: 800;
-        margin: 0;
-        line-height: 1.1;
-        text-shadow: 1px 1px 2px rgba(0,0,0,0.3);
-        letter-spacing: -0.5px;
-    }}
-
-    .header-title p {{
-        color: rgba(255,255,255,0.95);
-        font-size: 0.85rem;
-        font-weight: 500;
-        margin: 3px 0 0 0;
-        text-shadow: 0.5px 0.5px 1px rgba(0,0,0,0.2);
-    }}
-
-    /* CRITICAL: ABSOLUTELY NO GAP - Content starts RIGHT after header */
-    .main .block-container {{
-        padding-top: {header_height}px !important;
-        padding-bottom: 0 !important;
-        margin-top: 0 !important;
-    }}
-
-    .stApp {{
-        margin-top: 0 !important;
-        padding-top: 0 !important;
-    }}
-
-    /* Remove ALL gaps and margins */
-    body, html, .stApp {{
-        overflow-x: hidden !important;
-        margin: 0 !important;
-        padding: 0 !important;
-        overflow-y: auto !important;
-    }}
-
-    /* Remove any Streamlit default padding */
-    [data-testid="stAppViewContainer"] {{
-        padding: 0 !important;
-        margin: 0 !important;
-    }}
-
-    .theme-toggle-capsule {{
-        display: flex;
-        background-color: rgba(255,255,255,0.15);
-        border-radius: 25px;
-        padding: 4px;
-        gap: 4px;
-        backdrop-filter: blur(10px);
-        border: 2px solid rgba(255,255,255,0.3);
-        align-items: center;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.2);
-    }}
-
-    .theme-toggle-btn {{
-        padding: 8px 18px;
-        border: none;
-        border-radius: 20px;
-        font-size: 0.8rem;
-        cursor: pointer;
-        transition: all 0.3s ease;
-        background-color: transparent;
-        color: rgba(255,255,255,0.8);
-        font-weight: 600;
-    }}
-
-    .theme-toggle-btn.active {{
-        background-color: white;
-        color: #8b1e1e;
-        box-shadow: 0 2px 8px rgba(255,255,255,0.4);
-    }}
-
-    .theme-toggle-btn:hover {{
-        transform: scale(1.05);
-        color: white;
-    }}
-
-    /* MU SIGMA COLORS FOR BUTTONS */
-    .stButton > button, 
-    button[kind="primary"], 
-    button[kind="secondary"],
-    .stDownloadButton > button,
-    .stButton > button:not(.theme-toggle-btn) {{
-        background: linear-gradient(135deg, #8b1e1e 0%, #ff6b35 100%) !important;
-        color: white !important;
-        border: none !important;
-        font-weight: 700 !important;
-        border-radius: 10px !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 12px rgba(139,30,30,0.4) !important;
-        font-size: 0.95rem !important;
-    }}
-
-    .stButton > button:hover,
-    button[kind="primary"]:hover,
-    button[kind="secondary"]:hover {{
-        transform: translateY(-2px) scale(1.02) !important;
-        box-shadow: 0 6px 20px rgba(139,30,30,0.5) !important;
-        background: linear-gradient(135deg, #a82828 0%, #ff7b45 100%) !important;
-    }}
-
-    /* Secondary buttons with outline */
-    button[kind="secondary"]:not(.theme-toggle-btn) {{
-        background: transparent !important;
-        border: 2px solid #8b1e1e !important;
-        color: #8b1e1e !important;
-        box-shadow: 0 2px 8px rgba(139,30,30,0.2) !important;
-    }}
-
-    button[kind="secondary"]:not(.theme-toggle-btn):hover {{
-        background: linear-gradient(135deg, #8b1e1e 0%, #ff6b35 100%) !important;
-        color: white !important;
-        border-color: transparent !important;
-    }}
-
-        /* ========================================
-       DARK MODE THEME STYLES - Enhanced Visibility
-       ======================================== */
-    /* Fix dropdown selected option visibility in dark mode */
-    body[data-theme="dark"] .stSelectbox [data-baseweb="select"] > div {{
-        background-color: #1f2937 !important;
-        color: #ffffff !important;
-        border: 2px solid rgba(255,255,255,0.3) !important;
-    }}
-    
-    body[data-theme="dark"] .stSelectbox [data-baseweb="select"] > div:hover {{
-        background-color: #374151 !important;
-        border-color: rgba(255,255,255,0.5) !important;
-    }}
-
-    body[data-theme="dark"] .stSelectbox [data-baseweb="popover"] {{
-        background-color: #1f2937 !important;
-        border: 2px solid rgba(255,255,255,0.3) !important;
-    }}
-    
-    body[data-theme="dark"] .stSelectbox [data-baseweb="popover"] div {{
-        background-color: #1f2937 !important;
-        color: #ffffff !important;
-    }}
-    
-    body[data-theme="dark"] .stSelectbox [data-baseweb="popover"] div:hover {{
-        background-color: #374151 !important;
-        color: #ffffff !important;
-    }}
-    
-    body[data-theme="dark"] .stSelectbox [data-baseweb="select"] > div:before {{
-        color: #ffffff !important;
-    }}
-    
-    /* Consistent text input backgrounds in dark mode */
-    body[data-theme="dark"] .stTextInput input,
-    body[data-theme="dark"] .stTextArea textarea {{
-        background-color: #1f2937 !important;
-        color: #ffffff !important;
-        border: 2px solid rgba(255,255,255,0.3) !important;
-    }}
-
-    body[data-theme="dark"] .stTextInput input:focus,
-    body[data-theme="dark"] .stTextArea textarea:focus {{
-        background-color: #1f2937 !important;
-        border-color: #8b1e1e !important;
-    }}
-    
-    body[data-theme="dark"] .stTextInput input::placeholder,
-    body[data-theme="dark"] .stTextArea textarea::placeholder {{
-        color: rgba(255,255,255,0.6) !important;
-    }}
-    
-    body[data-theme="dark"] .stRadio label {{
-        color: #ffffff !important;
-        font-weight: 500 !important;
-    }}
-    
-    body[data-theme="dark"] .stRadio [data-testid="stMarkdownContainer"] {{
-        color: #ffffff !important;
-    }}
-    body[data-theme="dark"] .stApp {{
-        background: linear-gradient(135deg, #0b0f14 0%, #18181b 50%, #23272f 100%) !important;
-        color: #f8fafc !important;
-    }}
-
-    /* Fix cursor visibility in dark mode for all input fields */
-    body[data-theme="dark"] .stTextInput input,
-    body[data-theme="dark"] .stTextArea textarea,
-    body[data-theme="dark"] .stSelectbox [data-baseweb="select"] > div {{
-        caret-color: #ffffff !important;
-    }}
-    
-    /* Ensure text selection is visible in dark mode */
-    body[data-theme="dark"] ::selection {{
-        background-color: rgba(255, 255, 255, 0.3) !important;
-        color: #ffffff !important;
-    }}
-
-    body[data-theme="dark"] ::-moz-selection {{
-        background-color: rgba(255, 255, 255, 0.3) !important;
-        color: #ffffff !important;
-    }}
-
-    /* Dark mode - Clean headings without blur/shadow */
-    body[data-theme="dark"] h1,
-    body[data-theme="dark"] h2,
-    body[data-theme="dark"] h3,
-    body[data-theme="dark"] h4,
-    body[data-theme="dark"] h5,
-    body[data-theme="dark"] h6 {{
-        color: #f8fafc !important;
-        text-shadow: none !important;
-        filter: none !important;
-        font-weight: 700 !important;
-    }}
-
-    body[data-theme="dark"] .stMarkdown h1,
-    body[data-theme="dark"] .stMarkdown h2,
-    body[data-theme="dark"] .stMarkdown h3 {{
-        color: #f8fafc !important;
-        text-shadow: none !important;
-        filter: none !important;
-    }}
-
-    /* Dark mode - Enhanced text inputs */
-    body[data-theme="dark"] .stTextInput input,
-    body[data-theme="dark"] .stTextArea textarea {{
-        background: #1f2937 !important;
-        color: #ffffff !important;
-        border: 2px solid rgba(255,255,255,0.2) !important;
-        font-weight: 500 !important;
-    }}
-
-    body[data-theme="dark"] .stTextInput input::placeholder,
-    body[data-theme="dark"] .stTextArea textarea::placeholder {{
-        color: rgba(255,255,255,0.5) !important;
-        font-weight: 400 !important;
-    }}
-
-    /* DARK MODE DROPDOWN FIX - CRITICAL */
-    body[data-theme="dark"] .stSelectbox [data-baseweb="select"] > div {{
-        background-color: #1f2937 !important;
-        color: #ffffff !important;
-        border: 2px solid rgba(255,255,255,0.3) !important;
-    }}
-
-    body[data-theme="dark"] .stSelectbox [data-baseweb="select"] > div:hover {{
-        background-color: #374151 !important;
-        border-color: rgba(255,255,255,0.5) !important;
-    }}
-
-    body[data-theme="dark"] .stSelectbox [data-baseweb="popover"] {{
-        background-color: #1f2937 !important;
-        border: 2px solid rgba(255,255,255,0.3) !important;
-    }}
-
-    body[data-theme="dark"] .stSelectbox [data-baseweb="popover"] div {{
-        background-color: #1f2937 !important;
-        color: #ffffff !important;
-    }}
-
-    body[data-theme="dark"] .stSelectbox [data-baseweb="popover"] div:hover {{
-        background-color: #374151 !important;
-        color: #ffffff !important;
-    }}
-
-    body[data-theme="dark"] .stSelectbox [data-baseweb="select"] > div:before {{
-        color: #ffffff !important;
-    }}
-
-    /* ========================================
-       LIGHT MODE THEME STYLES - Clean Headings
-       ======================================== */
-    body[data-theme="light"] .stApp {{
-        background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%) !important;
-        color: #1e293b !important;
-    }}
-
-    /* Light mode - Clean headings without blur/shadow */
-    body[data-theme="light"] h1,
-    body[data-theme="light"] h2,
-    body[data-theme="light"] h3,
-    body[data-theme="light"] h4,
-    body[data-theme="light"] h5,
-    body[data-theme="light"] h6 {{
-        color: #1e293b !important;
-        text-shadow: none !important;
-        filter: none !important;
-        font-weight: 700 !important;
-    }}
-
-    body[data-theme="light"] .stMarkdown h1,
-    body[data-theme="light"] .stMarkdown h2,
-    body[data-theme="light"] .stMarkdown h3 {{
-        color: #1e293b !important;
-        text-shadow: none !important;
-        filter: none !important;
-    }}
-
-    /* Light mode - Enhanced text inputs */
-    body[data-theme="light"] .stTextInput input,
-    body[data-theme="light"] .stTextArea textarea {{
-        background: #ffffff !important;
-        color: #1e293b !important;
-        border: 2px solid #e2e8f0 !important;
-        font-weight: 500 !important;
-    }}
-
-    /* Enhanced section titles with Mu Sigma colors */
-    .section-title-box {{
-        background: linear-gradient(135deg, #8b1e1e 0%, #ff6b35 100%) !important;
-        border-radius: 10px;
-        padding: 1rem 2rem;
-        margin: 0 0 1rem 0 !important;
-        text-align: center;
-        box-shadow: 0 4px 12px rgba(139,30,30,0.3);
-    }}
-
-    .section-title-box h3 {{
-        color:#ffffff!important;
-        margin:0!important;
-        font-weight:700!important;
-        font-size:1.3rem!important;
-        text-shadow: none !important;
-    }}
-
-    /* Enhanced font visibility - NO BLUR */
-    .stApp * {{
-        font-family: 'Inter', sans-serif !important;
-        text-shadow: none !important;
-        filter: none !important;
-    }}
-
-    body[data-theme="dark"] .stApp * {{
-        color: #f8fafc !important;
-    }}
-
-    body[data-theme="light"] .stApp * {{
-        color: #1e293b !important;
-    }}
-
-    /* Remove any text shadows from all elements */
-    * {{
-        text-shadow: none !important;
-    }}
-
-    /* Ensure clean typography */
-    h1, h2, h3, h4, h5, h6,
-    .stMarkdown h1, .stMarkdown h2, .stMarkdown h3,
-    .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {{
-        text-shadow: none !important;
-        filter: none !important;
-        -webkit-font-smoothing: antialiased !important;
-        -moz-osx-font-smoothing: grayscale !important;
-    }}
-    </style>
-    """, unsafe_allow_html=True)
+    # Styles and theme script come from static/ once per browser tab; only the height is sent per rerun
+    load_static_assets(HEADER_ASSETS, page_styles)
 
     # Build admin href - Direct navigation
     admin_href = "?adminPanelToggled=true" if enable_admin_access else "#"
 
     # Render the header HTML
     st.markdown(f"""
+<style>:root {{ --talos-header-height: {header_height}px; }}</style>
 <div class="fixed-header">
     <a href="{admin_href}" style="text-decoration:none;" title="Open Admin View">
         <div class="header-logo">
@@ -756,122 +393,6 @@ def render_header(
 </div>
     """, unsafe_allow_html=True)
 
-    # Add JavaScript for theme switching with persistent session state
-    components.html(f"""
-    <script>
-    (function() {{
-        const doc = window.parent.document;
-        
-        // Function to apply theme and update Streamlit session state
-        function applyTheme(theme) {{
-            // Apply to DOM
-            doc.body.setAttribute('data-theme', theme);
-            localStorage.setItem('appTheme', theme);
-            
-            // Update button states
-            const lightBtn = doc.getElementById('theme-light-btn');
-            const darkBtn = doc.getElementById('theme-dark-btn');
-            
-            if (lightBtn && darkBtn) {{
-                if (theme === 'light') {{
-                    lightBtn.classList.add('active');
-                    darkBtn.classList.remove('active');
-                }} else {{
-                    darkBtn.classList.add('active');
-                    lightBtn.classList.remove('active');
-                }}
-            }}
-            
-            // Send theme to Streamlit session state
-            if (window.parent.Streamlit) {{
-                window.parent.Streamlit.setComponentValue({{
-                    theme: theme,
-                    timestamp: new Date().getTime()
-                }});
-            }}
-        }}
-        
-        // Initialize theme from localStorage or default
-        function initTheme() {{
-            const savedTheme = localStorage.getItem('appTheme') || 'light';
-            applyTheme(savedTheme);
-            
-            // Set up button event listeners
-            const lightBtn = doc.getElementById('theme-light-btn');
-            const darkBtn = doc.getElementById('theme-dark-btn');
-            
-            if (lightBtn) {{
-                lightBtn.onclick = function(e) {{
-                    e.preventDefault();
-                    e.stopPropagation();
-                    applyTheme('light');
-                    return false;
-                }};
-            }}
-            
-            if (darkBtn) {{
-                darkBtn.onclick = function(e) {{
-                    e.preventDefault();
-                    e.stopPropagation();
-                    applyTheme('dark');
-                    return false;
-                }};
-            }}
-        }}
-        
-        // Enhanced initialization with retry logic
-        function tryInit(attempts = 0) {{
-            if (attempts > 15) {{
-                console.log('Theme initialization failed after max attempts');
-                return;
-            }}
-            
-            const lightBtn = doc.getElementById('theme-light-btn');
-            const darkBtn = doc.getElementById('theme-dark-btn');
-            
-            if (lightBtn && darkBtn) {{
-                initTheme();
-                console.log('Theme initialized successfully');
-            }} else {{
-                setTimeout(() => tryInit(attempts + 1), 150);
-            }}
-        }}
-        
-        // Listen for theme changes from other components
-        function setupThemeListener() {{
-            window.addEventListener('storage', function(e) {{
-                if (e.key === 'appTheme') {{
-                    applyTheme(e.newValue);
-                }}
-            }});
-            
-            window.addEventListener('themeChange', function(e) {{
-                if (e.detail && e.detail.theme) {{
-                    applyTheme(e.detail.theme);
-                }}
-            }});
-        }}
-        
-        // Start initialization
-        if (doc.readyState === 'loading') {{
-            doc.addEventListener('DOMContentLoaded', function() {{
-                tryInit();
-                setupThemeListener();
-            }});
-        }} else {{
-            tryInit();
-            setupThemeListener();
-        }}
-        
-        // Force theme application on page load
-        window.addEventListener('load', function() {{
-            const savedTheme = localStorage.getItem('appTheme') || 'light';
-            applyTheme(savedTheme);
-        }});
-    }})();
-    </script>
-    """, height=0)
-
 def get_shared_data():
     """Get shared data from session state or URL parameters"""
     data = {
@@ -907,6 +428,58 @@ def get_shared_data():
         'problem': st.session_state.get('business_problem', data['problem'])
     }
 
+def _sync_widget(key, value):
+    """Point a widget at value; only real changes are sent, so unsent typing is never overwritten"""
+    if st.session_state.get(key) != value:
+        st.session_state[key] = value
+
+def _copy_widget(widget_key, state_key):
+    st.session_state[state_key] = st.session_state[widget_key]
+
+def _apply_account(account):
+    """Set the working account and derive its industry"""
+    st.session_state.business_account = account
+    if account in ACCOUNT_INDUSTRY_MAP:
+        st.session_state.business_industry = ACCOUNT_INDUSTRY_MAP[account]
+
+def _on_account_change(account_key, pending_key):
+    account = st.session_state[account_key]
+    if st.session_state.saved_problem and not st.session_state.edit_confirmed:
+        # Saved details exist - ask before switching (No restores the saved account)
+        st.session_state[pending_key] = account
+    else:
+        _apply_account(account)
+
+def _confirm_account_change(page_key_prefix, pending_key):
+    st.session_state.edit_confirmed = True
+    _apply_account(st.session_state.pop(pending_key))
+    # Show Save button after user clicks "Yes" in ALL pages
+    st.session_state[f'{page_key_prefix}_show_save_btn'] = True
+
+def _cancel_account_change(pending_key):
+    st.session_state.pop(pending_key, None)
+    st.session_state.business_account = st.session_state.saved_account
+    st.session_state.business_industry = st.session_state.saved_industry
+
+def _save_problem_details(page_key_prefix, problem_key, status_key):
+    # The text area's own callback may not have run yet in this rerun
+    st.session_state.business_problem = st.session_state.get(problem_key, st.session_state.business_problem)
+    if (st.session_state.business_account == "Select Account" or
+        st.session_state.business_industry == "Select Industry" or
+        not st.session_state.business_problem.strip()):
+        st.session_state[status_key] = "invalid"
+        return
+    st.session_state.saved_account = st.session_state.business_account
+    st.session_state.saved_industry = st.session_state.business_industry
+    st.session_state.saved_problem = st.session_state.business_problem
+    st.session_state.edit_confirmed = False
+    # A near-duplicate found for the previous problem no longer applies (Run Full Analysis)
+    st.session_state.similar_analysis = None
+    st.session_state.reused_analysis = None
+    # Hide Save button after successful save in ALL pages
+    st.session_state[f'{page_key_prefix}_show_save_btn'] = False
+    st.session_state[status_key] = "saved"
+
 def render_unified_business_inputs(page_key_prefix: str = "global", show_titles: bool = True,
                                    title_account_industry: str = "Account & Industry",
                                    title_problem: str = "Business Problem Description",
@@ -929,13 +502,15 @@ def render_unified_business_inputs(page_key_prefix: str = "global", show_titles:
     if 'business_problem' not in st.session_state:
         st.session_state.business_problem = st.session_state.saved_problem
 
-    # Confirmation flags
+    # Confirmation flag
     if 'edit_confirmed' not in st.session_state:
         st.session_state.edit_confirmed = False
-    if 'cancel_clicked' not in st.session_state:
-        st.session_state.cancel_clicked = False
-    if 'selectbox_key_counter' not in st.session_state:
-        st.session_state.selectbox_key_counter = 0
+
+    account_key = f"{page_key_prefix}_account_select"
+    industry_key = f"{page_key_prefix}_industry_select"
+    problem_key = f"{page_key_prefix}_problem_textarea"
+    pending_key = f"{page_key_prefix}_pending_account"
+    status_key = f"{page_key_prefix}_save_status"
 
     # Enhanced input styles with better visibility
     st.markdown("""
@@ -955,62 +530,43 @@ def render_unified_business_inputs(page_key_prefix: str = "global", show_titles:
     if show_titles:
         st.markdown(f'<div class="section-title-box"><h3>{title_account_industry}</h3></div>', unsafe_allow_html=True)
 
-    c1, c2 = st.columns(2)
+    # Widgets mirror the business_* values (or an account awaiting confirmation); callbacks
+    # write changes back before the script runs, so every action costs a single run
+    pending_account = st.session_state.get(pending_key)
+    account_value = pending_account or st.session_state.business_account
+    _sync_widget(account_key, account_value if account_value in ACCOUNTS else ACCOUNTS[0])
+    industry_value = st.session_state.business_industry
+    _sync_widget(industry_key, industry_value if industry_value in INDUSTRIES else INDUSTRIES[0])
+    _sync_widget(problem_key, st.session_state.business_problem)
 
-    show_confirmation = False
-    account_change_value = None
+    c1, c2 = st.columns(2)
 
     with c1:
-        account_input = st.selectbox(
+        st.selectbox(
             "Select Account:",
             options=ACCOUNTS,
-            index=ACCOUNTS.index(st.session_state.business_account) if st.session_state.business_account in ACCOUNTS else 0,
-            key=f"{page_key_prefix}_account_select_{st.session_state.selectbox_key_counter}"
+            key=account_key,
+            on_change=_on_account_change,
+            args=(account_key, pending_key)
         )
 
-        # 🔥 FIX: Handle account change and auto-map industry IMMEDIATELY
-        if account_input != st.session_state.business_account:
-            if st.session_state.cancel_clicked:
-                st.session_state.cancel_clicked = False
-            elif st.session_state.saved_problem and not st.session_state.edit_confirmed:
-                show_confirmation = True
-                account_change_value = account_input
-            else:
-                # Immediate update
-                st.session_state.business_account = account_input
-                # 🔥 AUTO-MAP INDUSTRY IMMEDIATELY - This is the key fix
-                if account_input in ACCOUNT_INDUSTRY_MAP:
-                    mapped_industry = ACCOUNT_INDUSTRY_MAP[account_input]
-                    st.session_state.business_industry = mapped_industry
-                    # Force a rerun to update the UI
-                    st.rerun()
-
     with c2:
-        # 🔥 FIX: Always get the latest values from session state
-        current_industry = st.session_state.business_industry
+        # Industry is derived from the account whenever the account has a mapping
         current_account = st.session_state.business_account
-        
-        # Check if industry should be auto-mapped (disabled)
         is_auto_mapped = current_account in ACCOUNT_INDUSTRY_MAP and current_account != "Select Account"
-        
-        # 🔥 FIX: Ensure the index is calculated correctly with current values
-        industry_index = INDUSTRIES.index(current_industry) if current_industry in INDUSTRIES else 0
-        
-        industry_input = st.selectbox(
-            "Industry:", 
+
+        st.selectbox(
+            "Industry:",
             options=INDUSTRIES,
-            index=industry_index,
             disabled=is_auto_mapped,
             help="Industry is automatically mapped for this account" if is_auto_mapped else "Select the industry for this analysis",
-            key=f"{page_key_prefix}_industry_select_{st.session_state.selectbox_key_counter}"
+            key=industry_key,
+            on_change=_copy_widget,
+            args=(industry_key, "business_industry")
         )
-        
-        # Only allow manual industry change if not auto-mapped
-        if not is_auto_mapped and industry_input != st.session_state.business_industry:
-            st.session_state.business_industry = industry_input
 
     # Confirmation dialog for account change
-    if show_confirmation:
+    if pending_account:
         st.markdown("""
             <style>
             .confirmation-box { background: linear-gradient(135deg, rgba(255,107,53,0.15), rgba(139,30,30,0.15)); border: 2px solid rgba(255,107,53,0.4); border-radius: 10px; padding: 18px 24px; box-shadow: 0 4px 12px rgba(139,30,30,0.2); margin: 15px 0; }
@@ -1026,39 +582,25 @@ def render_unified_business_inputs(page_key_prefix: str = "global", show_titles:
         """, unsafe_allow_html=True)
         colA, colB, colC, colD, colE = st.columns([3, 1.2, 0.6, 1.2, 3])
         with colB:
-            if st.button("Yes", key=f"{page_key_prefix}_confirm_edit", type="primary"):
-                st.session_state.edit_confirmed = True
-                st.session_state.business_account = account_change_value
-                # 🔥 AUTO-MAP INDUSTRY IN CONFIRMATION FLOW
-                if account_change_value in ACCOUNT_INDUSTRY_MAP:
-                    mapped_industry = ACCOUNT_INDUSTRY_MAP[account_change_value]
-                    st.session_state.business_industry = mapped_industry
-                st.session_state.selectbox_key_counter += 1
-                # Show Save button after user clicks "Yes" in ALL pages
-                st.session_state[f'{page_key_prefix}_show_save_btn'] = True
-                _safe_rerun()
+            st.button("Yes", key=f"{page_key_prefix}_confirm_edit", type="primary",
+                      on_click=_confirm_account_change, args=(page_key_prefix, pending_key))
         with colD:
-            if st.button("No", key=f"{page_key_prefix}_cancel_edit", type="secondary"):
-                st.session_state.cancel_clicked = True
-                st.session_state.business_account = st.session_state.saved_account
-                st.session_state.business_industry = st.session_state.saved_industry
-                st.session_state.selectbox_key_counter += 1
-                _safe_rerun()
+            st.button("No", key=f"{page_key_prefix}_cancel_edit", type="secondary",
+                      on_click=_cancel_account_change, args=(pending_key,))
 
     # Problem section
     if show_titles:
         st.markdown(f'<div class="section-title-box"><h3>{title_problem}</h3></div>', unsafe_allow_html=True)
 
-    problem_input = st.text_area(
+    st.text_area(
         "Describe your business problem in detail:",
-        value=st.session_state.business_problem,
         height=180,
         placeholder="Feel free to just type down your problem statement, or copy-paste if you have it handy somewhere...",
         label_visibility="collapsed",
-        key=f"{page_key_prefix}_problem_textarea"
+        key=problem_key,
+        on_change=_copy_widget,
+        args=(problem_key, "business_problem")
     )
-    if problem_input != st.session_state.business_problem:
-        st.session_state.business_problem = problem_input
 
     # Add a new parameter to control Save button visibility
     # For Welcome page (main_app), default to True initially, then use session state
@@ -1068,20 +610,15 @@ def render_unified_business_inputs(page_key_prefix: str = "global", show_titles:
     
     # Show Save button based on session state
     if show_save_button:
-        if st.button(save_button_label, use_container_width=True, type="primary", key=f"{page_key_prefix}_save_btn"):
-            if (st.session_state.business_account == "Select Account" or
-                st.session_state.business_industry == "Select Industry" or
-                not st.session_state.business_problem.strip()):
-                st.error("⚠️ Please select an Account, Industry, and provide a Business Problem description.")
-            else:
-                st.session_state.saved_account = st.session_state.business_account
-                st.session_state.saved_industry = st.session_state.business_industry
-                st.session_state.saved_problem = st.session_state.business_problem
-                st.session_state.edit_confirmed = False
-                # Hide Save button after successful save in ALL pages
-                st.session_state[f'{page_key_prefix}_show_save_btn'] = False
-                st.success("✅ Problem details saved!")
-                _safe_rerun()
+        st.button(save_button_label, use_container_width=True, type="primary", key=f"{page_key_prefix}_save_btn",
+                  on_click=_save_problem_details, args=(page_key_prefix, problem_key, status_key))
+
+    # Outcome of a Save click, set by its callback earlier in this run
+    save_status = st.session_state.pop(status_key, None)
+    if save_status == "invalid":
+        st.error("⚠️ Please select an Account, Industry, and provide a Business Problem description.")
+    elif save_status == "saved":
+        st.success("✅ Problem details saved!")
 
     return (
         st.session_state.business_account,
@@ -1091,6 +628,222 @@ def render_unified_business_inputs(page_key_prefix: str = "global", show_titles:
 
 
 
+def render_endpoint_health(key_prefix="admin"):
+    """Show the process-wide circuit breaker state of every Talos endpoint called so far"""
+    st.markdown("### 🩺 Talos Endpoint Health")
+
+    snapshots = breaker_snapshots()
+    if not snapshots:
+        st.info("💡 No Talos calls have been made since the server started.")
+        return
+
+    labels = endpoint_labels()
+    state_icons = {OPEN: "🔴 Open", HALF_OPEN: "🟡 Probing"}
+    rows = []
+    for snap in snapshots:
+        rows.append({
+            "Endpoint": labels.get(snap["url"], snap["url"]),
+            "State": state_icons.get(snap["state"], "🟢 Closed"),
+            "Consecutive Failures": snap["failures"],
+            "Times Opened": snap["times_opened"],
+            "Last Latency (s)": round(snap["last_latency"], 1) if snap["last_latency"] is not None else None,
+            "Last Error": snap["last_error"],
+            "Next Probe (s)": round(snap["retry_in"]) if snap["retry_in"] is not None else None,
+        })
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
+    open_count = sum(1 for snap in snapshots if snap["state"] == OPEN)
+    if open_count:
+        st.warning(f"⚠️ {open_count} endpoint(s) are failing fast until their next probe.")
+        st.button("🔄 Reset Circuit Breakers", key=f"{key_prefix}_reset_breakers_btn", on_click=reset_breakers)
+
+
+# Rolling windows offered on the performance dashboard
+PERFORMANCE_WINDOWS = {"Last 5 minutes": 5 * 60, "Last 15 minutes": 15 * 60, "Last hour": 60 * 60}
+
+
+@fragment
+def render_performance_dashboard(key_prefix="admin"):
+    """Rolling-window Talos call latency, cache, error and job metrics from talos_metrics"""
+    st.markdown("### ⚡ Performance")
+
+    window_name = st.selectbox("🕒 Window:", list(PERFORMANCE_WINDOWS), key=f"{key_prefix}_perf_window")
+    registry = talos_metrics.get_metrics_registry()
+    # Merged from the per-minute rollups - the raw call records are not rescanned
+    window = registry.endpoint_window(PERFORMANCE_WINDOWS[window_name])
+
+    calls = sum(rollup["calls"] for rollup in window.values())
+    outcomes = {}
+    for rollup in window.values():
+        for outcome, count in rollup["outcomes"].items():
+            outcomes[outcome] = outcomes.get(outcome, 0) + count
+
+    def rate(*names):
+        return f"{sum(outcomes.get(name, 0) for name in names) / calls:.0%}" if calls else "–"
+
+    col1, col2, col3, col4, col5 = st.columns(5)
+    col1.metric("📞 Calls", calls)
+    col2.metric("⚡ Cache Hits", rate(talos_metrics.CACHE_HIT))
+    col3.metric("❌ Errors", rate(*talos_metrics.ERROR_OUTCOMES))
+    col4.metric("⏱️ Timeouts", rate(talos_metrics.TIMEOUT))
+    col5.metric("🔄 Jobs In Flight", get_job_runner().running_count())
+
+    cache_stats = get_response_cache().stats()
+    st.caption(f"Response cache since start: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+               f"{cache_stats['entries']} entries")
+
+    if not calls:
+        st.info("💡 No Talos calls in this window.")
+    else:
+        labels = endpoint_labels()
+        rows = []
+        for url, rollup in window.items():
+            answered = sum(rollup["histogram"])
+            p50 = talos_metrics.histogram_percentile(rollup["histogram"], 50)
+            p95 = talos_metrics.histogram_percentile(rollup["histogram"], 95)
+            rows.append({
+                "Endpoint": labels.get(url, url),
+                "Calls": rollup["calls"],
+                "Cache Hits": rollup["outcomes"].get(talos_metrics.CACHE_HIT, 0),
+                "Errors": sum(rollup["outcomes"].get(name, 0) for name in talos_metrics.ERROR_OUTCOMES),
+                "Timeouts": rollup["outcomes"].get(talos_metrics.TIMEOUT, 0),
+                "Mean (s)": round(rollup["latency_total"] / answered, 2) if answered else None,
+                "p50 ≤ (s)": p50,
+                "p95 ≤ (s)": p95,
+                "Latency Histogram": rollup["histogram"],
+                "KB": round(rollup["bytes"] / 1024, 1),
+            })
+        rows.sort(key=lambda row: row["Mean (s)"] or 0, reverse=True)
+        st.dataframe(
+            pd.DataFrame(rows),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Latency Histogram": st.column_config.BarChartColumn(
+                    "Latency Histogram",
+                    help="Calls per latency bucket: " + ", ".join(talos_metrics.latency_bucket_labels()),
+                    y_min=0,
+                ),
+            },
+        )
+
+    st.markdown("#### 🐢 Slowest Problems")
+    slowest = registry.slowest_analyses(PERFORMANCE_WINDOWS[window_name])
+    if slowest:
+        st.dataframe(pd.DataFrame([{
+            "Finished": datetime.fromtimestamp(analysis.timestamp).strftime("%H:%M:%S"),
+            "Agent": analysis.agent,
+            "Problem": analysis.problem,
+            "Seconds": round(analysis.seconds, 1),
+            "Answers": analysis.questions,
+            "Failed": analysis.failed,
+        } for analysis in slowest]), use_container_width=True, hide_index=True)
+    else:
+        st.info("💡 No analyses finished in this window.")
+
+    timings = registry.timing_summary()
+    if timings:
+        with st.expander("🧮 Parse & render timings (cache misses)"):
+            st.dataframe(pd.DataFrame(timings).round(3), use_container_width=True, hide_index=True)
+
+
+@fragment
+def _render_admin_feedback_report():
+    """Filters, paged table and CSV download of the admin panel; filter changes rerun only this"""
+    store = get_feedback_store()
+    total_feedback = store.count()
+
+    if total_feedback:
+        # Add TWO filter dropdowns
+        st.markdown("#### 🔍 Filter Options")
+
+        col_filter1, col_filter2 = st.columns(2)
+
+        with col_filter1:
+            # Agent filter dropdown
+            agent_filter = st.selectbox(
+                "🤖 Select Agent:",
+                options=[
+                    "All Agents",
+                    "Vocabulary Agent",
+                    "Current System Agent",
+                    "Volatility Agent",
+                    "Ambiguity Agent",
+                    "Complexity Agent",
+                    "Interconnectedness Agent",
+                    "Uncertainty Agent",
+                    "Hardness Agent"
+                ],
+                key="admin_agent_filter",
+                help="Filter feedback by specific agent"
+            )
+
+        with col_filter2:
+            # Feedback type filter dropdown
+            feedback_type_filter = st.selectbox(
+                "📋 Select Feedback Type:",
+                options=[
+                    "All Feedback Types",
+                    "I have read it, found it useful, thanks.",
+                    "I have read it, found some definitions to be off.",
+                    "The widget seems interesting, but I have some suggestions on the features."
+                ],
+                key="admin_feedback_type_filter",
+                help="Filter by specific feedback type"
+            )
+
+        # Apply BOTH filters in SQL ("All ..." leaves a column unfiltered)
+        filters = {
+            "Agent": agent_filter if agent_filter != "All Agents" else "",
+            "FeedbackType": feedback_type_filter if feedback_type_filter != "All Feedback Types" else "",
+        }
+        matched = store.count(filters)
+
+        # Show count with filter summary
+        filter_summary = []
+        if agent_filter != "All Agents":
+            filter_summary.append(f"Agent: **{agent_filter}**")
+        if feedback_type_filter != "All Feedback Types":
+            filter_summary.append(f"Type: **{feedback_type_filter[:50]}...**")
+
+        if filter_summary:
+            st.info(f"📊 Showing **{matched}** of **{total_feedback}** feedback entries | Filters: {' | '.join(filter_summary)}")
+        else:
+            st.info(f"📊 Showing **{matched}** total feedback entries (no filters applied)")
+
+        # Display filtered feedback data table
+        if matched:
+            st.markdown("#### 📋 Feedback Data")
+
+            # Create descriptive filename
+            agent_part = agent_filter.replace(' ', '_') if agent_filter != "All Agents" else "AllAgents"
+            type_part = feedback_type_filter.replace(' ', '_').replace('.', '').replace(',', '')[:30] if feedback_type_filter != "All Feedback Types" else "AllTypes"
+            download_filename = f"feedback_{agent_part}_{type_part}_{datetime.now().strftime('%Y%m%d')}.csv"
+
+            render_feedback_browser(filters, "admin_panel", download_filename, height=400)
+        else:
+            st.warning(f"⚠️ No feedback found matching your filters.")
+            st.info("💡 Try adjusting the filters to see more results.")
+    else:
+        st.info("📭 No feedback data available yet. Submit feedback from the main page to see it here.")
+
+
+def _leave_admin_panel():
+    st.session_state.current_page = 'login'
+    st.session_state.show_admin_panel = False
+    st.session_state.admin_view_selected = False
+    st.session_state.admin_authenticated = False
+    st.session_state.admin_access_requested = False
+    try:
+        st.query_params.clear()
+    except:
+        pass
+
+
+def _request_admin_access():
+    st.session_state.admin_access_requested = True
+
+
 def render_admin_panel(admin_password="admin123"):
     """
     Render admin panel with password authentication and feedback download.
@@ -1116,17 +869,7 @@ def render_admin_panel(admin_password="admin123"):
     # Small back button to return to main app
     col_back1, col_back2, col_back3 = st.columns([1, 2, 1])
     with col_back1:
-        if st.button("← Back to Login", key="admin_back_btn", use_container_width=True):
-            st.session_state.current_page = 'login'
-            st.session_state.show_admin_panel = False
-            st.session_state.admin_view_selected = False
-            st.session_state.admin_authenticated = False
-            st.session_state.admin_access_requested = False
-            try:
-                st.query_params.clear()
-            except:
-                pass
-            _safe_rerun()
+        st.button("← Back to Login", key="admin_back_btn", use_container_width=True, on_click=_leave_admin_panel)
 
     st.markdown("---")
 
@@ -1138,9 +881,8 @@ def render_admin_panel(admin_password="admin123"):
         st.info("💡 Click the button below to request admin access")
         col_btn1, col_btn2, col_btn3 = st.columns([1, 1, 1])
         with col_btn2:
-            if st.button("🔓 Request Admin Access", use_container_width=True, type="primary", key="request_admin_btn"):
-                st.session_state.admin_access_requested = True
-                _safe_rerun()
+            st.button("🔓 Request Admin Access", use_container_width=True, type="primary", key="request_admin_btn",
+                      on_click=_request_admin_access)
     else:
         # Show password input after button is clicked
         password = st.text_input("Enter admin password:",
@@ -1166,106 +908,10 @@ def render_admin_panel(admin_password="admin123"):
 
             # Admin download options
             st.markdown("### 📋 Feedback Report Management")
+            _render_admin_feedback_report()
 
-            # Get combined feedback data from all sources
-            df = get_all_feedback_data()
-
-            if df is not None and not df.empty:
-                # Add TWO filter dropdowns
-                st.markdown("#### 🔍 Filter Options")
-                
-                col_filter1, col_filter2 = st.columns(2)
-                
-                with col_filter1:
-                    # Agent filter dropdown
-                    agent_filter = st.selectbox(
-                        "🤖 Select Agent:",
-                        options=[
-                            "All Agents",
-                            "Vocabulary Agent",
-                            "Current System Agent",
-                            "Volatility Agent",
-                            "Ambiguity Agent",
-                            "Complexity Agent",
-                            "Interconnectedness Agent",
-                            "Uncertainty Agent",
-                            "Hardness Agent"
-                        ],
-                        key="admin_agent_filter",
-                        help="Filter feedback by specific agent"
-                    )
-                
-                with col_filter2:
-                    # Feedback type filter dropdown
-                    feedback_type_filter = st.selectbox(
-                        "📋 Select Feedback Type:",
-                        options=[
-                            "All Feedback Types",
-                            "I have read it, found it useful, thanks.",
-                            "I have read it, found some definitions to be off.",
-                            "The widget seems interesting, but I have some suggestions on the features."
-                        ],
-                        key="admin_feedback_type_filter",
-                        help="Filter by specific feedback type"
-                    )
-
-                # Apply BOTH filters
-                filtered_df = df.copy()
-                
-                # Filter by Agent (if Agent column exists)
-                if 'Agent' in df.columns:
-                    if agent_filter != "All Agents":
-                        filtered_df = filtered_df[filtered_df['Agent'] == agent_filter]
-                else:
-                    if agent_filter != "All Agents":
-                        st.warning("⚠️ 'Agent' column not found in feedback data. Showing all agents.")
-                
-                # Filter by Feedback Type
-                if feedback_type_filter != "All Feedback Types":
-                    filtered_df = filtered_df[filtered_df['FeedbackType'] == feedback_type_filter]
-
-                # Show count with filter summary
-                filter_summary = []
-                if agent_filter != "All Agents":
-                    filter_summary.append(f"Agent: **{agent_filter}**")
-                if feedback_type_filter != "All Feedback Types":
-                    filter_summary.append(f"Type: **{feedback_type_filter[:50]}...**")
-                
-                if filter_summary:
-                    st.info(f"📊 Showing **{len(filtered_df)}** of **{len(df)}** feedback entries | Filters: {' | '.join(filter_summary)}")
-                else:
-                    st.info(f"📊 Showing **{len(filtered_df)}** total feedback entries (no filters applied)")
-
-                # Display filtered feedback data table
-                if not filtered_df.empty:
-                    st.markdown("#### 📋 Feedback Data")
-                    st.dataframe(filtered_df, use_container_width=True, height=400)
-
-                    st.markdown("<br>", unsafe_allow_html=True)
-
-                    # Download filtered feedback
-                    feedback_csv = filtered_df.to_csv(index=False).encode("utf-8")
-                    
-                    # Create descriptive filename
-                    agent_part = agent_filter.replace(' ', '_') if agent_filter != "All Agents" else "AllAgents"
-                    type_part = feedback_type_filter.replace(' ', '_').replace('.', '').replace(',', '')[:30] if feedback_type_filter != "All Feedback Types" else "AllTypes"
-                    download_filename = f"feedback_{agent_part}_{type_part}_{datetime.now().strftime('%Y%m%d')}.csv"
-
-                    col_dl1, col_dl2, col_dl3 = st.columns([1, 2, 1])
-                    with col_dl2:
-                        st.download_button(
-                            "⬇️ Download Filtered Feedback Report",
-                            feedback_csv,
-                            download_filename,
-                            "text/csv",
-                            use_container_width=True,
-                            type="primary"
-                        )
-                else:
-                    st.warning(f"⚠️ No feedback found matching your filters.")
-                    st.info("💡 Try adjusting the filters to see more results.")
-            else:
-                st.info("📭 No feedback data available yet. Submit feedback from the main page to see it here.")
+            st.markdown("---")
+            render_endpoint_health(key_prefix="admin_panel")
 
         elif password and password != "":
             st.session_state.admin_authenticated = False
@@ -0,0 +1,55 @@
+// Light/dark theme toggle for the shared header (loaded by shared_header.load_static_assets).
+// Runs in the app document, once per browser tab; the click handler is delegated so
+// re-rendered headers and page switches keep working without rebinding.
+(function () {
+    if (window.talosTheme) {
+        return;
+    }
+    const doc = document;
+
+    function applyTheme(theme) {
+        doc.body.setAttribute('data-theme', theme);
+        localStorage.setItem('appTheme', theme);
+
+        const lightBtn = doc.getElementById('theme-light-btn');
+        const darkBtn = doc.getElementById('theme-dark-btn');
+        if (lightBtn && darkBtn) {
+            lightBtn.classList.toggle('active', theme === 'light');
+            darkBtn.classList.toggle('active', theme === 'dark');
+        }
+    }
+
+    // Apply the saved theme, retrying until the header buttons are in the DOM
+    function init(attempts) {
+        attempts = attempts || 0;
+        applyTheme(localStorage.getItem('appTheme') || 'light');
+        if (!doc.getElementById('theme-light-btn') && attempts < 15) {
+            setTimeout(function () { init(attempts + 1); }, 150);
+        }
+    }
+
+    doc.addEventListener('click', function (e) {
+        const button = e.target.closest && e.target.closest('#theme-light-btn, #theme-dark-btn');
+        if (!button) {
+            return;
+        }
+        e.preventDefault();
+        e.stopPropagation();
+        applyTheme(button.id === 'theme-dark-btn' ? 'dark' : 'light');
+    }, true);
+
+    // Theme changes from other tabs and other components
+    window.addEventListener('storage', function (e) {
+        if (e.key === 'appTheme' && e.newValue) {
+            applyTheme(e.newValue);
+        }
+    });
+    window.addEventListener('themeChange', function (e) {
+        if (e.detail && e.detail.theme) {
+            applyTheme(e.detail.theme);
+        }
+    });
+
+    window.talosTheme = { apply: applyTheme, init: init };
+    init();
+})();
@@ -0,0 +1,261 @@
+"""
+Headless batch classification of many business problems.
+Reads a CSV or JSONL file of (account, industry, problem) rows, runs the
+seven-agent pipeline for each (the same prompts, cleanup and score parsing
+as the pages) and appends one JSON line per row to the output file as soon
+as that row finishes. Rows already in the output are skipped, so an
+interrupted run resumes where it stopped. With --retry-failed a retried row
+replaces its earlier record: the last record per id wins, and the output is
+rewritten with one record per id once the run ends.
+
+    python talos_batch.py problems.csv results.jsonl --rows 4
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from response_cache import get_response_cache
+from talos_client import get_auth_token, build_talos_headers, get_talos_session, MAX_PARALLEL_QUESTIONS
+from talos_pipeline import iter_pipeline_results
+from talos_scores import parse_answer, score_dimensions, unscored_questions
+
+# ================================
+# ⚙️ Batch Settings
+# ================================
+
+# Problems analysed at once; each one runs up to MAX_PARALLEL_QUESTIONS calls,
+# so the default keeps the total within the pooled session's POOL_MAXSIZE
+DEFAULT_ROW_WORKERS = 4
+
+# Accepted spellings of each input column (compared case-insensitively)
+COLUMN_ALIASES = {
+    "account": ("account", "account name"),
+    "industry": ("industry",),
+    "problem": ("problem", "problem statement", "problem_statement", "business problem"),
+    "id": ("id", "row_id"),
+}
+
+
+# ================================
+# 📥 Input & Resume
+# ================================
+
+def _normalize_row(raw):
+    """Map one input record onto account/industry/problem/id, or None if it has no problem"""
+    lowered = {str(k).strip().lower(): ("" if v is None else str(v).strip()) for k, v in raw.items()}
+    row = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        row[field] = next((lowered[alias] for alias in aliases if lowered.get(alias)), "")
+    if not row["problem"]:
+        return None
+    if not row["id"]:
+        row["id"] = row_id(row["account"], row["industry"], row["problem"])
+    return row
+
+
+def row_id(account, industry, problem):
+    """Stable id of an input row without an id column"""
+    digest = hashlib.sha256("\x00".join((account, industry, problem)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def read_rows(path):
+    """Input rows from a .csv or .jsonl file, duplicates dropped"""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            records = [json.loads(line) for line in f if line.strip()]
+        else:
+            records = list(csv.DictReader(f))
+
+    rows, seen = [], set()
+    for raw in records:
+        row = _normalize_row(raw)
+        if row and row["id"] not in seen:
+            seen.add(row["id"])
+            rows.append(row)
+    return rows
+
+
+def read_records(path):
+    """{id: record} of the output file; when an id repeats, its last record wins"""
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Line cut short by an interrupted run - that row is redone
+                continue
+            records[record.get("id")] = record
+    return records
+
+
+def read_finished(path, retry_failed=False):
+    """Ids already written to the output file (only fully successful ones with retry_failed)"""
+    return {
+        record_id for record_id, record in read_records(path).items()
+        if not retry_failed or not record.get("failed")
+    }
+
+
+def compact_output(path):
+    """Rewrite the output file with one record per id (the last), in first-seen order"""
+    records = read_records(path)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        for record in records.values():
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    os.replace(temp_path, path)
+    return len(records)
+
+
+# ================================
+# 🚀 Row Execution
+# ================================
+
+def classify_row(row, headers, session, cache, question_workers=None, stop=None):
+    """
+    Run the pipeline for one row and return its output record.
+    Once stop (a threading.Event) is set, no further pipeline stage starts:
+    the questions already in flight finish and None is returned.
+    """
+    if stop is not None and stop.is_set():
+        return None
+    started = time.monotonic()
+    answers, failed = {}, []
+    results = iter_pipeline_results(
+        row["problem"], row["account"], row["industry"], headers,
+        max_workers=question_workers, session=session, cache=cache
+    )
+    # Closing the generator waits for the calls in flight but submits no new ones
+    with closing(results):
+        for name, result in results:
+            if stop is not None and stop.is_set():
+                return None
+            answers[name] = result.text
+            if not result.ok:
+                failed.append(name)
+
+    answered = {name: text for name, text in answers.items() if name not in failed}
+    hardness = parse_answer("hardness_summary", answered.get("hardness_summary", ""))
+    local = score_dimensions(answered)
+
+    return {
+        "id": row["id"],
+        "account": row["account"],
+        "industry": row["industry"],
+        "problem": row["problem"],
+        # Locally averaged scores win over the ones the model wrote, as on the Hardness page
+        "score": local.score if local else hardness.score,
+        "classification": local.classification if local else hardness.classification,
+        "dimension_averages": dict(local.dimension_averages) if local else dict(hardness.dimension_averages),
+        "justification": hardness.justification,
+        "failed": sorted(failed),
+        # Answered questions without a parseable score; without local scores the model's own score is used
+        "unscored": list(unscored_questions(answered)),
+        "elapsed_seconds": round(time.monotonic() - started, 2),
+        "answers": answers,
+    }
+
+
+def run_batch(input_path, output_path, row_workers=DEFAULT_ROW_WORKERS, question_workers=None,
+              retry_failed=False, log=sys.stderr):
+    """
+    Classify every unfinished row of input_path, appending records to output_path.
+    Returns (written, skipped). Records are written by this thread only, one
+    flushed line each, so a crash loses at most the rows still in flight.
+    With retry_failed the output is compacted afterwards, so each retried
+    row's new record replaces its failed one.
+    """
+    rows = read_rows(input_path)
+    finished = read_finished(output_path, retry_failed)
+    todo = [row for row in rows if row["id"] not in finished]
+    skipped = len(rows) - len(todo)
+    print(f"{len(rows)} rows, {skipped} already done, {len(todo)} to run", file=log)
+    if not todo:
+        return 0, skipped
+
+    headers = build_talos_headers(get_auth_token())
+    session = get_talos_session()
+    cache = get_response_cache()
+
+    # Never append onto a line left unterminated by an interrupted run
+    needs_newline = False
+    if os.path.exists(output_path) and os.path.getsize(output_path):
+        with open(output_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+
+    written = 0
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=max(1, row_workers), thread_name_prefix="talos-batch")
+    try:
+        with open(output_path, "a", encoding="utf-8") as out:
+            if needs_newline:
+                out.write("\n")
+            futures = {
+                pool.submit(classify_row, row, headers, session, cache, question_workers, stop): row
+                for row in todo
+            }
+            for future in as_completed(futures):
+                row = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    print(f"❌ {row['id']}: {e}", file=log)
+                    continue
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                written += 1
+                failures = f", {len(record['failed'])} failed" if record["failed"] else ""
+                print(f"[{written}/{len(todo)}] {row['account'] or '-'}: {record['classification']} "
+                      f"({record['score']}) in {record['elapsed_seconds']}s{failures}", file=log)
+    except KeyboardInterrupt:
+        stop.set()
+        print(f"Interrupted after {written} rows - rows already running stop after their current "
+              f"questions; rerun the same command to resume", file=log)
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        if retry_failed and written:
+            compact_output(output_path)
+    pool.shutdown()
+    return written, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Classify a CSV/JSONL of business problems with the Talos agents")
+    parser.add_argument("input", help="CSV or JSONL with account, industry and problem columns")
+    parser.add_argument("output", help="JSONL file results are appended to (and resumed from)")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROW_WORKERS,
+                        help=f"problems analysed at once (default {DEFAULT_ROW_WORKERS})")
+    parser.add_argument("--question-workers", type=int, default=MAX_PARALLEL_QUESTIONS,
+                        help=f"agent questions in flight per problem (default {MAX_PARALLEL_QUESTIONS})")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="also rerun rows whose earlier record has failed questions; the new record "
+                             "replaces the failed one (last record per id wins) and the output is "
+                             "rewritten with one record per id when the run ends")
+    args = parser.parse_args(argv)
+
+    if not get_auth_token():
+        print("⚠️ AUTH_TOKEN is not set - requests go out without an Authorization header", file=sys.stderr)
+
+    try:
+        written, skipped = run_batch(args.input, args.output, args.rows, args.question_workers, args.retry_failed)
+    except KeyboardInterrupt:
+        return 130
+    print(f"✅ {written} rows written, {skipped} skipped", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""
+Offline end-to-end benchmarks of the app's own request/parse/render path.
+Starts talos_stub on a free local port, points TALOS_BASE_URL at it and then
+drives each agent the way its page does: concurrent agency calls, payload
+cleanup, score parsing and card rendering. Reports single-session latency
+per agent, p50/p95/p99 of the full pipeline under N concurrent simulated
+sessions, time to first streamed text against time to the whole answer,
+and bytes allocated per agent (tracemalloc). The response cache is
+bypassed so every round really calls the stub. With the default zero stub
+latency the numbers are the app's overhead alone.
+
+    python talos_bench.py --sessions 1,4,16 --rounds 5 --latency lognormal:0.2:0.5
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import os
+import statistics
+import time
+import tracemalloc
+
+from talos_stub import start_stub_server, add_profile_arguments, profile_from_args
+
+# ================================
+# ⚙️ Benchmark Settings
+# ================================
+
+DEFAULT_ROUNDS = 5
+DEFAULT_SESSIONS = "1,4,16"
+
+BENCH_PROBLEM = "Reduce churn in our enterprise laptop contracts before the renewal window"
+BENCH_ACCOUNT = "Dell"
+BENCH_INDUSTRY = "Technology"
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:8.1f}"
+
+
+# ================================
+# 🧩 Agent Paths
+# ================================
+# The app modules are imported inside these functions: agent_configs reads
+# TALOS_BASE_URL at import, which is only known once the stub is listening.
+
+def bench_agents():
+    """(agent, API_CONFIGS, payload cleanup, render(name, text)) in page order"""
+    from agent_configs import (
+        VOCABULARY_API_CONFIGS, CURRENT_SYSTEM_API_CONFIGS, VOLATILITY_API_CONFIGS,
+        AMBIGUITY_API_CONFIGS, UNCERTAINTY_API_CONFIGS, HARDNESS_API_CONFIGS,
+    )
+    from talos_format import answer_html, section_html, dimension_answer_html, hardness_detail_html
+    from talos_text import payload_to_text, current_system_payload_to_text
+
+    # Unwrap the st.cache_data memoization so every round pays the real render cost
+    def render_dimension(name, text):
+        return dimension_answer_html.__wrapped__(text, "No data", BENCH_ACCOUNT, BENCH_INDUSTRY)
+
+    return [
+        ("Vocabulary", VOCABULARY_API_CONFIGS, payload_to_text,
+         lambda name, text: answer_html.__wrapped__(text, "vocabulary", BENCH_ACCOUNT, BENCH_INDUSTRY)),
+        ("Current System", CURRENT_SYSTEM_API_CONFIGS, current_system_payload_to_text,
+         lambda name, text: section_html.__wrapped__(text, "current_system")),
+        ("Volatility", VOLATILITY_API_CONFIGS, payload_to_text, render_dimension),
+        ("Ambiguity", AMBIGUITY_API_CONFIGS, payload_to_text, render_dimension),
+        # Interconnectedness calls the same agencies as Uncertainty
+        ("Uncertainty", UNCERTAINTY_API_CONFIGS, payload_to_text, render_dimension),
+        ("Hardness Summary", HARDNESS_API_CONFIGS, payload_to_text,
+         lambda name, text: hardness_detail_html.__wrapped__(text)),
+    ]
+
+
+def bench_resources():
+    """Headers, pooled session and a cache that never hits"""
+    from response_cache import ResponseCache
+    from talos_client import build_talos_headers, get_talos_session
+
+    return build_talos_headers("bench-token"), get_talos_session(), ResponseCache(max_entries=0, cache_dir="")
+
+
+def run_agent(agent, headers, session, cache, upstream):
+    """One page analysis: returns (request, parse, render seconds, failed questions)"""
+    from talos_client import iter_concurrent_results
+    from talos_pipeline import build_full_context
+    from talos_scores import parse_answer
+
+    name, configs, postprocess, render = agent
+    context = build_full_context(BENCH_PROBLEM, BENCH_ACCOUNT, BENCH_INDUSTRY)
+    if name == "Current System":
+        context = BENCH_PROBLEM
+
+    started = time.perf_counter()
+    results = dict(iter_concurrent_results(configs, context, headers, postprocess, outputs=upstream,
+                                           session=session, cache=cache))
+    requested = time.perf_counter()
+    for question, result in results.items():
+        parse_answer.__wrapped__(question, result.text)
+    parsed = time.perf_counter()
+    for question, result in results.items():
+        render(question, result.text)
+    rendered = time.perf_counter()
+
+    failed = sum(1 for result in results.values() if not result.ok)
+    return requested - started, parsed - requested, rendered - parsed, failed
+
+
+def run_session(agents, headers, session, cache):
+    """One simulated user running the whole pipeline, then parsing and rendering every card"""
+    from talos_pipeline import iter_pipeline_results
+    from talos_scores import parse_answer, score_dimensions
+
+    renders = {cfg["name"]: render for _, configs, _, render in agents for cfg in configs}
+    started = time.perf_counter()
+    results = dict(iter_pipeline_results(BENCH_PROBLEM, BENCH_ACCOUNT, BENCH_INDUSTRY, headers,
+                                         session=session, cache=cache))
+    answers = {name: result.text for name, result in results.items() if result.ok}
+    for name, text in answers.items():
+        parse_answer.__wrapped__(name, text)
+        renders[name](name, text)
+    score_dimensions(answers)
+    return time.perf_counter() - started, len(results) - len(answers)
+
+
+# ================================
+# 📊 Scenarios
+# ================================
+
+def bench_single_session(agents, rounds, upstream):
+    """Per-agent latency split into request, parse and render"""
+    from circuit_breaker import reset_breakers
+
+    headers, session, cache = bench_resources()
+    report = {}
+    print("\nSingle session, per agent (ms)")
+    print(f"{'agent':<18}{'req p50':>9}{'req p95':>9}{'parse':>9}{'render':>9}{'total p50':>11}  failed")
+    for agent in agents:
+        reset_breakers()
+        samples = [run_agent(agent, headers, session, cache, upstream) for _ in range(rounds)]
+        requests_s = [s[0] for s in samples]
+        totals = [s[0] + s[1] + s[2] for s in samples]
+        row = {
+            "request_p50": percentile(requests_s, 50),
+            "request_p95": percentile(requests_s, 95),
+            "parse_mean": statistics.mean(s[1] for s in samples),
+            "render_mean": statistics.mean(s[2] for s in samples),
+            "total_p50": percentile(totals, 50),
+            "failed": sum(s[3] for s in samples),
+        }
+        report[agent[0]] = row
+        print(f"{agent[0]:<18}{_ms(row['request_p50'])} {_ms(row['request_p95'])} {_ms(row['parse_mean'])} "
+              f"{_ms(row['render_mean'])}   {_ms(row['total_p50'])}  {row['failed']}")
+    return report
+
+
+def bench_concurrent_sessions(agents, session_counts, rounds):
+    """Full-pipeline latency percentiles with N sessions running at once"""
+    from circuit_breaker import reset_breakers
+
+    headers, session, cache = bench_resources()
+    report = {}
+    print("\nConcurrent sessions, full pipeline (ms)")
+    print(f"{'sessions':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'runs/s':>9}  failed")
+    for count in session_counts:
+        reset_breakers()
+        latencies, failed = [], 0
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=count, thread_name_prefix="bench-session") as pool:
+            for _ in range(rounds):
+                runs = [pool.submit(run_session, agents, headers, session, cache) for _ in range(count)]
+                for run in runs:
+                    latency, run_failed = run.result()
+                    latencies.append(latency)
+                    failed += run_failed
+        elapsed = time.perf_counter() - started
+        row = {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "runs_per_second": len(latencies) / elapsed if elapsed else 0.0,
+            "failed": failed,
+        }
+        report[count] = row
+        print(f"{count:>8}{_ms(row['p50']):>10}{_ms(row['p95']):>10}{_ms(row['p99']):>10}"
+              f"{row['runs_per_second']:>9.2f}  {failed}")
+    return report
+
+
+def bench_streaming(agents, rounds, upstream):
+    """Time to the first streamed text vs the full answer, first question of each agent"""
+    from talos_client import call_question
+    from talos_pipeline import build_full_context
+
+    headers, session, cache = bench_resources()
+    context = build_full_context(BENCH_PROBLEM, BENCH_ACCOUNT, BENCH_INDUSTRY)
+    report = {}
+    print("\nStreaming, first question per agent (ms)")
+    print(f"{'agent':<18}{'first text':>11}{'answer':>9}")
+    for name, configs, postprocess, _ in agents:
+        firsts, totals = [], []
+        for _ in range(rounds):
+            first = []
+            started = time.perf_counter()
+            call_question(configs[0], context, upstream, headers, postprocess, session=session, cache=cache,
+                          on_text=lambda text: first or first.append(time.perf_counter() - started))
+            totals.append(time.perf_counter() - started)
+            # A stub started with --no-stream never calls on_text
+            firsts.append(first[0] if first else totals[-1])
+        report[name] = {"first_text_p50": percentile(firsts, 50), "answer_p50": percentile(totals, 50)}
+        print(f"{name:<18}{_ms(report[name]['first_text_p50']):>11}{_ms(report[name]['answer_p50']):>9}")
+    return report
+
+
+def bench_allocations(agents, upstream):
+    """Peak and retained bytes traced while one agent analysis runs"""
+    headers, session, cache = bench_resources()
+    report = {}
+    print("\nAllocations per agent analysis (KiB)")
+    print(f"{'agent':<18}{'peak':>10}{'retained':>10}")
+    for agent in agents:
+        # Warm imports and compiled patterns so only the per-run allocations are traced
+        run_agent(agent, headers, session, cache, upstream)
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        run_agent(agent, headers, session, cache, upstream)
+        after, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report[agent[0]] = {"peak_bytes": peak - before, "retained_bytes": after - before}
+        print(f"{agent[0]:<18}{(peak - before) / 1024:>10.1f}{(after - before) / 1024:>10.1f}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline latency benchmarks against a local Talos stub")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help=f"repeats per scenario (default {DEFAULT_ROUNDS})")
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS,
+                        help=f"comma-separated concurrent session counts (default {DEFAULT_SESSIONS})")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    # Streamlit warns about running cached functions without a server
+    from streamlit.runtime.caching import cache_data_api, cache_resource_api
+    for module in (cache_data_api, cache_resource_api):
+        logging.getLogger(module.__name__).setLevel(logging.ERROR)
+
+    profile = profile_from_args(args)
+    server, base_url = start_stub_server(profile)
+    os.environ["TALOS_BASE_URL"] = base_url
+
+    import agent_configs
+    if agent_configs.TALOS_BASE_URL != base_url:
+        raise SystemExit("agent_configs was imported before the stub started - run talos_bench.py directly")
+
+    print(f"Talos stub on {base_url} (latency {args.latency}, error rate {args.error_rate}, "
+          f"payload >= {args.payload_bytes} bytes, streaming {'on' if args.stream else 'off'})")
+    try:
+        from talos_pipeline import iter_pipeline_results
+
+        agents = bench_agents()
+        headers, session, cache = bench_resources()
+        # Realistic upstream answers for the prompts of the downstream agents
+        upstream = {name: result.text for name, result in iter_pipeline_results(
+            BENCH_PROBLEM, BENCH_ACCOUNT, BENCH_INDUSTRY, headers, session=session, cache=cache
+        ) if result.ok}
+
+        results = {
+            "stub": {"latency": args.latency, "error_rate": args.error_rate, "payload_bytes": args.payload_bytes,
+                     "stream": args.stream},
+            "single_session": bench_single_session(agents, args.rounds, upstream),
+            "concurrent_sessions": bench_concurrent_sessions(
+                agents, [int(n) for n in args.sessions.split(",") if n.strip()], args.rounds
+            ),
+            "streaming": bench_streaming(agents, args.rounds, upstream),
+            "allocations": bench_allocations(agents, upstream),
+        }
+    finally:
+        server.shutdown()
+
+    print(f"\n{profile.calls} stub calls, {profile.errors} injected failures")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,513 @@
+"""
+Shared Talos reasoning API client for all Streamlit agents.
+Provides one pooled, keep-alive HTTP session per process, the common
+Tenant-ID/Authorization header assembly, cached reasoning lookups with
+retry/backoff behind per-endpoint circuit breakers, and concurrent dispatch of the per-question agency calls of an agent.
+Callers that want partial text ask for a server-sent event stream; answers
+are assembled from the streamed deltas, and an endpoint that ignores the
+request still gets the plain JSON path.
+Every call is timed into talos_metrics.
+"""
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+import streamlit as st
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from circuit_breaker import CircuitOpenError, get_breaker
+from response_cache import get_response_cache, make_cache_key
+import talos_metrics
+
+# ================================
+# ⚙️ Talos Connection Settings
+# ================================
+
+TENANT_ID = "talos"
+HEADERS_BASE = {"Content-Type": "application/json"}
+
+# Per-request timeout (seconds) for a single reasoning call
+REQUEST_TIMEOUT = 60
+
+# Upper bound on questions dispatched at once by a single agent
+MAX_PARALLEL_QUESTIONS = 8
+
+# Retry policy - 429 and gateway/server errors are usually transient
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 10.0
+
+# Overall budget (seconds) for one agent's analysis, retries included
+ANALYSIS_DEADLINE = 180
+
+# Connection pool sizing - every agency endpoint lives on the same host, so a
+# single pool serves all agents; maxsize bounds concurrent sockets to it.
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 32
+
+# Ask for text/event-stream when a caller can show partial answers (TALOS_STREAM=0 turns it off)
+STREAM_RESPONSES = os.environ.get("TALOS_STREAM", "1") != "0"
+STREAM_ACCEPT = "text/event-stream, application/json;q=0.9"
+
+# Event fields holding a text delta, in priority order; other events are ignored
+STREAM_DELTA_KEYS = ("delta", "text", "content", "result")
+
+
+# ================================
+# 🔐 Auth & Headers
+# ================================
+
+def get_auth_token():
+    """Read the Talos bearer token from the environment or Streamlit secrets"""
+    token = os.environ.get("AUTH_TOKEN", "")
+    try:
+        if not token:
+            token = st.secrets.get("AUTH_TOKEN", "")
+    except Exception:
+        pass
+    return token or ""
+
+
+def build_talos_headers(auth_token=None):
+    """Assemble the Content-Type, Tenant-ID and optional Authorization headers"""
+    headers = HEADERS_BASE.copy()
+    headers.update({
+        "Tenant-ID": TENANT_ID,
+        "X-Tenant-ID": TENANT_ID
+    })
+
+    if auth_token:
+        headers["Authorization"] = f"Bearer {auth_token}"
+
+    return headers
+
+
+# ================================
+# ⏱️ Connection Timing
+# ================================
+
+# Seconds each thread has spent opening connections since it last asked
+_connect_time = threading.local()
+
+
+def _add_connect_time(seconds):
+    _connect_time.seconds = getattr(_connect_time, "seconds", 0.0) + seconds
+
+
+def take_connect_time():
+    """DNS + TCP (+ TLS) seconds this thread spent since the last call, then reset"""
+    seconds = getattr(_connect_time, "seconds", 0.0)
+    _connect_time.seconds = 0.0
+    return seconds
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - started)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - started)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections report their setup time to the calling thread"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+# ================================
+# 🌐 Pooled Session
+# ================================
+
+@st.cache_resource(show_spinner=False)
+def get_talos_session():
+    """
+    Process-wide requests.Session shared by every agent, user session and rerun.
+    Reusing it keeps TCP/TLS connections to the Talos host alive between clicks.
+    """
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=False
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+def post_reasoning(url, goal, headers, timeout=REQUEST_TIMEOUT, session=None, stream=False):
+    """
+    Post an agency goal to a reasoning endpoint over the pooled session.
+    stream=True asks for an event stream and leaves the body unread.
+    """
+    session = session or get_talos_session()
+    if stream:
+        headers = dict(headers, Accept=STREAM_ACCEPT)
+    return session.post(
+        url,
+        headers=headers,
+        json={"agency_goal": goal},
+        timeout=timeout,
+        stream=stream
+    )
+
+
+# Prefixes of the error strings agents store in place of an answer
+ERROR_TEXT_PREFIXES = ("API Error", "Request timeout", "Connection error", "Circuit open", "Unexpected error", "Error:")
+
+
+def is_error_text(text):
+    """True when a stored agent output is one of the error messages rather than an answer"""
+    return not text or text.startswith(ERROR_TEXT_PREFIXES)
+
+
+class TalosAPIError(Exception):
+    """Non-200 response from a reasoning endpoint"""
+
+    def __init__(self, status_code, text, attempts=1):
+        super().__init__(f"API Error {status_code}: {text[:200]}")
+        self.status_code = status_code
+        self.text = text
+        self.attempts = attempts
+
+
+# ================================
+# 🔁 Retry Policy
+# ================================
+
+def _retry_after_seconds(response):
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP-date), if any"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+    delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempt - 1)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def post_with_retry(url, goal, headers, timeout=REQUEST_TIMEOUT, session=None, deadline=None,
+                    max_attempts=MAX_ATTEMPTS, trace=None, stream=False):
+    """
+    Post an agency goal, retrying 429/5xx responses and connection errors.
+    Returns (response, attempts). Reasoning calls have no side effects, so a
+    repeat is safe. deadline is a time.monotonic() budget shared by the whole
+    analysis: no attempt or backoff sleep runs past it. Every attempt reports to
+    the endpoint's circuit breaker, which raises CircuitOpenError while open.
+    trace (a dict) receives connect_s, ttfb_s, network_s, status and response_bytes.
+    With stream=True the body of a 200 response is left for the caller to read
+    (and close); response_bytes is then the caller's to fill in.
+    """
+    trace = {} if trace is None else trace
+    trace.setdefault("network_s", 0.0)
+    take_connect_time()
+    breaker = get_breaker(url)
+    attempt = 0
+    while True:
+        attempt += 1
+        attempt_timeout = timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                error = requests.exceptions.Timeout("Analysis deadline exceeded")
+                error.attempts = attempt - 1
+                raise error
+            attempt_timeout = min(timeout, remaining)
+
+        try:
+            breaker.before_call()
+        except CircuitOpenError as e:
+            e.attempts = attempt - 1
+            raise
+
+        started = time.monotonic()
+        try:
+            response = post_reasoning(url, goal, headers, timeout=attempt_timeout, session=session, stream=stream)
+            if not stream or response.status_code != 200:
+                # Reading the body also hands the connection back to the pool
+                trace["response_bytes"] = len(response.content)
+            error = None
+        except requests.exceptions.ConnectionError as e:
+            response, error = None, e
+            breaker.record_failure(f"connection error ({e.__class__.__name__})")
+            trace["network_s"] += time.monotonic() - started
+        except requests.exceptions.Timeout as e:
+            breaker.record_failure("timeout", time.monotonic() - started)
+            trace["network_s"] += time.monotonic() - started
+            trace["connect_s"] = take_connect_time()
+            e.attempts = attempt
+            raise
+        except Exception as e:
+            # Any other failure (ChunkedEncodingError, InvalidURL, ...) must still release a half-open probe
+            breaker.record_failure(f"request error ({e.__class__.__name__})", time.monotonic() - started)
+            trace["network_s"] += time.monotonic() - started
+            trace["connect_s"] = take_connect_time()
+            e.attempts = attempt
+            raise
+        else:
+            latency = time.monotonic() - started
+            trace["network_s"] += latency
+            trace.update(status=response.status_code, ttfb_s=response.elapsed.total_seconds())
+            if response.status_code in RETRY_STATUS_CODES:
+                breaker.record_failure(f"HTTP {response.status_code}", latency)
+            else:
+                breaker.record_success(latency)
+
+        retryable = error is not None or response.status_code in RETRY_STATUS_CODES
+        if not retryable or attempt >= max_attempts:
+            break
+
+        delay = _backoff_delay(attempt, _retry_after_seconds(response) if response is not None else None)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            break
+        time.sleep(delay)
+
+    trace["connect_s"] = take_connect_time()
+    if error is not None:
+        error.attempts = attempt
+        raise error
+    return response, attempt
+
+
+def _event_text(data):
+    """
+    Text delta carried by one event's data field. JSON objects and JSON
+    strings are unwrapped; anything else ("5", "null", "3.5") is raw text.
+    """
+    if not data.startswith(("{", '"')):
+        return data
+    try:
+        value = json.loads(data)
+    except ValueError:
+        return data
+    if isinstance(value, dict):
+        for key in STREAM_DELTA_KEYS:
+            if isinstance(value.get(key), str):
+                return value[key]
+        return ""
+    return value if isinstance(value, str) else data
+
+
+def read_event_stream(response, on_text, trace, deadline=None):
+    """
+    Assemble a text/event-stream body into a {"result": text} payload.
+    Each event's text delta goes to on_text as soon as it arrives; trace
+    receives first_chunk_s (request start -> first text), the body's network
+    time and response_bytes. A deadline passed mid-stream raises Timeout; a
+    stream closed before its [DONE] event raises ConnectionError.
+    """
+    parts = []
+    size = 0
+    completed = False
+    started = time.monotonic()
+    with closing(response):
+        for line in response.iter_lines(chunk_size=None, decode_unicode=False):
+            size += len(line) + 1
+            if deadline is not None and time.monotonic() > deadline:
+                raise requests.exceptions.Timeout("Analysis deadline exceeded")
+            if not line.startswith(b"data:"):
+                continue
+            # Per the SSE format only one space after "data:" is framing; the rest is answer text
+            data = line[5:].rstrip(b"\r")
+            data = (data[1:] if data.startswith(b" ") else data).decode("utf-8", errors="replace")
+            if data == "[DONE]":
+                completed = True
+                break
+            text = _event_text(data)
+            if text:
+                if not parts:
+                    trace["first_chunk_s"] = response.elapsed.total_seconds() + time.monotonic() - started
+                parts.append(text)
+                on_text(text)
+    trace["network_s"] = trace.get("network_s", 0.0) + time.monotonic() - started
+    trace["response_bytes"] = size
+    if not completed:
+        # The server closed early - the partial answer must never be cached
+        raise requests.exceptions.ConnectionError("Stream ended before its [DONE] event")
+    return {"result": "".join(parts)}
+
+
+def fetch_reasoning(url, goal, headers, timeout=REQUEST_TIMEOUT, session=None, cache=None, deadline=None,
+                    trace=None, on_text=None):
+    """
+    Return (payload, from_cache, attempts) for an agency goal.
+    Identical (url, goal, tenant) requests are answered from the shared response
+    cache; only successful JSON payloads and complete, non-empty streamed
+    answers are stored. Raises TalosAPIError on
+    non-200 once retries are exhausted. trace is passed to post_with_retry and
+    also receives decode_s. With on_text (and STREAM_RESPONSES) the answer is
+    streamed and each raw text delta is passed to on_text; cache hits and
+    endpoints that reply with plain JSON never call it.
+    """
+    trace = {} if trace is None else trace
+    cache = cache or get_response_cache()
+    key = make_cache_key(url, goal, headers.get("Tenant-ID", TENANT_ID))
+
+    payload = cache.get(key)
+    if payload is not None:
+        return payload, True, 0
+
+    stream = on_text is not None and STREAM_RESPONSES
+    response, attempts = post_with_retry(url, goal, headers, timeout=timeout, session=session, deadline=deadline,
+                                         trace=trace, stream=stream)
+    if response.status_code != 200:
+        raise TalosAPIError(response.status_code, response.text, attempts)
+
+    if stream and response.headers.get("Content-Type", "").startswith("text/event-stream"):
+        try:
+            payload = read_event_stream(response, on_text, trace, deadline)
+        except requests.exceptions.RequestException as e:
+            # A stream cut short is transient, like a dropped connection
+            get_breaker(url).record_failure(f"stream error ({e.__class__.__name__})")
+            e.attempts = attempts
+            raise
+        trace["decode_s"] = 0.0
+        if not payload["result"]:
+            return payload, False, attempts
+    else:
+        decode_started = time.perf_counter()
+        payload = response.json()
+        trace["decode_s"] = time.perf_counter() - decode_started
+        trace.setdefault("response_bytes", len(response.content))
+    cache.set(key, payload)
+    return payload, False, attempts
+
+
+# ================================
+# 🚀 Concurrent Question Dispatch
+# ================================
+
+# Outcome of one question; attempts is 0 for cache hits
+QuestionResult = namedtuple("QuestionResult", ["text", "ok", "from_cache", "attempts"])
+
+
+def analysis_deadline(seconds=ANALYSIS_DEADLINE):
+    """time.monotonic() deadline for an analysis starting now"""
+    return time.monotonic() + seconds
+
+
+def call_question(api_cfg, context, outputs, headers, postprocess, timeout=REQUEST_TIMEOUT,
+                  session=None, cache=None, deadline=None, on_text=None):
+    """
+    Run a single API_CONFIGS entry and return a QuestionResult.
+    Errors are returned as the same message strings the agents store in session state.
+    on_text receives the raw answer text as it streams in (see fetch_reasoning);
+    the result is still the postprocessed whole answer.
+    Safe to call from worker threads - it never touches Streamlit.
+    """
+    started = time.perf_counter()
+    trace = {}
+    try:
+        goal = api_cfg["prompt"](context, outputs)
+        payload, from_cache, attempts = fetch_reasoning(
+            api_cfg["url"], goal, headers, timeout=timeout, session=session, cache=cache, deadline=deadline,
+            trace=trace, on_text=on_text
+        )
+        postprocess_started = time.perf_counter()
+        result = QuestionResult(postprocess(payload), True, from_cache, attempts)
+        trace["postprocess_s"] = time.perf_counter() - postprocess_started
+        outcome = talos_metrics.CACHE_HIT if from_cache else talos_metrics.OK
+
+    except TalosAPIError as e:
+        result, outcome = QuestionResult(str(e), False, False, e.attempts), talos_metrics.API_ERROR
+    except CircuitOpenError as e:
+        result = QuestionResult(
+            f"Circuit open: this agency is failing repeatedly, skipped without calling it "
+            f"(next probe in {e.retry_in:.0f}s).", False, False, getattr(e, "attempts", 0)
+        )
+        outcome = talos_metrics.CIRCUIT_OPEN
+    except requests.exceptions.Timeout as e:
+        result = QuestionResult("Request timeout: The API took too long to respond.", False, False,
+                                getattr(e, "attempts", 1))
+        outcome = talos_metrics.TIMEOUT
+    except requests.exceptions.ConnectionError as e:
+        result = QuestionResult("Connection error: Unable to connect to the API server.", False, False,
+                                getattr(e, "attempts", 1))
+        outcome = talos_metrics.CONNECTION_ERROR
+    except Exception as e:
+        result, outcome = QuestionResult(f"Error: {str(e)}", False, False, 1), talos_metrics.ERROR
+
+    talos_metrics.record_call(api_cfg, outcome, trace, result.attempts, time.perf_counter() - started)
+    return result
+
+
+def iter_concurrent_results(api_configs, context, headers, postprocess, outputs=None, max_workers=None,
+                            session=None, cache=None, deadline=None, on_text=None):
+    """
+    Dispatch every question of an agent at once.
+    Yields (name, QuestionResult) in completion order, so callers can fill
+    their outputs and advance the progress bar as each question finishes.
+    All questions share one deadline budget (ANALYSIS_DEADLINE by default).
+    on_text(name, delta) streams partial answers, called from the worker threads.
+    Off the script thread, pass session and cache resolved on it.
+    """
+    outputs = outputs or {}
+    # Resolve the cached resources on the calling (script) thread, not in the workers
+    session = session or get_talos_session()
+    cache = cache or get_response_cache()
+    deadline = deadline or analysis_deadline()
+    workers = max_workers or max(1, min(len(api_configs), MAX_PARALLEL_QUESTIONS))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="talos") as pool:
+        futures = {
+            pool.submit(
+                call_question, cfg, context, outputs, headers, postprocess,
+                session=session, cache=cache, deadline=deadline,
+                on_text=functools.partial(on_text, cfg["name"]) if on_text else None
+            ): cfg["name"]
+            for cfg in api_configs
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
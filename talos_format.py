@@ -0,0 +1,370 @@
+"""
+Shared "with bold" HTML formatter for agent answers.
+Every page used to carry its own copy of the same line loop, trying up to
+seven regexes per line and one re.sub per extra phrase. Here the patterns
+are compiled once, the extra phrases become a single alternation, each line
+walks the style's rule cascade once, and paragraphs are emitted as the lines
+are classified.
+The page-level *_html helpers at the bottom return the final HTML for an
+answer and are memoized per (text, account, industry), so reruns triggered
+by the feedback widgets skip all text processing.
+"""
+from functools import lru_cache
+import re
+
+import streamlit as st
+
+from talos_metrics import timed
+from talos_text import sanitize_text, clean_dimension_output, format_hardness_output
+
+# ================================
+# 🎨 Formatting Styles
+# ================================
+
+_PLAIN_STRONG = "<strong>"
+_THEMED_STRONG = "<strong style='color: var(--text-primary);'>"
+_PLAIN_PARAGRAPH = "<p style='margin:6px 0; line-height:1.45; font-size:0.98rem;'>{}</p>"
+
+
+def _dimension_style(name, headers):
+    """Volatility / Ambiguity / Uncertainty share one layout and differ in their heading words"""
+    return {
+        "empty": f"No {name} data available",
+        "sanitize": {},
+        "drop_labels": True,
+        "headers": headers,
+        "header_strong": _PLAIN_STRONG,
+        "strong": _PLAIN_STRONG,
+        "side_max_words": 8,
+        "paragraph": _PLAIN_PARAGRAPH,
+        "container": f"{name}-display",
+    }
+
+
+# Rule switches per page; rules always run in the order of format_answer_html
+FORMAT_STYLES = {
+    "vocabulary": {
+        "empty": "No vocabulary data available",
+        "sanitize": {},
+        "steps": True,
+        "numbered_blocks": True,
+        "strong": _PLAIN_STRONG,
+        "side_max_words": 8,
+        "revenue_heading": True,
+        "paragraph": _PLAIN_PARAGRAPH,
+        "container": "vocab-display",
+    },
+    "current_system": {
+        "empty": "No current system data available",
+        "sanitize": {"strip_rules": True},
+        "drop_numbering": True,
+        "headers": r'^\s*(Current\s+System|Inputs?|Outputs?|Pain\s+Points?|System\s+Description)',
+        "header_strong": "<strong style='font-size:1.1rem; color: var(--text-primary);'>",
+        "numbered_blocks": True,
+        "strong": _THEMED_STRONG,
+        "side_max_words": 12,
+        "colon_fallback": True,
+        "default_line": "<span style='color: var(--text-primary);'>{}</span>",
+        "paragraph": "<p style='margin:6px 0; line-height:1.45; font-size:0.98rem; color: var(--text-primary);'>{}</p>",
+    },
+    "volatility": _dimension_style(
+        "volatility",
+        r'^\s*(Analysis|Score|Justification|Key\s+Takeaway|Frequency|Pace|Change|Cyclical|Predictable|Sporadic|Unpredictable|Resilient|System|Rework|Disruption)'
+    ),
+    "ambiguity": _dimension_style(
+        "ambiguity",
+        r'^\s*(Analysis|Score|Justification|Key\s+Takeaway|Clarity|Definition|Boundaries|Success|Criteria|Requirements|Constraints|Interpretation|Stakeholder|Expectations|Decision|Processes)'
+    ),
+    "uncertainty": _dimension_style(
+        "uncertainty",
+        r'^\s*(Analysis|Score|Justification|Key\s+Takeaway|Uncertainty|Risk|Predictability|Data\s+Gaps|Knowledge\s+Limitations|Volatility|Stability|Reliability|Confidence|Probability)'
+    ),
+}
+
+# ================================
+# 🧩 Precompiled Patterns
+# ================================
+
+_NUMBERING = re.compile(r'^\s*\d+\.\s*', re.MULTILINE)
+_BULLETS = re.compile(r'(?m)^\s*[-*]\s+')
+_LABELS = [
+    re.compile(r'^\s*Q\d+\s*:', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'^\s*Answer\s*:', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'^\s*Question\s*\d+\s*:', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'\bQ\d+\b\s*:', re.IGNORECASE),
+    re.compile(r'\bAnswer\b\s*:', re.IGNORECASE),
+]
+_LABEL_ONLY = re.compile(r'^\s*(Q\d+|Answer|Question\s*\d+)\s*$', re.IGNORECASE)
+_STEP = re.compile(r'(Step\s*\d+\s*:)', re.IGNORECASE)
+_NUM_COLON = re.compile(r'^\s*(\d+\.\s+[^:]+):\s*(.*)$')
+_NUM_NO_COLON = re.compile(r'^\s*(\d+\.\s+.+)$')
+_BULLET_HEADING = re.compile(r'^\s*(?:•|\d+\.)\s*([^:]+):\s*(.*)$')
+_SIDE = re.compile(r'^\s*([^:]+):\s*(.*)$')
+_REVENUE = re.compile(r'\s*Revenue\s+Growth\s+Rate\s*', re.IGNORECASE)
+_CONTINUATION = re.compile(r'\s|\s*[a-z]')
+_BR_RUN = re.compile(r'(<br>\s*){3,}')
+
+_REGEX_CHARS = set(r".^$*+?{}[]\|()")
+
+
+@lru_cache(maxsize=64)
+def _compile_header(pattern):
+    return re.compile(pattern, re.IGNORECASE)
+
+
+@lru_cache(maxsize=64)
+def compile_phrases(phrases):
+    """
+    One case-insensitive alternation for a tuple of extra phrases.
+    Phrases with regex metacharacters are used as patterns (escaped if they
+    do not compile), plain phrases are matched literally.
+    """
+    parts = []
+    for phrase in phrases:
+        if any(ch in _REGEX_CHARS for ch in phrase):
+            try:
+                re.compile(phrase)
+                parts.append(phrase)
+                continue
+            except re.error:
+                pass
+        parts.append(re.escape(phrase))
+    return re.compile("|".join(f"(?:{part})" for part in parts), re.IGNORECASE)
+
+
+def _strong(open_tag, heading, rest):
+    return f"{open_tag}{heading}:</strong> {rest}" if rest else f"{open_tag}{heading}:</strong>"
+
+
+# ================================
+# 🖋️ Formatter
+# ================================
+
+def format_answer_html(text, style, extra_phrases=None):
+    """
+    Format an agent answer as bolded HTML paragraphs in the given FORMAT_STYLES style.
+    extra_phrases are bolded wherever they occur (overlapping phrases are
+    bolded once, by the earliest match).
+    """
+    cfg = FORMAT_STYLES[style]
+    if not text:
+        return cfg["empty"]
+
+    clean_text = sanitize_text(text, **cfg["sanitize"])
+    if cfg.get("drop_numbering"):
+        clean_text = _NUMBERING.sub('', clean_text)
+    if cfg.get("drop_labels"):
+        for pattern in _LABELS:
+            clean_text = pattern.sub('', clean_text)
+    clean_text = clean_text.replace(" - ", " : ")
+    clean_text = _BULLETS.sub('• ', clean_text)
+
+    phrases = compile_phrases(tuple(extra_phrases)) if extra_phrases else None
+    headers = _compile_header(cfg["headers"]) if cfg.get("headers") else None
+    strong = cfg["strong"]
+    side_max_words = cfg["side_max_words"]
+    default_line = cfg.get("default_line")
+
+    lines = clean_text.splitlines()
+    n = len(lines)
+    paragraphs = []
+    current = []
+
+    def collect_block(start):
+        block = [lines[start].strip()]
+        j = start + 1
+        while j < n and lines[j].strip() and _CONTINUATION.match(lines[j]):
+            block.append(lines[j].strip())
+            j += 1
+        return f"{strong}{'<br>'.join(block)}</strong>", j
+
+    i = 0
+    while i < n:
+        ln = lines[i].rstrip()
+        i += 1
+        if not ln.strip():
+            if current:
+                paragraphs.append("<br>".join(current))
+                current = []
+            continue
+
+        if cfg.get("drop_labels") and _LABEL_ONLY.match(ln):
+            continue
+
+        if phrases is not None:
+            marked = phrases.sub(lambda m: f"<strong>{m.group(0)}</strong>", ln)
+            if marked != ln:
+                current.append(marked)
+                continue
+
+        if cfg.get("steps") and _STEP.search(ln):
+            html, i = collect_block(i - 1)
+            current.append(html)
+            continue
+
+        if headers is not None and headers.match(ln):
+            current.append(f"{cfg['header_strong']}{ln.strip()}</strong>")
+            continue
+
+        m = _NUM_COLON.match(ln)
+        if m:
+            current.append(_strong(strong, m.group(1).strip(), m.group(2).strip()))
+            continue
+
+        if cfg.get("numbered_blocks") and _NUM_NO_COLON.match(ln):
+            html, i = collect_block(i - 1)
+            current.append(html)
+            continue
+
+        m = _BULLET_HEADING.match(ln)
+        if m:
+            current.append("• " + _strong(strong, m.group(1).strip(), m.group(2).strip()))
+            continue
+
+        m = _SIDE.match(ln)
+        if m and len(m.group(1).split()) <= side_max_words:
+            current.append(_strong(strong, m.group(1).strip(), m.group(2).strip()))
+            continue
+
+        if cfg.get("revenue_heading") and _REVENUE.fullmatch(ln):
+            current.append(f"{strong}{ln.strip()}</strong>")
+            continue
+
+        if cfg.get("colon_fallback") and ':' in ln and not ln.startswith('•'):
+            left, right = ln.split(':', 1)
+            if len(left.split()) <= 8:
+                current.append(f"{strong}{left.strip()}:</strong> {right.strip()}")
+                continue
+
+        current.append(default_line.format(ln) if default_line else ln)
+
+    if current:
+        paragraphs.append("<br>".join(current))
+
+    paragraph = cfg["paragraph"]
+    final_html = "\n".join(paragraph.format(p) for p in paragraphs)
+    if not cfg.get("container"):
+        return final_html
+
+    formatted_output = f"""
+    <div class="{cfg['container']}">
+        {final_html}
+    </div>
+    """
+    return _BR_RUN.sub('<br><br>', formatted_output)
+
+
+# ================================
+# 🧠 Memoized Page HTML
+# ================================
+
+# Rendered answers kept per process; each entry is one (text, account, industry) combination.
+# Only cache misses do the work, so only they are timed into talos_metrics.
+RENDER_CACHE_ENTRIES = 512
+
+_THE_COMPANY = re.compile(r'\bthe company\b', re.IGNORECASE)
+_THE_INDUSTRY = re.compile(r'\bthe industry\b', re.IGNORECASE)
+
+_LIST_ITEMS = re.compile(r'(?m)^\s*(?:\d+\.|-)\s+(.*)')
+_COLON_BULLET = re.compile(r':\s*•')
+_COLON_BEFORE_BULLET = re.compile(r'(:)\s+(?=•)')
+_INLINE_BULLET = re.compile(r'(?<!\n)\s*•')
+_LABEL_BEFORE_COLON = re.compile(r'(^|[\n])\s*(•\s*)?([^:\n]{2,80}):')
+_BLANK_LINES = re.compile(r'\n{2,}')
+
+_HARDNESS_BULLETS = [
+    re.compile(r'(?m)^\s*•\s+(.*)$'),
+    re.compile(r'(?m)^\s*-\s+(.*)$'),
+    re.compile(r'(?m)^\s*\d+\.\s+(.*)$'),
+]
+_HARDNESS_HEADERS = re.compile(r'(?m)^(Overall Difficulty Score|Hardness Level|SME Justification|Summary|Key Takeaways):?$')
+
+
+def replace_generic_names(text, display_account, display_industry):
+    """Swap 'the company' / 'the industry' for the selected account and industry"""
+    if display_account and display_account != "Unknown Company":
+        text = _THE_COMPANY.sub(display_account, text)
+    if display_industry and display_industry != "Unknown Industry":
+        text = _THE_INDUSTRY.sub(display_industry, text)
+    return text
+
+
+@st.cache_data(show_spinner=False, max_entries=RENDER_CACHE_ENTRIES)
+@timed("render")
+def answer_html(text, style, display_account="", display_industry=""):
+    """format_answer_html with names substituted and newlines as <br> (Vocabulary card body)"""
+    formatted = replace_generic_names(format_answer_html(text, style), display_account, display_industry)
+    return formatted.replace('\n', '<br>')
+
+
+@st.cache_data(show_spinner=False, max_entries=RENDER_CACHE_ENTRIES)
+@timed("render")
+def section_html(text, style):
+    """format_answer_html for one section box (Current System)"""
+    return format_answer_html(text, style)
+
+
+@st.cache_data(show_spinner=False, max_entries=RENDER_CACHE_ENTRIES)
+@timed("render")
+def dimension_answer_html(text, empty_message, display_account="", display_industry=""):
+    """Card body for one Volatility / Ambiguity / Uncertainty answer: bullets, bold labels, <br> lines"""
+    formatted_output = replace_generic_names(clean_dimension_output(text, empty_message), display_account, display_industry)
+
+    # Convert numbered and dash lists to bullets
+    formatted_output = _LIST_ITEMS.sub(r'• \1', formatted_output)
+    # Ensure bullets always start on a new line (even if inline after colon)
+    formatted_output = _COLON_BULLET.sub(':\n•', formatted_output)
+    # Handle sentences ending with ":" followed by bullet text
+    formatted_output = _COLON_BEFORE_BULLET.sub(r'\1\n', formatted_output)
+    # Add newline before bullets (to separate from paragraphs)
+    formatted_output = _INLINE_BULLET.sub(r'\n•', formatted_output)
+    # Bold text before colon, including bullets
+    formatted_output = _LABEL_BEFORE_COLON.sub(
+        lambda m: f"{m.group(1)}{m.group(2) or ''}<strong>{m.group(3).strip()}:</strong>",
+        formatted_output
+    )
+    # Remove extra blank lines
+    formatted_output = _BLANK_LINES.sub('\n', formatted_output)
+    return formatted_output.replace('\n', '<br>')
+
+
+@st.cache_data(show_spinner=False, max_entries=RENDER_CACHE_ENTRIES)
+@timed("render")
+def hardness_detail_html(text):
+    """Detailed Hardness Analysis body (lists, section headings, paragraphs), or None without data"""
+    formatted_output = format_hardness_output(text)
+    if not formatted_output or "No hardness data" in formatted_output:
+        return None
+
+    # Convert bullet points
+    formatted_html = formatted_output
+    for pattern in _HARDNESS_BULLETS:
+        formatted_html = pattern.sub(r'<li>\1</li>', formatted_html)
+
+    # Convert section headers
+    formatted_html = _HARDNESS_HEADERS.sub(
+        r'<h4 style="color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 0.5rem; margin: 1.5rem 0 1rem 0;">\1</h4>',
+        formatted_html
+    )
+
+    # Wrap bullet points in ul tags
+    in_list = False
+    formatted_lines = []
+    for line in formatted_html.split('\n'):
+        if '<li>' in line:
+            if not in_list:
+                formatted_lines.append('<ul style="margin: 0.5rem 0 1rem 1rem; color: #555;">')
+                in_list = True
+            formatted_lines.append(line)
+        else:
+            if in_list:
+                formatted_lines.append('</ul>')
+                in_list = False
+            if line.strip() and not line.startswith('<h4'):
+                formatted_lines.append(f'<p style="margin: 0.5rem 0; line-height: 1.5; color: #555;">{line}</p>')
+            else:
+                formatted_lines.append(line)
+    if in_list:
+        formatted_lines.append('</ul>')
+
+    return '\n'.join(formatted_lines)
@@ -0,0 +1,296 @@
+"""
+Background execution of Talos analyses.
+Jobs run on a process-level executor and are registered per (browser session,
+agent), so a rerun, widget click or page switch never throws away a call that
+is already in flight - the page re-attaches to the running job and polls it
+instead of re-issuing the request. Answers that stream in are cleaned line by
+line into a preview the polling page writes out while it waits.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import uuid
+
+import streamlit as st
+
+from response_cache import get_response_cache
+from talos_client import get_talos_session, iter_concurrent_results
+from talos_metrics import record_analysis
+from talos_pipeline import build_pipeline_nodes, iter_pipeline_results
+from talos_similar import get_problem_index, index_analysis
+from talos_text import LineSanitizer
+
+# ================================
+# ⚙️ Job Settings
+# ================================
+
+# Analyses that may run at once across all sessions (each fans out its own questions)
+JOB_WORKERS = 16
+
+# Longest wait between progress refreshes while a page waits on its job
+JOB_POLL_INTERVAL = 1.0
+
+# Longest a poll follows one streaming answer before refreshing the progress bar
+JOB_STREAM_SECONDS = 10.0
+
+# Finished jobs nobody came back for are dropped after this long
+JOB_RETENTION_SECONDS = 60 * 60
+
+
+class TalosJob:
+    """Progress and per-question results of one background analysis"""
+
+    def __init__(self, agent, total, label=""):
+        self.agent = agent
+        self.total = total
+        self.label = label
+        self.results = {}
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.future = None
+        self._lock = threading.Lock()
+        # Signalled on every new preview line, finished question and job end
+        self._changed = threading.Condition(self._lock)
+        self._sanitizers = {}
+        self._previews = {}
+
+    def record(self, name, result):
+        """Store one finished question's QuestionResult (called from the worker thread)"""
+        with self._changed:
+            # An answer without a trailing newline still has its last line pending
+            sanitizer = self._sanitizers.pop(name, None)
+            if sanitizer is not None:
+                self._previews.setdefault(name, []).extend(sanitizer.flush())
+            self.results[name] = result
+            self._changed.notify_all()
+
+    def stream(self, name, delta):
+        """Add streamed answer text to name's preview (called from the worker thread)"""
+        with self._changed:
+            lines = self._sanitizers.setdefault(name, LineSanitizer()).feed(delta)
+            if lines:
+                self._previews.setdefault(name, []).extend(lines)
+                self._changed.notify_all()
+
+    def finish(self):
+        with self._changed:
+            self.finished_at = time.time()
+            self._changed.notify_all()
+
+    def wait(self, timeout):
+        """Block until anything changes or timeout passes"""
+        with self._changed:
+            if self.running:
+                self._changed.wait(timeout)
+
+    def streaming_question(self):
+        """The first question whose answer is streaming in, None if there is none"""
+        with self._lock:
+            for name in self._previews:
+                if name not in self.results:
+                    return name
+        return None
+
+    def follow(self, name, timeout):
+        """Yield name's preview lines, replaying those already in, until it finishes or timeout passes"""
+        sent = 0
+        until = time.monotonic() + timeout
+        while True:
+            with self._changed:
+                while (len(self._previews.get(name, ())) == sent and name not in self.results
+                       and self.running and time.monotonic() < until):
+                    self._changed.wait(until - time.monotonic())
+                lines = self._previews.get(name, [])[sent:]
+                finished = name in self.results or not self.running or time.monotonic() >= until
+            sent += len(lines)
+            for line in lines:
+                # Markdown hard line break keeps the answer's lines apart
+                yield line + "  \n"
+            if finished:
+                return
+
+    def snapshot(self):
+        """Copy of {name: QuestionResult} safe to read on the script thread"""
+        with self._lock:
+            return dict(self.results)
+
+    @property
+    def done(self):
+        return len(self.results)
+
+    @property
+    def running(self):
+        return self.finished_at is None
+
+    @property
+    def cache_hits(self):
+        return sum(1 for result in self.snapshot().values() if result.from_cache)
+
+    @property
+    def retries(self):
+        """Extra attempts spent on transient failures across all questions"""
+        return sum(max(0, result.attempts - 1) for result in self.snapshot().values())
+
+
+class JobRunner:
+    """Process-wide executor plus the (session, agent) -> TalosJob registry"""
+
+    def __init__(self, max_workers=JOB_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="talos-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id, agent):
+        with self._lock:
+            return self._jobs.get((session_id, agent))
+
+    def submit(self, session_id, agent, total, fn, *args, label=""):
+        """
+        Start fn(job, *args) in the background and return its job.
+        If the same session already has this agent running, that job is
+        returned instead so the request is never issued twice.
+        label names the analysed problem in the performance metrics.
+        """
+        key = (session_id, agent)
+        with self._lock:
+            self._evict_stale()
+            existing = self._jobs.get(key)
+            if existing is not None and existing.running:
+                return existing
+
+            job = TalosJob(agent, total, label)
+            self._jobs[key] = job
+            job.future = self._executor.submit(self._run, job, fn, args)
+            return job
+
+    def pop(self, session_id, agent):
+        with self._lock:
+            return self._jobs.pop((session_id, agent), None)
+
+    def running_count(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.running)
+
+    def _run(self, job, fn, args):
+        try:
+            fn(job, *args)
+        except Exception as e:
+            job.error = str(e)
+        finally:
+            job.finish()
+            results = job.snapshot()
+            record_analysis(job.agent, job.label, job.finished_at - job.started_at, len(results),
+                            sum(1 for result in results.values() if not result.ok))
+
+    def _evict_stale(self):
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        for key, job in list(self._jobs.items()):
+            if job.finished_at is not None and job.finished_at < cutoff:
+                del self._jobs[key]
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_runner():
+    """Process-wide job runner shared across sessions and reruns"""
+    return JobRunner()
+
+
+# ================================
+# 🧵 Job Bodies (worker threads)
+# ================================
+
+def _run_questions(job, api_configs, context, headers, postprocess, outputs, session, cache):
+    for name, result in iter_concurrent_results(
+        api_configs, context, headers, postprocess, outputs=outputs, session=session, cache=cache,
+        on_text=job.stream
+    ):
+        job.record(name, result)
+
+
+def _run_pipeline(job, problem, account, industry, headers, session, cache, index):
+    for name, result in iter_pipeline_results(
+        problem, account, industry, headers, session=session, cache=cache, on_text=job.stream
+    ):
+        job.record(name, result)
+    # Only complete analyses can stand in for a near-duplicate problem later
+    results = job.snapshot()
+    if len(results) == job.total:
+        index_analysis(index, account, industry, problem, results)
+
+
+# ================================
+# 🖥️ Page Helpers (script thread)
+# ================================
+
+def _problem_label(text, limit=100):
+    """One-line, truncated problem text for the metrics"""
+    text = " ".join(text.split())
+    text = text.removeprefix("Business Problem:").strip()
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def get_job_session_id():
+    """Stable id for this browser session, used to key its jobs"""
+    if "talos_job_session" not in st.session_state:
+        st.session_state.talos_job_session = uuid.uuid4().hex
+    return st.session_state.talos_job_session
+
+
+def submit_questions_job(agent, api_configs, context, headers, postprocess, outputs=None):
+    """Run an agent's API_CONFIGS in the background (or attach to the run in flight)"""
+    return get_job_runner().submit(
+        get_job_session_id(), agent, len(api_configs), _run_questions,
+        api_configs, context, headers, postprocess, outputs or {},
+        get_talos_session(), get_response_cache(),
+        label=_problem_label(context)
+    )
+
+
+def submit_pipeline_job(problem, account, industry, headers):
+    """Run the full seven-agent pipeline in the background (or attach to the run in flight)"""
+    return get_job_runner().submit(
+        get_job_session_id(), "pipeline", len(build_pipeline_nodes()), _run_pipeline,
+        problem, account, industry, headers,
+        get_talos_session(), get_response_cache(), get_problem_index(),
+        label=_problem_label(f"{account}: {problem}")
+    )
+
+
+def get_session_job(agent):
+    """This session's job for agent, running or finished-but-uncollected"""
+    return get_job_runner().get(get_job_session_id(), agent)
+
+
+def collect_job(agent):
+    """Remove and return this session's finished job for agent"""
+    return get_job_runner().pop(get_job_session_id(), agent)
+
+
+def _write_stream(chunks):
+    """st.write_stream, or a placeholder updated per chunk on Streamlit < 1.31"""
+    if hasattr(st, "write_stream"):
+        return st.write_stream(chunks)
+    placeholder, text = st.empty(), ""
+    for chunk in chunks:
+        text += chunk
+        placeholder.markdown(text)
+    return text
+
+
+def render_job_progress(job, message):
+    """
+    Show a running job's progress and write out an answer that is streaming
+    in, then rerun to poll the job again. Without streamed text the poll
+    reruns as soon as a question finishes, or after JOB_POLL_INTERVAL.
+    """
+    retries = f", {job.retries} retried" if job.retries else ""
+    st.info(f"{message} ({job.done}/{job.total} answers ready{retries})")
+    st.progress(job.done / job.total if job.total else 0.0)
+    name = job.streaming_question()
+    if name is None:
+        job.wait(JOB_POLL_INTERVAL)
+    else:
+        st.caption(f"✍️ {name} - streaming")
+        _write_stream(job.follow(name, JOB_STREAM_SECONDS))
+    st.rerun()
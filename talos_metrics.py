@@ -0,0 +1,281 @@
+"""
+In-process metrics for Talos agency calls and answer rendering.
+Every call_question records one CallMetrics (connect, time to first byte,
+time to first streamed text, network and total time, response bytes, status, attempts, JSON decode and
+payload cleanup time, tagged by agent and question). Records are kept in a
+bounded buffer shared by every session in the process, like the circuit
+breakers, and each one is also emitted as a JSON line on the "talos.metrics"
+logger; TALOS_METRICS_LOG appends those lines to a file.
+Calls are also folded into per-minute rollups per endpoint as they arrive,
+so the admin dashboard's rolling windows merge at most an hour of small
+buckets instead of rescanning the raw records on every rerun.
+"""
+from collections import deque, namedtuple
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+from agent_configs import (
+    ACCOUNT_BASELINE_CONFIG,
+    VOCABULARY_API_CONFIGS,
+    CURRENT_SYSTEM_API_CONFIGS,
+    VOLATILITY_API_CONFIGS,
+    AMBIGUITY_API_CONFIGS,
+    UNCERTAINTY_API_CONFIGS,
+    HARDNESS_API_CONFIGS,
+)
+
+# ================================
+# ⚙️ Metrics Settings
+# ================================
+
+METRICS_HISTORY = int(os.environ.get("TALOS_METRICS_HISTORY", 2000))
+METRICS_LOG_PATH = os.environ.get("TALOS_METRICS_LOG", "")
+
+# Rolling windows are built from one-minute buckets, the last hour of them kept
+ROLLUP_BUCKET_SECONDS = 60
+ROLLUP_BUCKETS = 60
+
+# Upper bounds (seconds) of the call latency histogram; one more bucket holds the rest
+LATENCY_BOUNDS = (0.5, 1, 2, 5, 10, 20, 30, 60)
+
+# Finished analyses kept for the slowest-problems table
+ANALYSIS_HISTORY = 200
+
+# Outcomes of a call, matching the QuestionResult error messages
+OK = "ok"
+CACHE_HIT = "cache_hit"
+API_ERROR = "api_error"
+TIMEOUT = "timeout"
+CONNECTION_ERROR = "connection_error"
+CIRCUIT_OPEN = "circuit_open"
+ERROR = "error"
+ERROR_OUTCOMES = (API_ERROR, CONNECTION_ERROR, CIRCUIT_OPEN, ERROR)
+
+# Question name -> agent; Interconnectedness calls the same Q10-Q12 agencies as Uncertainty
+QUESTION_AGENTS = {}
+for _agent, _configs in (
+    ("Vocabulary", VOCABULARY_API_CONFIGS),
+    ("Current System", CURRENT_SYSTEM_API_CONFIGS),
+    ("Volatility", VOLATILITY_API_CONFIGS),
+    ("Ambiguity", AMBIGUITY_API_CONFIGS),
+    ("Uncertainty / Interconnectedness", UNCERTAINTY_API_CONFIGS),
+    ("Hardness Summary", HARDNESS_API_CONFIGS),
+    ("Warm-up", [ACCOUNT_BASELINE_CONFIG]),
+):
+    for _cfg in _configs:
+        QUESTION_AGENTS.setdefault(_cfg["name"], _agent)
+
+CallMetrics = namedtuple("CallMetrics", [
+    "timestamp",        # time.time() when the call finished
+    "agent",            # agent label from QUESTION_AGENTS
+    "question",         # API_CONFIGS name
+    "url",              # agency endpoint
+    "outcome",          # OK / CACHE_HIT / API_ERROR / TIMEOUT / CONNECTION_ERROR / CIRCUIT_OPEN / ERROR
+    "status",           # last HTTP status, None without a response
+    "attempts",         # HTTP attempts, 0 for cache hits
+    "connect_s",        # DNS + TCP (+ TLS) setup, 0 on a reused keep-alive connection
+    "ttfb_s",           # request sent -> response headers parsed, last attempt
+    "first_chunk_s",    # request sent -> first streamed answer text, None unless streamed
+    "network_s",        # wall time of every HTTP attempt, body download included
+    "response_bytes",   # body size of the last response
+    "decode_s",         # response.json()
+    "postprocess_s",    # json_to_text + sanitize_text (the agent's payload cleanup)
+    "total_s",          # whole call_question, backoff sleeps included
+])
+
+_log = logging.getLogger("talos.metrics")
+if METRICS_LOG_PATH:
+    _handler = logging.FileHandler(METRICS_LOG_PATH, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _log.addHandler(_handler)
+    _log.setLevel(logging.INFO)
+
+
+Analysis = namedtuple("Analysis", [
+    "timestamp",        # time.time() when the job finished
+    "agent",            # job agent key (vocabulary, hardness, pipeline, ...)
+    "problem",          # short label of the analysed problem
+    "seconds",          # wall time of the whole job
+    "questions",        # answers produced
+    "failed",           # answers that are error messages
+])
+
+
+def latency_bucket_labels():
+    """Display labels of the LATENCY_BOUNDS histogram buckets"""
+    labels, lower = [], 0
+    for upper in LATENCY_BOUNDS:
+        labels.append(f"{lower}-{upper}s")
+        lower = upper
+    labels.append(f">{lower}s")
+    return labels
+
+
+def _new_rollup():
+    return {"calls": 0, "outcomes": {}, "histogram": [0] * (len(LATENCY_BOUNDS) + 1),
+            "latency_total": 0.0, "bytes": 0}
+
+
+def _latency_bucket(seconds):
+    for index, upper in enumerate(LATENCY_BOUNDS):
+        if seconds <= upper:
+            return index
+    return len(LATENCY_BOUNDS)
+
+
+def histogram_percentile(histogram, pct):
+    """Upper bound (seconds) of the bucket holding the pct-th percentile; None if empty"""
+    total = sum(histogram)
+    if not total:
+        return None
+    needed = pct / 100.0 * total
+    running = 0
+    for index, count in enumerate(histogram):
+        running += count
+        if running >= needed:
+            return LATENCY_BOUNDS[index] if index < len(LATENCY_BOUNDS) else float("inf")
+    return float("inf")
+
+
+# ================================
+# 🗂️ Registry
+# ================================
+
+class MetricsRegistry:
+    """Thread-safe buffer of recent calls, per-minute endpoint rollups, analyses and render timings"""
+
+    def __init__(self, history=METRICS_HISTORY):
+        self._calls = deque(maxlen=history)
+        self._timings = {}
+        # (bucket start, {url: rollup}) for the last ROLLUP_BUCKETS minutes that saw calls
+        self._buckets = deque(maxlen=ROLLUP_BUCKETS)
+        self._analyses = deque(maxlen=ANALYSIS_HISTORY)
+        self._lock = threading.Lock()
+
+    def record_call(self, metrics):
+        bucket_start = int(metrics.timestamp // ROLLUP_BUCKET_SECONDS) * ROLLUP_BUCKET_SECONDS
+        with self._lock:
+            self._calls.append(metrics)
+            # A call finishing out of order just past a minute boundary joins the newest bucket
+            if not self._buckets or self._buckets[-1][0] < bucket_start:
+                self._buckets.append((bucket_start, {}))
+            rollup = self._buckets[-1][1].setdefault(metrics.url, _new_rollup())
+            rollup["calls"] += 1
+            rollup["outcomes"][metrics.outcome] = rollup["outcomes"].get(metrics.outcome, 0) + 1
+            rollup["bytes"] += metrics.response_bytes or 0
+            # Cache hits never reach the endpoint, so they stay out of its latency
+            if metrics.outcome != CACHE_HIT:
+                rollup["histogram"][_latency_bucket(metrics.total_s)] += 1
+                rollup["latency_total"] += metrics.total_s
+        if _log.isEnabledFor(logging.INFO):
+            _log.info(json.dumps(metrics._asdict()))
+
+    def record_timing(self, stage, name, seconds):
+        """Add one duration to the (stage, name) count/total/max"""
+        with self._lock:
+            timing = self._timings.setdefault((stage, name), [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += seconds
+            timing[2] = max(timing[2], seconds)
+
+    def record_analysis(self, analysis):
+        with self._lock:
+            self._analyses.append(analysis)
+
+    def endpoint_window(self, seconds):
+        """{url: rollup} merged over the buckets of the last seconds"""
+        cutoff = time.time() - seconds
+        merged = {}
+        with self._lock:
+            buckets = [rollups for start, rollups in self._buckets if start + ROLLUP_BUCKET_SECONDS > cutoff]
+            for rollups in buckets:
+                for url, rollup in rollups.items():
+                    total = merged.setdefault(url, _new_rollup())
+                    total["calls"] += rollup["calls"]
+                    total["latency_total"] += rollup["latency_total"]
+                    total["bytes"] += rollup["bytes"]
+                    for outcome, count in rollup["outcomes"].items():
+                        total["outcomes"][outcome] = total["outcomes"].get(outcome, 0) + count
+                    total["histogram"] = [a + b for a, b in zip(total["histogram"], rollup["histogram"])]
+        return merged
+
+    def slowest_analyses(self, seconds, limit=10):
+        """The limit slowest analyses that finished in the last seconds"""
+        cutoff = time.time() - seconds
+        with self._lock:
+            recent = [analysis for analysis in self._analyses if analysis.timestamp >= cutoff]
+        return sorted(recent, key=lambda analysis: analysis.seconds, reverse=True)[:limit]
+
+    def recent_calls(self, limit=None):
+        """Recorded calls, oldest first (the last limit of them)"""
+        with self._lock:
+            calls = list(self._calls)
+        return calls[-limit:] if limit else calls
+
+    def timing_summary(self):
+        """Plain-dict rows of every (stage, name) timing for display"""
+        with self._lock:
+            items = sorted(self._timings.items())
+        return [
+            {"stage": stage, "name": name, "count": count, "mean_ms": total / count * 1000, "max_ms": worst * 1000}
+            for (stage, name), (count, total, worst) in items
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._calls.clear()
+            self._timings.clear()
+            self._buckets.clear()
+            self._analyses.clear()
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry():
+    """The process-wide registry read by the admin panel"""
+    return _registry
+
+
+def record_call(api_cfg, outcome, trace, attempts, total_s):
+    """Build and record the CallMetrics of one call_question"""
+    _registry.record_call(CallMetrics(
+        timestamp=time.time(),
+        agent=QUESTION_AGENTS.get(api_cfg["name"], "Other"),
+        question=api_cfg["name"],
+        url=api_cfg["url"],
+        outcome=outcome,
+        status=trace.get("status"),
+        attempts=attempts,
+        connect_s=trace.get("connect_s", 0.0),
+        ttfb_s=trace.get("ttfb_s"),
+        first_chunk_s=trace.get("first_chunk_s"),
+        network_s=trace.get("network_s", 0.0),
+        response_bytes=trace.get("response_bytes", 0),
+        decode_s=trace.get("decode_s", 0.0),
+        postprocess_s=trace.get("postprocess_s", 0.0),
+        total_s=total_s,
+    ))
+
+
+def record_analysis(agent, problem, seconds, questions, failed):
+    """Record one finished background analysis"""
+    _registry.record_analysis(Analysis(time.time(), agent, problem, seconds, questions, failed))
+
+
+def timed(stage):
+    """Decorator recording each call's duration under (stage, function name)"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _registry.record_timing(stage, fn.__name__, time.perf_counter() - started)
+        return wrapper
+    return decorator
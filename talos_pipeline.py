@@ -0,0 +1,225 @@
+"""
+One-click full analysis: runs all seven agents as a dependency DAG.
+Vocabulary feeds Current System, Current System feeds Q4-Q12, and every
+dimension answer feeds the Hardness Summary. Each question starts the moment
+its own inputs are ready, so Q1-Q3 run alongside Vocabulary and the critical
+path is Vocabulary -> Current System -> slowest of Q4-Q12 -> Hardness.
+"""
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import functools
+
+from agent_configs import (
+    VOCABULARY_API_CONFIGS,
+    CURRENT_SYSTEM_API_CONFIGS,
+    VOLATILITY_API_CONFIGS,
+    AMBIGUITY_API_CONFIGS,
+    INTERCONNECTEDNESS_API_CONFIGS,
+    UNCERTAINTY_API_CONFIGS,
+    HARDNESS_API_CONFIGS,
+    DIMENSION_QUESTIONS,
+)
+from response_cache import get_response_cache
+from talos_client import call_question, get_talos_session, analysis_deadline, MAX_PARALLEL_QUESTIONS
+from talos_scores import score_dimensions, format_local_scores
+from talos_text import payload_to_text, current_system_payload_to_text
+
+# ================================
+# 🧭 Pipeline Definition
+# ================================
+
+# One stage per agent page. "requires" lists the upstream question names a
+# stage's prompts read from outputs; "context" selects the prompt input the
+# page itself uses (Current System is prompted with the bare problem text).
+# "outputs_key"/"show_key" are the session-state keys the page renders from;
+# error messages are stored like answers unless "keep_errors" is False.
+# "postprocess" overrides the pipeline-wide payload cleanup for one stage.
+# "local_scores" names the session key that gets the Q1-Q12 averages computed
+# by talos_scores; they are also handed to the stage's prompts.
+PIPELINE_STAGES = [
+    {
+        "agent": "Vocabulary Agent",
+        "configs": VOCABULARY_API_CONFIGS,
+        "requires": (),
+        "context": "full",
+        "outputs_key": "vocab_output",
+        "show_key": "show_vocabulary",
+    },
+    {
+        "agent": "Current System Agent",
+        "configs": CURRENT_SYSTEM_API_CONFIGS,
+        "requires": ("vocabulary",),
+        "context": "problem",
+        "outputs_key": "current_system_data",
+        "show_key": "current_system_extracted",
+        # The page only marks extraction done on success; errors are not rendered
+        "keep_errors": False,
+        "postprocess": current_system_payload_to_text,
+    },
+    {
+        "agent": "Volatility Agent",
+        "configs": VOLATILITY_API_CONFIGS,
+        "requires": (),
+        "context": "full",
+        "outputs_key": "volatile_outputs",
+        "show_key": "show_volatility",
+    },
+    {
+        "agent": "Ambiguity Agent",
+        "configs": AMBIGUITY_API_CONFIGS,
+        "requires": ("current_system",),
+        "context": "full",
+        "outputs_key": "ambiguity_outputs",
+        "show_key": "show_ambiguity",
+    },
+    {
+        "agent": "Interconnectedness Agent",
+        "configs": INTERCONNECTEDNESS_API_CONFIGS,
+        "requires": ("current_system",),
+        "context": "full",
+        "outputs_key": "uncertainty_outputs",
+        "show_key": "show_uncertainty",
+    },
+    {
+        "agent": "Uncertainty Agent",
+        "configs": UNCERTAINTY_API_CONFIGS,
+        "requires": ("current_system",),
+        "context": "full",
+        "outputs_key": "uncertainty_outputs",
+        "show_key": "show_uncertainty",
+    },
+    {
+        "agent": "Hardness Summary Agent",
+        "configs": HARDNESS_API_CONFIGS,
+        "requires": tuple(DIMENSION_QUESTIONS),
+        "context": "full",
+        "outputs_key": "hardness_outputs",
+        "show_key": "show_hardness",
+        "local_scores": "hardness_local",
+    },
+]
+
+# Overall budget (seconds) for the whole DAG - four dependent stages, retries included
+PIPELINE_DEADLINE = 420
+
+# Single-answer pages store a string; the others store a {question: text} dict
+SINGLE_OUTPUT_KEYS = {"vocab_output", "current_system_data"}
+
+
+def build_full_context(problem, account, industry):
+    """Same prompt context the agent pages build before calling Talos"""
+    return f"""
+    Business Problem:
+    {problem.strip()}
+
+    Context:
+    Account: {account}
+    Industry: {industry}
+    """.strip()
+
+
+def build_pipeline_nodes():
+    """
+    Flatten PIPELINE_STAGES into one node per unique question name.
+    Pages that share questions (Interconnectedness mirrors Uncertainty) are
+    only called once.
+    """
+    nodes = {}
+    for stage in PIPELINE_STAGES:
+        for cfg in stage["configs"]:
+            if cfg["name"] not in nodes:
+                nodes[cfg["name"]] = {"cfg": cfg, "requires": stage["requires"], "context": stage["context"],
+                                      "postprocess": stage.get("postprocess"),
+                                      "local_scores": bool(stage.get("local_scores"))}
+    return nodes
+
+
+# ================================
+# 🚀 DAG Execution
+# ================================
+
+def iter_pipeline_results(problem, account, industry, headers, postprocess=payload_to_text, max_workers=None,
+                          session=None, cache=None, on_text=None):
+    """
+    Run every agent question as soon as its upstream questions have finished.
+    Yields (name, QuestionResult) in completion order. A failed upstream
+    question does not block its dependents - they run with the answers that
+    did succeed, just as the pages do when run out of order.
+    on_text(name, delta) streams partial answers, as in iter_concurrent_results.
+    Closing the generator early waits for the calls in flight and starts no more.
+    Off the script thread, pass session and cache resolved on it.
+    """
+    nodes = build_pipeline_nodes()
+    contexts = {
+        "full": build_full_context(problem, account, industry),
+        "problem": problem.strip(),
+    }
+    # Resolve the cached resources on the calling (script) thread, not in the workers
+    session = session or get_talos_session()
+    cache = cache or get_response_cache()
+    deadline = analysis_deadline(PIPELINE_DEADLINE)
+    workers = max_workers or MAX_PARALLEL_QUESTIONS
+
+    outputs = {}
+    finished = set()
+    pending = dict(nodes)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="talos-pipeline") as pool:
+        try:
+            while pending or running:
+                for name, node in list(pending.items()):
+                    if all(dep in finished for dep in node["requires"]):
+                        del pending[name]
+                        upstream = {dep: outputs[dep] for dep in node["requires"] if dep in outputs}
+                        if node["local_scores"]:
+                            local = score_dimensions(upstream)
+                            if local is not None:
+                                upstream["computed_scores"] = format_local_scores(local)
+                        future = pool.submit(
+                            call_question, node["cfg"], contexts[node["context"]], upstream, headers,
+                            node["postprocess"] or postprocess, session=session, cache=cache, deadline=deadline,
+                            on_text=functools.partial(on_text, name) if on_text else None
+                        )
+                        running[future] = name
+
+                if not running:
+                    # Unsatisfiable requirement - nothing left can ever start
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = future.result()
+                    finished.add(name)
+                    if result.ok:
+                        outputs[name] = result.text
+                    yield name, result
+        finally:
+            # A caller that stops early (closes the generator) leaves queued calls unstarted
+            for future in running:
+                future.cancel()
+
+
+def pipeline_session_updates(results, failed=()):
+    """
+    Map {question name: text} onto the session-state keys each agent page
+    renders from, so every page shows its results without another click.
+    """
+    updates = {}
+    for stage in PIPELINE_STAGES:
+        names = [
+            cfg["name"] for cfg in stage["configs"]
+            if cfg["name"] in results and (stage.get("keep_errors", True) or cfg["name"] not in failed)
+        ]
+        if not names:
+            continue
+        key = stage["outputs_key"]
+        if key in SINGLE_OUTPUT_KEYS:
+            updates[key] = results[names[0]]
+        else:
+            updates[key] = {name: results[name] for name in names}
+        updates[stage["show_key"]] = True
+        if stage.get("local_scores"):
+            answered = {name: text for name, text in results.items() if name not in failed}
+            updates[stage["local_scores"]] = score_dimensions(answered)
+    return updates
@@ -0,0 +1,272 @@
+"""
+Structured parsing of scored agent answers.
+Q1-Q12 answers and the Hardness Summary are read in one pass over their
+lines: every labelled section (Overall Difficulty Score, Hardness Level,
+Score, Justification, Summary, Key Takeaways, Dimension Averages) is
+collected, then the typed fields are taken from those sections. Results are
+memoized per (name, text), so display, download and analytics share one
+parse instead of re-scanning the answer on every rerun.
+score_dimensions aggregates the parsed Q1-Q12 scores locally, so the
+Hardness Summary call is only needed for its narrative.
+"""
+from collections import namedtuple
+from functools import lru_cache
+import re
+
+import numpy as np
+
+from agent_configs import VOLATILITY_API_CONFIGS, AMBIGUITY_API_CONFIGS, UNCERTAINTY_API_CONFIGS
+from talos_metrics import timed
+
+# ================================
+# 🏷️ Classifications
+# ================================
+
+HARD = "HARD"
+MODERATE = "MODERATE"
+NOT_HARD = "NOT HARD"
+UNKNOWN = "UNKNOWN"
+
+# Upper score bound of each band, as given to the Hardness agent (Easy 0-3.0, Moderate 3.1-4.0, Hard 4.1-5.0)
+CLASSIFICATION_BANDS = [(3.0, NOT_HARD), (4.0, MODERATE), (5.0, HARD)]
+
+MAX_SCORE = 5.0
+
+
+def classify_score(score):
+    """Classification band for a 0-5 score (UNKNOWN for None)"""
+    if score is None:
+        return UNKNOWN
+    for upper, label in CLASSIFICATION_BANDS:
+        if score <= upper:
+            return label
+    return HARD
+
+
+# ================================
+# 🧾 Parsed Record
+# ================================
+
+ScoredAnswer = namedtuple("ScoredAnswer", [
+    "name",                 # question name (Q1..Q12, hardness_summary)
+    "score",                # float 0-5 or None
+    "classification",       # HARD / MODERATE / NOT HARD / UNKNOWN
+    "justification",        # SME Justification / Justification section text
+    "summary",              # Summary section text
+    "takeaways",            # tuple of Key Takeaways bullet lines
+    "dimension_averages",   # tuple of (dimension, average) pairs
+])
+
+# Section label (lower case) -> record field
+_SECTION_FIELDS = {
+    "overall difficulty score": "overall_score",
+    "overall score": "overall_score",
+    "score": "score",
+    "hardness level": "classification",
+    "overall classification": "classification",
+    "classification": "classification",
+    "sme justification": "justification",
+    "justification": "justification",
+    "summary": "summary",
+    "key takeaways": "takeaways",
+    "key takeaway": "takeaways",
+    "dimension averages": "dimensions",
+    "dimension scores": "dimensions",
+}
+
+# A line opening a labelled section; longer labels first so "overall difficulty score" beats "score"
+_SECTION_LINE = re.compile(
+    r'^[\s#*•\-]*(?P<label>' + "|".join(sorted(_SECTION_FIELDS, key=len, reverse=True)) + r')\b'
+    r'(?:\s*\([^)]*\))?\s*[:\-–]?\s*(?P<rest>.*)$',
+    re.IGNORECASE
+)
+_NUMBER = re.compile(r'(?<![\d.])(\d+(?:\.\d+)?)')
+# "0-5", "3.1–4.0": scale and band ranges, never a score
+_RANGE = re.compile(r'\d+(?:\.\d+)?\s*[-–]\s*\d+(?:\.\d+)?')
+# A score label anywhere in the text ("Final Score: 4", "... hard. Score: 4")
+_SCORE_ANYWHERE = re.compile(
+    r'(?:overall\s+(?:difficulty\s+)?)?score\s*(?:\([^)]*\))?\s*[:\-]\s*(\d+(?:\.\d+)?)', re.IGNORECASE
+)
+_OUT_OF_FIVE = re.compile(r'(\d+(?:\.\d+)?)\s*(?:/|out of)\s*5\b', re.IGNORECASE)
+_DIMENSION_LINE = re.compile(r'^[\s#*•\-]*([A-Za-z][A-Za-z &]*?)\s*(?:\([^)]*\))?\s*[:=\-–]\s*(\d+(?:\.\d+)?)')
+_BULLET = re.compile(r'^\s*(?:[•*\-]|\d+[.)])\s*')
+_BRACKETED = re.compile(r'\[[^\]]*\]')
+
+_CLASSIFICATION_WORDS = [
+    (NOT_HARD, ("not hard", "easy")),
+    (MODERATE, ("moderate", "medium")),
+    (HARD, ("hard",)),
+]
+
+
+def _first_score(text):
+    """First number in text that is a valid 0-5 score (ranges skipped)"""
+    for match in _NUMBER.finditer(_RANGE.sub(' ', text)):
+        value = float(match.group(1))
+        if 0 <= value <= MAX_SCORE:
+            return value
+    return None
+
+
+def _classification_labels(text):
+    """Every band the text names"""
+    lowered = text.lower()
+    found = []
+    for label, words in _CLASSIFICATION_WORDS:
+        if any(word in lowered for word in words):
+            found.append(label)
+            # "not hard" also contains "hard"
+            if label == NOT_HARD:
+                lowered = lowered.replace("not hard", "")
+    return found
+
+
+def _section_classification(lines):
+    """
+    Band chosen in a classification section. A line listing several bands
+    ("[Easy: 0-3.0, Moderate: 3.1-4.0, Hard: 4.1-5.0]") is the scale, not the
+    choice, so the first single band after the last such line wins.
+    """
+    label = None
+    for line in lines:
+        found = _classification_labels(_BRACKETED.sub(' ', line))
+        if len(found) > 1:
+            label = None
+        elif found and label is None:
+            label = found[0]
+    return label
+
+
+def _split_sections(text):
+    """One pass over the lines: {field: [lines]} for every labelled section"""
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        match = _SECTION_LINE.match(line)
+        if match:
+            current = sections.setdefault(_SECTION_FIELDS[match.group("label").lower()], [])
+            if match.group("rest").strip():
+                current.append(match.group("rest").strip())
+        elif current is not None and line.strip():
+            current.append(line.strip())
+    return sections
+
+
+@lru_cache(maxsize=1024)
+@timed("parse")
+def parse_answer(name, text):
+    """ScoredAnswer for one Q1-Q12 or hardness_summary answer"""
+    if not text:
+        return ScoredAnswer(name, None, UNKNOWN, "", "", (), ())
+
+    sections = _split_sections(text)
+
+    score = None
+    for field in ("overall_score", "score"):
+        if field in sections:
+            score = _first_score(" ".join(sections[field]))
+            if score is not None:
+                break
+    if score is None:
+        for match in _SCORE_ANYWHERE.finditer(_RANGE.sub(' ', text)):
+            if float(match.group(1)) <= MAX_SCORE:
+                score = float(match.group(1))
+                break
+    if score is None:
+        match = _OUT_OF_FIVE.search(text)
+        if match and float(match.group(1)) <= MAX_SCORE:
+            score = float(match.group(1))
+
+    classification = None
+    if "classification" in sections:
+        classification = _section_classification(sections["classification"])
+    if classification is None:
+        classification = classify_score(score)
+
+    dimensions = []
+    for line in sections.get("dimensions", []):
+        match = _DIMENSION_LINE.match(line)
+        if match:
+            dimensions.append((match.group(1).strip(), float(match.group(2))))
+
+    return ScoredAnswer(
+        name=name,
+        score=score,
+        classification=classification,
+        justification="\n".join(sections.get("justification", [])),
+        summary="\n".join(sections.get("summary", [])),
+        takeaways=tuple(_BULLET.sub('', line) for line in sections.get("takeaways", [])),
+        dimension_averages=tuple(dimensions),
+    )
+
+
+def parse_outputs(outputs):
+    """{name: ScoredAnswer} for a {name: answer text} dict"""
+    return {name: parse_answer(name, text or "") for name, text in outputs.items()}
+
+
+# ================================
+# 🧮 Local Hardness Scoring
+# ================================
+
+# Dimension -> question names. Interconnectedness has no agencies of its own
+# (it asks Q10-Q12), so it is not scored twice.
+DIMENSIONS = {
+    "Volatility": [cfg["name"] for cfg in VOLATILITY_API_CONFIGS],
+    "Ambiguity": [cfg["name"] for cfg in AMBIGUITY_API_CONFIGS],
+    "Uncertainty": [cfg["name"] for cfg in UNCERTAINTY_API_CONFIGS],
+}
+
+_QUESTIONS = [name for names in DIMENSIONS.values() for name in names]
+
+# (dimensions x questions) 0/1 membership matrix
+_MEMBERSHIP = np.array(
+    [[1.0 if question in names else 0.0 for question in _QUESTIONS] for names in DIMENSIONS.values()]
+)
+
+LocalHardness = namedtuple("LocalHardness", [
+    "score",                # overall score: mean of the dimension averages, rounded to 2 places
+    "classification",       # band of the overall score
+    "dimension_averages",   # tuple of (dimension, average) pairs for the scored dimensions
+    "scored_questions",     # how many of Q1-Q12 had a parseable score
+])
+
+
+def unscored_questions(outputs):
+    """Scored questions whose answer is in outputs but has no parseable score"""
+    return tuple(
+        name for name in _QUESTIONS
+        if outputs.get(name) and parse_answer(name, outputs[name]).score is None
+    )
+
+
+def score_dimensions(outputs):
+    """
+    Dimension averages and overall hardness from the Q1-Q12 answers in outputs.
+    Returns None unless every dimension has at least one scored answer;
+    unscored_questions names the answers that were skipped.
+    """
+    # None (missing answer or no parseable score) becomes NaN
+    scores = np.array([parse_answer(name, outputs.get(name) or "").score for name in _QUESTIONS], dtype=float)
+    answered = ~np.isnan(scores)
+
+    counts = _MEMBERSHIP @ answered
+    if not counts.all():
+        return None
+    sums = _MEMBERSHIP @ np.where(answered, scores, 0.0)
+    averages = np.round(sums / counts, 2)
+    overall = round(float(averages.mean()), 2)
+
+    return LocalHardness(
+        score=overall,
+        classification=classify_score(overall),
+        dimension_averages=tuple(zip(DIMENSIONS, averages.tolist())),
+        scored_questions=int(answered.sum()),
+    )
+
+
+def format_local_scores(local):
+    """Prompt/export text for a LocalHardness record"""
+    lines = [f"{name}: {average}/5" for name, average in local.dimension_averages]
+    lines.append(f"Overall Difficulty Score: {local.score}/5 ({local.classification})")
+    return "\n".join(lines)
@@ -0,0 +1,155 @@
+"""
+Near-duplicate detection of business problems.
+Every full analysis that finishes without errors is indexed under its
+account and industry. A later submission that only differs in whitespace,
+punctuation or a few words is matched against that index, and its agent
+outputs are reused instead of running the whole pipeline again.
+Problems are normalized and cut into character shingles; a NumPy MinHash
+signature per problem lets one vectorized comparison rank every earlier
+problem of the account, and the best candidate is confirmed with its exact
+shingle Jaccard similarity. The index is process-wide, like the response
+cache's memory tier, and bounded per account.
+"""
+from collections import namedtuple
+import os
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+import streamlit as st
+
+from talos_metrics import timed
+
+# ================================
+# ⚙️ Similarity Settings
+# ================================
+
+# Shingle Jaccard similarity from which an earlier analysis is offered for reuse
+SIMILAR_THRESHOLD = float(os.environ.get("TALOS_SIMILAR_THRESHOLD", 0.8))
+
+# Similarity from which it is reused without asking (1.0 = same text once normalized)
+AUTO_REUSE_THRESHOLD = float(os.environ.get("TALOS_AUTO_REUSE_THRESHOLD", 0.95))
+
+# Characters per shingle; short enough that one changed word only touches a few
+SHINGLE_SIZE = 5
+
+# MinHash signature length; the estimate is within about +/-0.05 of the true similarity
+MINHASH_PERMUTATIONS = 128
+
+# Top MinHash estimates whose exact similarity is checked
+FIND_CANDIDATES = 3
+
+# Analyses kept per (account, industry); the oldest are dropped first
+INDEX_ENTRIES_PER_ACCOUNT = 500
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+# Fixed seed: signatures stay comparable for the life of the index
+_rng = np.random.default_rng(20240917)
+# a, b < 2**32 keep a * hash + b inside uint64 for 32-bit shingle hashes
+_PERM_A = _rng.integers(1, 1 << 32, MINHASH_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 32, MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+PriorAnalysis = namedtuple("PriorAnalysis", [
+    "problem",          # problem text as submitted
+    "results",          # {question name: answer text} of the full pipeline
+    "analyzed_at",      # time.time() when it was indexed
+])
+
+SimilarAnalysis = namedtuple("SimilarAnalysis", [
+    "analysis",         # the matching PriorAnalysis
+    "similarity",       # exact shingle Jaccard similarity, 0-1
+])
+
+
+def normalize_problem(text):
+    """Lowercase words only - whitespace and punctuation differences disappear"""
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def shingle_hashes(text):
+    """Sorted unique CRC32 hashes of the normalized text's character shingles"""
+    normalized = normalize_problem(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+    return np.unique(np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64))
+
+
+def minhash(hashes):
+    """MINHASH_PERMUTATIONS-long signature of a shingle hash array"""
+    return ((np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME).min(axis=0)
+
+
+def jaccard(a, b):
+    """Exact Jaccard similarity of two sorted unique hash arrays"""
+    union = len(np.union1d(a, b))
+    return len(np.intersect1d(a, b, assume_unique=True)) / union if union else 1.0
+
+
+# ================================
+# 🗂️ Index
+# ================================
+
+class ProblemIndex:
+    """Thread-safe per-(account, industry) MinHash index of finished analyses"""
+
+    def __init__(self, max_entries=INDEX_ENTRIES_PER_ACCOUNT):
+        self.max_entries = max_entries
+        # (account, industry) -> {"entries": [...], "shingles": [...], "signatures": ndarray}
+        self._scopes = {}
+        self._lock = threading.Lock()
+
+    def add(self, account, industry, problem, results):
+        """Index one finished analysis; a re-run of the same normalized text replaces the older one"""
+        hashes = shingle_hashes(problem)
+        signature = minhash(hashes)
+        entry = PriorAnalysis(problem, dict(results), time.time())
+        normalized = normalize_problem(problem)
+        with self._lock:
+            scope = self._scopes.setdefault((account, industry), {
+                "entries": [], "shingles": [],
+                "signatures": np.empty((0, MINHASH_PERMUTATIONS), dtype=np.uint64),
+            })
+            keep = [i for i, old in enumerate(scope["entries"]) if normalize_problem(old.problem) != normalized]
+            keep = keep[-(self.max_entries - 1):] if self.max_entries > 1 else []
+            scope["entries"] = [scope["entries"][i] for i in keep] + [entry]
+            scope["shingles"] = [scope["shingles"][i] for i in keep] + [hashes]
+            scope["signatures"] = np.vstack([scope["signatures"][keep], signature])
+
+    @timed("similarity")
+    def find(self, account, industry, problem, threshold=SIMILAR_THRESHOLD):
+        """Most similar earlier analysis of the same account and industry, None below threshold"""
+        hashes = shingle_hashes(problem)
+        with self._lock:
+            scope = self._scopes.get((account, industry))
+            if not scope or not scope["entries"]:
+                return None
+            estimates = (scope["signatures"] == minhash(hashes)).mean(axis=1)
+            candidates = [(scope["entries"][i], scope["shingles"][i]) for i in np.argsort(-estimates)[:FIND_CANDIDATES]]
+        # The MinHash estimate only shortlists; the decision uses the exact similarity
+        best = max((SimilarAnalysis(entry, jaccard(hashes, shingles)) for entry, shingles in candidates),
+                   key=lambda match: match.similarity)
+        return best if best.similarity >= threshold else None
+
+    def size(self):
+        with self._lock:
+            return sum(len(scope["entries"]) for scope in self._scopes.values())
+
+    def clear(self):
+        with self._lock:
+            self._scopes.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def get_problem_index():
+    """Process-wide index shared by every session"""
+    return ProblemIndex()
+
+
+def index_analysis(index, account, industry, problem, results):
+    """Index a finished pipeline's {name: QuestionResult} if every question succeeded"""
+    if results and all(result.ok for result in results.values()):
+        index.add(account, industry, problem, {name: result.text for name, result in results.items()})
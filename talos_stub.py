@@ -0,0 +1,284 @@
+"""
+Local stand-in for the Talos reasoning API, for offline runs and benchmarks.
+Answers POST /talos-engine/agency/reasoning_api with canned, agent-shaped
+markdown (vocabulary, current system, scored Q1-Q12 answers, hardness
+summary) after a configurable latency, fails a configurable fraction of
+calls and pads answers to a configurable size. Requests that accept
+text/event-stream get the answer as one event per line, chunked, with the
+latency spread over the lines (--no-stream always replies with JSON).
+
+    python talos_stub.py --port 8765 --latency lognormal:1.5:0.4 --error-rate 0.05
+    TALOS_BASE_URL=http://127.0.0.1:8765 streamlit run Welcome_Agent.py
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+import time
+
+# ================================
+# ⚙️ Stub Settings
+# ================================
+
+STUB_PATH = "/talos-engine/agency/reasoning_api"
+DEFAULT_PORT = 8765
+
+# Share of a streamed reply's latency spent before the first event
+STREAM_FIRST_EVENT = 0.2
+
+
+class StubProfile:
+    """Latency distribution, error rate and answer size of the stub"""
+
+    def __init__(self, latency="fixed:0", error_rate=0.0, error_status=503, payload_bytes=0, seed=None,
+                 stream=True):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.payload_bytes = payload_bytes
+        self.stream = stream
+        self._sample = parse_latency(latency)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+
+    def next_call(self):
+        """(latency seconds, fail?) for one request"""
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+            return max(0.0, self._sample(self._random)), fail
+
+    def score(self, low=1.0, high=5.0):
+        """Random answer score, one decimal place"""
+        with self._lock:
+            return round(self._random.uniform(low, high), 1)
+
+
+def parse_latency(spec):
+    """
+    Sampler for a latency spec in seconds:
+    fixed:S, uniform:LOW:HIGH, or lognormal:MEDIAN:SIGMA.
+    """
+    kind, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(":") if v]
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal" and len(values) == 2:
+        median, sigma = values
+        if median <= 0:
+            return lambda rng: 0.0
+        return lambda rng: rng.lognormvariate(0.0, sigma) * median
+    raise ValueError(f"Unknown latency spec {spec!r} (use fixed:S, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA)")
+
+
+# ================================
+# 📝 Canned Answers
+# ================================
+
+_FILLER = (
+    "Stakeholders across planning, operations and finance rely on these signals, "
+    "and shifts in any of them ripple into the downstream decisions. "
+)
+
+VOCABULARY_ANSWER = """## Key Vocabulary
+
+1. **Customer Churn**: The share of enterprise customers who do not renew their contracts.
+2. **Renewal Window**: The 90 days before contract end when retention offers are made.
+- **Account Health Score**: A composite of usage, support tickets and spend trends.
+- **Propensity Model**: A model estimating each account's likelihood to churn.
+"""
+
+CURRENT_SYSTEM_ANSWER = """## Current System
+
+Account managers review renewal dashboards weekly and flag at-risk accounts by judgment.
+
+---
+
+## Inputs
+
+- CRM opportunity and contract data
+- Product usage telemetry
+- Support ticket history
+
+## Outputs
+
+- A weekly at-risk account list
+- Manual retention offers
+
+## Pain Points
+
+- **Late detection**: risk is often spotted inside the renewal window.
+- **Inconsistent criteria**: each manager weighs signals differently.
+"""
+
+QUESTION_ANSWER = """Q1 Answer Explanation:
+
+**Score (0-5):** {score}
+
+**Justification:** The key inputs change at a moderate pace and the account team sees
+shifts every quarter.
+- **Driver**: demand and pricing move with the market.
+- **Impact**: plans need regular revision.
+
+**Key Takeaway:** Build in a regular review cadence.
+"""
+
+HARDNESS_ANSWER = """Overall Difficulty Score
+{score}/5
+
+Hardness Level
+{level}
+
+SME Justification
+The problem combines fast-moving inputs with unclear ownership of the decision, and
+the available data only partly explains the outcome.
+
+Summary
+A moderately hard problem driven mainly by volatility and ambiguity.
+
+Key Takeaways
+- Clarify who owns the retention decision.
+- Consolidate the account health signals.
+- Pilot a propensity model before scaling.
+"""
+
+
+def canned_answer(goal, profile):
+    """Agent-shaped answer text for an agency goal, padded to profile.payload_bytes"""
+    if "Extract the vocabulary" in goal:
+        text = VOCABULARY_ANSWER
+    elif "Describe the current system" in goal:
+        text = CURRENT_SYSTEM_ANSWER
+    elif "hardness assessment" in goal:
+        score = profile.score()
+        level = "Easy" if score <= 3.0 else "Moderate" if score <= 4.0 else "Hard"
+        text = HARDNESS_ANSWER.format(score=score, level=level)
+    else:
+        text = QUESTION_ANSWER.format(score=profile.score())
+
+    if profile.payload_bytes > len(text):
+        repeats = (profile.payload_bytes - len(text)) // len(_FILLER) + 1
+        text += "\n" + _FILLER * repeats
+    return text
+
+
+# ================================
+# 🌐 HTTP Server
+# ================================
+
+class StubHandler(BaseHTTPRequestHandler):
+    """POST handler for the reasoning endpoint; the profile is set on the server"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; Nagle would hold the body back ~40ms
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+        if not self.path.startswith(STUB_PATH):
+            return self._reply(404, {"error": f"Unknown path {self.path}"})
+        try:
+            goal = json.loads(body or b"{}").get("agency_goal", "")
+        except ValueError:
+            return self._reply(400, {"error": "Body is not JSON"})
+
+        profile = self.server.profile
+        latency, fail = profile.next_call()
+        if profile.stream and "text/event-stream" in self.headers.get("Accept", ""):
+            return self._stream(latency, fail, goal, profile)
+        time.sleep(latency)
+        if fail:
+            return self._reply(profile.error_status, {"error": "Stub injected failure"})
+        self._reply(200, {"result": canned_answer(goal, profile)})
+
+    def _stream(self, latency, fail, goal, profile):
+        """Send the answer as one server-sent event per line, latency spread over the events"""
+        time.sleep(latency * STREAM_FIRST_EVENT)
+        if fail:
+            return self._reply(profile.error_status, {"error": "Stub injected failure"})
+        lines = canned_answer(goal, profile).splitlines(keepends=True)
+        pause = latency * (1 - STREAM_FIRST_EVENT) / max(1, len(lines))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, line in enumerate(lines):
+            if index:
+                time.sleep(pause)
+            self._chunk(f"data: {json.dumps({'delta': line})}\n\n")
+        self._chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # One line per request would swamp benchmark output
+        pass
+
+
+def start_stub_server(profile=None, host="127.0.0.1", port=0):
+    """
+    Serve the stub on a daemon thread. port=0 picks a free port.
+    Returns (server, base_url); call server.shutdown() to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.profile = profile or StubProfile()
+    threading.Thread(target=server.serve_forever, name="talos-stub", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_profile_arguments(parser):
+    """Stub profile options, shared with the benchmark CLI"""
+    parser.add_argument("--latency", default="fixed:0",
+                        help="fixed:S, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA seconds (default fixed:0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls that fail (default 0)")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of failed calls (default 503)")
+    parser.add_argument("--payload-bytes", type=int, default=0, help="pad answers to at least this size")
+    parser.add_argument("--seed", type=int, default=None, help="seed for repeatable latencies and failures")
+    parser.add_argument("--no-stream", dest="stream", action="store_false",
+                        help="reply with plain JSON even when the client accepts an event stream")
+
+
+def profile_from_args(args):
+    return StubProfile(args.latency, args.error_rate, args.error_status, args.payload_bytes, args.seed, args.stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for the Talos reasoning API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server, base_url = start_stub_server(profile_from_args(args), args.host, args.port)
+    print(f"Talos stub listening on {base_url} - set TALOS_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
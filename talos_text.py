@@ -0,0 +1,213 @@
+"""
+Shared text helpers for turning Talos reasoning payloads into display text.
+Every cleanup pattern is compiled once at import. Each rule also names a
+literal that any match must contain; the rule is skipped when that literal
+is absent, so a response without markdown, HTML or stray headings costs a
+few substring scans instead of a full regex pass per rule. Rules run in the
+same order as the per-page originals, so the output is unchanged.
+"""
+import re
+
+# ================================
+# 🧩 Payload Extraction
+# ================================
+
+# Keys that hold the answer text in a reasoning payload, in priority order
+ANSWER_KEYS = ("result", "output", "content", "text", "answer", "response")
+
+# The Current System page reads fewer keys and never guesses at other string values
+CURRENT_SYSTEM_ANSWER_KEYS = ("result", "output", "content", "text")
+
+
+def json_to_text(data, keys=ANSWER_KEYS, any_string=True):
+    """Extract text from JSON response"""
+    if data is None:
+        return ""
+    if isinstance(data, str):
+        return data
+    if isinstance(data, dict):
+        for key in keys:
+            if key in data and data[key]:
+                return json_to_text(data[key], keys, any_string)
+        if "data" in data:
+            return json_to_text(data["data"], keys, any_string)
+        if any_string:
+            # Try to extract any string values
+            for value in data.values():
+                if isinstance(value, str) and len(value) > 10:
+                    return value
+        return "\n".join(f"{k}: {json_to_text(v, keys, any_string)}" for k, v in data.items() if v)
+    if isinstance(data, list):
+        return "\n".join(json_to_text(x, keys, any_string) for x in data if x)
+    return str(data)
+
+
+# ================================
+# 🧹 Rule Engine
+# ================================
+
+def _rule(pattern, repl, trigger=None, flags=0):
+    """(trigger, compiled pattern, replacement); trigger=None means always run"""
+    return trigger, re.compile(pattern, flags), repl
+
+
+def _apply_rules(text, rules):
+    for trigger, pattern, repl in rules:
+        if trigger is None or trigger in text:
+            text = pattern.sub(repl, text)
+    return text
+
+
+_LEADING_S = re.compile(r'^\s*s\s+')
+
+_STRAY_S_RULES = [
+    _rule(r'\n\s*s\s+', '\n', '\n'),
+]
+
+_RULE_LINES = [
+    _rule(r'^---\s*$', '', '---', re.MULTILINE),
+]
+
+_MARKDOWN_RULES = [
+    _rule(r'Q\d+\s*Answer\s*Explanation\s*:', '', None, re.IGNORECASE),
+    _rule(r'\*\*(.*?)\*\*', r'\1', '**'),
+    _rule(r'\*(.*?)\*', r'\1', '*'),
+    _rule(r'`(.*?)`', r'\1', '`'),
+    _rule(r'#+\s*', '', '#'),
+    _rule(r'!\[.*?\]\(.*?\)', '', '!['),
+    _rule(r'\[(.*?)\]\(.*?\)', r'\1', ']('),
+    _rule(r'\n{3,}', '\n\n', '\n\n\n'),
+    _rule(r' {2,}', ' ', '  '),
+    _rule(r'^\s*[-*]\s+', '• ', None, re.MULTILINE),
+    _rule(r'<\/?[^>]+>', '', '<'),
+]
+
+
+def sanitize_text(text, strip_rules=False):
+    """
+    Remove markdown artifacts and clean up text.
+    strip_rules also blanks '---' separator lines (Current System output).
+    """
+    if not text:
+        return ""
+
+    # Fix the "s" character issue
+    text = _apply_rules(_LEADING_S.sub('', text.strip()), _STRAY_S_RULES)
+    if strip_rules:
+        text = _apply_rules(text, _RULE_LINES)
+    text = _apply_rules(text, _MARKDOWN_RULES)
+    text = text.replace('& Key Takeaway:', 'Key Takeaway:')
+
+    return text.strip()
+
+
+def payload_to_text(data):
+    """Extract and sanitize the answer text of a reasoning payload"""
+    return sanitize_text(json_to_text(data))
+
+
+def current_system_payload_to_text(data):
+    """Current System's variant of payload_to_text"""
+    return sanitize_text(json_to_text(data, CURRENT_SYSTEM_ANSWER_KEYS, any_string=False), strip_rules=True)
+
+
+class LineSanitizer:
+    """
+    Incremental sanitize_text for streamed answers: feed raw text deltas and
+    get back each line as soon as it is complete, already cleaned. Rules that
+    span lines (multi-line bold, blank-line runs) only apply to the finished
+    answer, so this is for previews - the stored text comes from postprocess.
+    """
+
+    def __init__(self, strip_rules=False):
+        self.strip_rules = strip_rules
+        self._pending = ""
+        self._blank = True
+
+    def feed(self, delta):
+        """Cleaned lines completed by delta (blank-line runs collapse to one)"""
+        *lines, self._pending = (self._pending + delta).split("\n")
+        return self._clean(lines)
+
+    def flush(self):
+        """Clean the unterminated last line, if any"""
+        if not self._pending:
+            return []
+        lines, self._pending = [self._pending], ""
+        return self._clean(lines)
+
+    def _clean(self, lines):
+        cleaned = []
+        for line in lines:
+            line = sanitize_text(line, self.strip_rules)
+            if line or not self._blank:
+                cleaned.append(line)
+            self._blank = not line
+        return cleaned
+
+
+# ================================
+# 🧾 Display Cleanup
+# ================================
+
+_WHITESPACE_RULES = [
+    _rule(r'^\s+', '', None, re.MULTILINE),
+    _rule(r'\n\s+', '\n', '\n'),
+    _rule(r' {2,}', ' ', '  '),
+    _rule(r'\n{3,}', '\n\n', '\n\n\n'),
+]
+
+_DIMENSION_RULES = [
+    _rule(r'<[^>]+>', '', '<'),
+    _rule(r'^(Q\d+\.?\s*)', '', None, re.MULTILINE | re.IGNORECASE),
+    _rule(r'\n(Q\d+\.?\s*)', '\n', '\n', re.MULTILINE | re.IGNORECASE),
+    _rule(r'^(Question\s*\d+\.?\s*)', '', None, re.MULTILINE | re.IGNORECASE),
+    _rule(r'\n(Question\s*\d+\.?\s*)', '\n', '\n', re.MULTILINE | re.IGNORECASE),
+    _rule(r'^(Answer|Analysis)\s*:\s*', '', ':', re.MULTILINE | re.IGNORECASE),
+    _rule(r'Score\s*\(0[-–]5\)\s*:', 'Score:', '(0', re.IGNORECASE),
+] + _WHITESPACE_RULES
+
+
+def clean_dimension_output(text, empty_message):
+    """Strip Q1/Q2/Q3 prefixes, HTML tags and stray whitespace from a dimension answer"""
+    if not text:
+        return empty_message
+    return _apply_rules(text, _DIMENSION_RULES).strip()
+
+
+_SME_PREFIX = re.compile(r'^.*?(?=SME Justification)', re.DOTALL | re.IGNORECASE)
+
+# Up to the next blank line, capitalised line or end of text
+_SECTION_END = r'.*?(?=\n\n|\n[A-Z]|$)'
+
+_HARDNESS_RULES = [
+    # Calculation sections that might still be present
+    _rule(r'Calculation:' + _SECTION_END, '', ':', re.DOTALL | re.IGNORECASE),
+    _rule(r'Score Calculation:' + _SECTION_END, '', ':', re.DOTALL | re.IGNORECASE),
+    _rule(r'Calculation Process:' + _SECTION_END, '', ':', re.DOTALL | re.IGNORECASE),
+    _rule(r'How.*?calculated:' + _SECTION_END, '', ':', re.IGNORECASE | re.DOTALL),
+    # Mathematical expressions
+    _rule(r'\(\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*\)\s*\/\s*4', '', '/'),
+    _rule(r'\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*[+-]\s*\d+\.?\d*\s*=\s*\d+\.?\d*', '', '='),
+    # Dimension and per-question scores repeated after the justification
+    _rule(r'Individual Question Scores' + _SECTION_END, '', None, re.DOTALL | re.IGNORECASE),
+    _rule(r'Dimension Averages' + _SECTION_END, '', None, re.DOTALL | re.IGNORECASE),
+    _rule(r'DIMENSION SCORES:' + _SECTION_END, '', ':', re.DOTALL | re.IGNORECASE),
+    _rule(r'OVERALL CLASSIFICATION:' + _SECTION_END, '', ':', re.DOTALL | re.IGNORECASE),
+    _rule(r'COMPREHENSIVE ASSESSMENT:' + _SECTION_END, '', ':', re.DOTALL | re.IGNORECASE),
+    _rule(r'HARDNESS SUMMARY' + _SECTION_END, '', None, re.DOTALL | re.IGNORECASE),
+    _rule(r'<[^>]+>', '', '<'),
+] + _WHITESPACE_RULES
+
+
+def format_hardness_output(text):
+    """Format hardness output by removing everything before SME Justification and cleaning up"""
+    if not text:
+        return "No hardness data available"
+
+    clean_text = _SME_PREFIX.sub('', text)
+    # If SME Justification wasn't found, use the original text
+    if not clean_text.strip():
+        clean_text = text
+
+    return _apply_rules(clean_text, _HARDNESS_RULES).strip()
@@ -0,0 +1,177 @@
+"""
+Per-account warm-up of the response cache.
+For every mapped account in ACCOUNT_INDUSTRY_MAP the Vocabulary agency is
+asked once for a problem-independent vocabulary baseline of the account's
+industry. The answers land in the shared response cache, so the Vocabulary
+page can show the baseline the moment an analysis for that account starts,
+and Current System can use it as context when Vocabulary has not run yet.
+Runs inside the app at startup (TALOS_WARMUP=1, repeated every
+TALOS_WARMUP_INTERVAL seconds when set) or from the command line; with
+TALOS_CACHE_DIR set, a command-line run warms the disk tier the app reads.
+
+    TALOS_CACHE_DIR=.talos_cache python talos_warmup.py --every 3600
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import sys
+import threading
+import time
+
+import streamlit as st
+
+from agent_configs import ACCOUNT_BASELINE_CONFIG
+from response_cache import CACHE_DIR, get_response_cache, make_cache_key
+from shared_header import ACCOUNT_INDUSTRY_MAP
+from talos_client import TENANT_ID, build_talos_headers, call_question, get_auth_token, get_talos_session
+from talos_format import answer_html
+from talos_text import payload_to_text
+
+# ================================
+# ⚙️ Warm-up Settings
+# ================================
+
+WARMUP_ENABLED = os.environ.get("TALOS_WARMUP", "") == "1"
+
+# Seconds between in-app warm-up passes; 0 warms once at startup
+WARMUP_INTERVAL = int(os.environ.get("TALOS_WARMUP_INTERVAL", 0))
+
+# Comma-separated accounts to warm (default: every mapped account)
+WARMUP_ACCOUNTS = os.environ.get("TALOS_WARMUP_ACCOUNTS", "")
+
+# Baselines fetched at once; kept low so a pass never crowds out user analyses
+WARMUP_WORKERS = 4
+
+
+def warmup_accounts(names=WARMUP_ACCOUNTS):
+    """{account: industry} to warm - mapped accounts only, optionally narrowed to names"""
+    wanted = {name.strip() for name in names.split(",") if name.strip()} if isinstance(names, str) else set(names)
+    return {
+        account: industry for account, industry in ACCOUNT_INDUSTRY_MAP.items()
+        if industry not in ("Select Industry", "Other") and (not wanted or account in wanted)
+    }
+
+
+def account_context(account, industry):
+    """Agency context of an account's baseline (no problem statement)"""
+    return f"Account: {account}\nIndustry: {industry}"
+
+
+def baseline_key(account, industry):
+    """Response-cache key of the baseline call for an account"""
+    goal = ACCOUNT_BASELINE_CONFIG["prompt"](account_context(account, industry), {})
+    return make_cache_key(ACCOUNT_BASELINE_CONFIG["url"], goal, TENANT_ID)
+
+
+def cached_baseline(account, industry, cache=None):
+    """
+    Precomputed baseline text of an account, None unless it has been warmed.
+    Never calls the API; peeks, so polling pages don't skew the cache hit rate.
+    """
+    if ACCOUNT_INDUSTRY_MAP.get(account) != industry:
+        return None
+    payload = (cache or get_response_cache()).peek(baseline_key(account, industry))
+    return payload_to_text(payload) if payload is not None else None
+
+
+# ================================
+# 🔥 Warm-up Pass
+# ================================
+
+def warm_cache(headers, accounts=None, max_workers=WARMUP_WORKERS, session=None, cache=None):
+    """
+    Fetch the baseline of every account into the response cache.
+    Yields (account, QuestionResult) as each finishes; baselines still in the
+    cache come back as cache hits without a call. Off the script thread, pass
+    session and cache resolved on it.
+    """
+    accounts = warmup_accounts() if accounts is None else accounts
+    session = session or get_talos_session()
+    cache = cache or get_response_cache()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="talos-warmup") as pool:
+        futures = {
+            pool.submit(
+                call_question, ACCOUNT_BASELINE_CONFIG, account_context(account, industry), {}, headers,
+                payload_to_text, session=session, cache=cache
+            ): account
+            for account, industry in accounts.items()
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def _warm_forever(headers, interval, session, cache):
+    while True:
+        for _ in warm_cache(headers, session=session, cache=cache):
+            pass
+        if not interval:
+            return
+        time.sleep(interval)
+
+
+@st.cache_resource(show_spinner=False)
+def start_warmup():
+    """
+    Start the process-wide warm-up thread once (TALOS_WARMUP=1).
+    Returns the thread, or None when warm-up is off.
+    """
+    if not WARMUP_ENABLED:
+        return None
+    thread = threading.Thread(
+        target=_warm_forever,
+        args=(build_talos_headers(get_auth_token()), WARMUP_INTERVAL, get_talos_session(), get_response_cache()),
+        name="talos-warmup",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+# ================================
+# 🖥️ Page Helpers (script thread)
+# ================================
+
+def render_account_baseline(account, industry):
+    """Show the account's precomputed baseline while its own analysis runs (nothing if not warmed)"""
+    baseline = cached_baseline(account, industry)
+    if baseline:
+        with st.expander(f"📚 {industry} vocabulary baseline for {account} (precomputed)", expanded=True):
+            st.markdown(answer_html(baseline, "vocabulary", account, industry), unsafe_allow_html=True)
+
+
+# ================================
+# 💻 Command Line
+# ================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute per-account vocabulary baselines into the response cache")
+    parser.add_argument("--accounts", default=WARMUP_ACCOUNTS,
+                        help="comma-separated accounts to warm (default: every mapped account)")
+    parser.add_argument("--workers", type=int, default=WARMUP_WORKERS,
+                        help=f"baselines fetched at once (default {WARMUP_WORKERS})")
+    parser.add_argument("--every", type=int, default=0, help="repeat every N seconds (default: run once)")
+    args = parser.parse_args(argv)
+
+    if not CACHE_DIR:
+        print("TALOS_CACHE_DIR is not set - the warmed cache ends with this process")
+    accounts = warmup_accounts(args.accounts)
+    headers = build_talos_headers(get_auth_token())
+    try:
+        while True:
+            started = time.perf_counter()
+            failed = 0
+            for account, result in warm_cache(headers, accounts, max_workers=args.workers):
+                status = "cached" if result.from_cache else "ok" if result.ok else f"failed: {result.text[:80]}"
+                failed += not result.ok
+                print(f"{account:<28}{accounts[account]:<18}{status}")
+            print(f"{len(accounts)} accounts, {failed} failed, {time.perf_counter() - started:.1f}s")
+            if not args.every:
+                break
+            time.sleep(args.every)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
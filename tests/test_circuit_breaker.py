@@ -0,0 +1,126 @@
+"""
+CircuitBreaker state changes: closed -> open at the failure threshold,
+open -> half-open after the cool-down with a single probe, and the probe's
+outcome closing or re-opening it.
+"""
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import circuit_breaker
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """Stands in for the time module; advance() moves time.time() forward"""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("https://agency/q1", failure_threshold=3, open_seconds=60)
+
+
+def _open(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure("HTTP 503")
+
+
+def test_opens_at_threshold(breaker):
+    for _ in range(2):
+        breaker.record_failure("HTTP 503")
+    breaker.before_call()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure("timeout", latency=60.0)
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 1
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.before_call()
+    assert raised.value.retry_in == 60
+
+
+def test_success_resets_the_count(breaker):
+    for _ in range(2):
+        breaker.record_failure("HTTP 503")
+    breaker.record_success(0.5)
+    breaker.record_failure("HTTP 503")
+    assert breaker.state == CLOSED
+    assert breaker.failures == 1
+
+
+def test_slow_success_is_not_a_failure(breaker):
+    for _ in range(5):
+        breaker.before_call()
+        breaker.record_success(120.0)
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert breaker.last_latency == 120.0
+
+
+def test_half_open_lets_one_probe_through(breaker, clock):
+    _open(breaker)
+    clock.advance(59)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.advance(1)
+    breaker.before_call()
+    assert breaker.state == HALF_OPEN
+    # A second caller fails fast while the probe is in flight
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success(1.0)
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens(breaker, clock):
+    _open(breaker)
+    clock.advance(60)
+    breaker.before_call()
+    breaker.record_failure("HTTP 503")
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    assert breaker.snapshot()["retry_in"] == 60
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_reset_closes(breaker):
+    _open(breaker)
+    breaker.reset()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_registry_shares_one_breaker_per_url(monkeypatch):
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    breaker = circuit_breaker.get_breaker("https://agency/q1")
+    assert circuit_breaker.get_breaker("https://agency/q1") is breaker
+    assert circuit_breaker.get_breaker("https://agency/q2") is not breaker
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure("HTTP 503")
+    circuit_breaker.reset_breakers()
+    assert [snapshot["state"] for snapshot in circuit_breaker.breaker_snapshots()] == [CLOSED, CLOSED]
@@ -0,0 +1,115 @@
+"""
+FeedbackStore schema migrations (legacy CSV import, v2 duplicate collapse,
+v3 indexes) and its filtered queries, on throwaway databases.
+"""
+import os
+import sqlite3
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feedback_store import FEEDBACK_COLUMNS, INDEXED_COLUMNS, SCHEMA_VERSION, FeedbackStore
+
+
+def _row(feedback="Useful", agent="Vocabulary Agent", **values):
+    row = {col: "" for col in FEEDBACK_COLUMNS}
+    row.update(Timestamp="2026-10-01 09:00:00", Name="Asha", Email="asha@example.com",
+               Feedback=feedback, FeedbackType="Positive", Account="Dell", Industry="Technology",
+               ProblemStatement="Reduce churn", Agent=agent)
+    row.update(values)
+    return row
+
+
+def _v1_database(path, rows):
+    """A database as schema v1 left it: the table, no indexes, duplicates intact"""
+    columns = ", ".join(f'"{col}" TEXT NOT NULL DEFAULT \'\'' for col in FEEDBACK_COLUMNS)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute(f"CREATE TABLE feedback (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns})")
+        conn.executemany(FeedbackStore._insert_sql(), [tuple(row[col] for col in FEEDBACK_COLUMNS) for row in rows])
+        conn.execute("PRAGMA user_version = 1")
+    conn.close()
+
+
+def _index_names(store):
+    return {name for (name,) in store._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeedbackStore(str(tmp_path / "feedback.db"), legacy_csv=None)
+
+
+def test_new_database_is_at_the_current_schema(store):
+    assert store._conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert {f"idx_feedback_{col}" for col in INDEXED_COLUMNS} <= _index_names(store)
+    assert store.count() == 0
+
+
+def test_legacy_csv_is_imported_once(tmp_path):
+    legacy = tmp_path / "feedback.csv"
+    pd.DataFrame([
+        {"Timestamp": "2026-09-01 10:00:00", "Name": "Ravi", "Feedback": "Too long"},
+        {"Timestamp": "2026-09-02 10:00:00", "Name": "Mei", "Feedback": "Clear"},
+    ]).to_csv(legacy, index=False)
+    path = str(tmp_path / "feedback.db")
+
+    rows = FeedbackStore(path, legacy_csv=str(legacy)).read_all()
+    assert list(rows.columns) == FEEDBACK_COLUMNS
+    assert rows["Name"].tolist() == ["Ravi", "Mei"]
+    # Older CSVs had no Agent column; missing columns come in empty
+    assert rows["Agent"].tolist() == ["Unknown Agent", "Unknown Agent"]
+    assert rows["Email"].tolist() == ["", ""]
+
+    assert FeedbackStore(path, legacy_csv=str(legacy)).count() == 2
+
+
+def test_v2_collapses_the_duplicate_copies(tmp_path):
+    path = str(tmp_path / "feedback.db")
+    _v1_database(path, [
+        _row(agent=""),
+        _row(),
+        _row(feedback="Missed the supply chain", agent="Unknown Agent"),
+        _row(feedback="Missed the supply chain", agent="Volatility Agent"),
+        _row(feedback="Only copy", agent=""),
+    ])
+    store = FeedbackStore(path, legacy_csv=None)
+
+    rows = store.read_all()
+    # One row per submission, keeping the copy that names its agent
+    assert rows[["Feedback", "Agent"]].values.tolist() == [
+        ["Useful", "Vocabulary Agent"],
+        ["Missed the supply chain", "Volatility Agent"],
+        ["Only copy", ""],
+    ]
+    assert store._conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert {f"idx_feedback_{col}" for col in INDEXED_COLUMNS} <= _index_names(store)
+
+
+def test_collapse_runs_only_once(tmp_path):
+    path = str(tmp_path / "feedback.db")
+    FeedbackStore(path, legacy_csv=None)
+    store = FeedbackStore(path, legacy_csv=None)
+    # Identical submissions made after the migration are kept
+    store.append(_row())
+    store.append(_row())
+    assert FeedbackStore(path, legacy_csv=None).count() == 2
+
+
+def test_append_and_filtered_queries(store):
+    store.append(_row(feedback="First"))
+    store.append(_row(feedback="Second", agent="Ambiguity Agent", FeedbackType="Negative"))
+    store.append(_row(feedback="Third", Timestamp="2026-11-02 09:00:00", Account=None))
+
+    assert store.count({"Agent": "Vocabulary Agent"}) == 2
+    assert store.count({"Agent": "", "FeedbackType": "Negative"}) == 1
+    assert store.query(limit=2)["Feedback"].tolist() == ["Third", "Second"]
+    assert store.query(limit=2, offset=2)["Feedback"].tolist() == ["First"]
+    assert store.read_all({"Account": "Dell"})["Feedback"].tolist() == ["First", "Second"]
+    assert store.summary("2026-10") == {"total": 3, "agents": 2, "this_month": 2}
+    assert store.version() == 3
+    with pytest.raises(ValueError):
+        store.count({"Password": "x"})
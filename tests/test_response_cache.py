@@ -0,0 +1,132 @@
+"""
+ResponseCache: TTL expiry, LRU eviction past the size cap, the disk tier
+and its pruning, and peek lookups that leave the counters alone.
+"""
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import response_cache
+from response_cache import ResponseCache, make_cache_key
+
+
+class FakeClock:
+    """Stands in for the time module; advance() moves time.time() forward"""
+
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache, "time", fake)
+    return fake
+
+
+def test_cache_key_is_stable_and_scoped():
+    key = make_cache_key("https://agency/q1", "goal", "talos")
+    assert key == make_cache_key("https://agency/q1", "goal", "talos")
+    assert key != make_cache_key("https://agency/q1", "goal", "other-tenant")
+    assert key != make_cache_key("https://agency/q2", "goal", "talos")
+
+
+def test_ttl_expiry(clock):
+    cache = ResponseCache(ttl=60, max_entries=8, cache_dir="")
+    cache.set("k", {"result": "answer"})
+    clock.advance(59)
+    assert cache.get("k") == {"result": "answer"}
+    clock.advance(2)
+    assert cache.get("k") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 0}
+
+
+def test_lru_eviction(clock):
+    cache = ResponseCache(ttl=60, max_entries=2, cache_dir="")
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading a makes b the least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_peek_leaves_counters_and_order_alone(clock):
+    cache = ResponseCache(ttl=60, max_entries=2, cache_dir="")
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.peek("a") == 1
+    assert cache.peek("missing") is None
+    assert cache.stats() == {"hits": 0, "misses": 0, "entries": 2}
+    # peek did not refresh a, so it is still the one evicted
+    cache.set("c", 3)
+    assert cache.peek("a") is None
+    clock.advance(61)
+    assert cache.peek("b") is None
+
+
+def test_disk_tier_survives_restart(clock, tmp_path):
+    ResponseCache(ttl=60, cache_dir=str(tmp_path)).set("k", {"result": "answer"})
+    restarted = ResponseCache(ttl=60, cache_dir=str(tmp_path))
+    assert restarted.peek("k") == {"result": "answer"}
+    assert restarted.get("k") == {"result": "answer"}
+    assert restarted.stats()["hits"] == 1
+
+
+def test_expired_disk_entry_is_removed_on_read(clock, tmp_path):
+    ResponseCache(ttl=60, cache_dir=str(tmp_path)).set("k", {"result": "answer"})
+    clock.advance(61)
+    assert ResponseCache(ttl=60, cache_dir=str(tmp_path)).get("k") is None
+    assert not (tmp_path / "k.json").exists()
+
+
+def test_unserializable_payload_stays_in_memory(clock, tmp_path):
+    cache = ResponseCache(ttl=60, cache_dir=str(tmp_path))
+    cache.set("k", {"result": object()})
+    assert cache.get("k") is not None
+    assert list(tmp_path.iterdir()) == []
+
+
+def _age(path, seconds):
+    """Set a cache file's mtime seconds into the past"""
+    when = time.time() - seconds
+    os.utime(path, (when, when))
+
+
+def test_disk_prune_drops_expired_then_oldest(monkeypatch, tmp_path):
+    cache = ResponseCache(ttl=60, cache_dir=str(tmp_path), disk_max_entries=2)
+    for key in ("old", "older", "expired"):
+        cache.set(key, {"result": key})
+    _age(tmp_path / "old.json", 10)
+    _age(tmp_path / "older.json", 20)
+    _age(tmp_path / "expired.json", 120)
+    stale_tmp = tmp_path / "k.json.123.tmp"
+    stale_tmp.write_text(json.dumps({}))
+    _age(stale_tmp, 120)
+
+    monkeypatch.setattr(response_cache, "DISK_PRUNE_INTERVAL", 1)
+    cache.set("new", {"result": "new"})
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["new.json", "old.json"]
+
+
+def test_disk_prune_runs_every_interval(monkeypatch, tmp_path):
+    monkeypatch.setattr(response_cache, "DISK_PRUNE_INTERVAL", 3)
+    cache = ResponseCache(ttl=60, cache_dir=str(tmp_path), disk_max_entries=1)
+    prunes = []
+    monkeypatch.setattr(cache, "_prune_disk", lambda: prunes.append(cache._disk_writes))
+    for i in range(7):
+        cache.set(f"k{i}", i)
+    assert prunes == [1, 4, 7]
@@ -0,0 +1,120 @@
+"""
+Script-run budget of the Welcome page's inputs and navigation.
+Widget callbacks update session state before the script runs, so every
+user action below must cost exactly one full script run - no st.rerun().
+Runs are counted through render_header, which every view calls once.
+"""
+import os
+import sys
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import shared_header
+from shared_header import ACCOUNTS, ACCOUNT_INDUSTRY_MAP
+
+WELCOME = os.path.join(ROOT, "Welcome_Agent.py")
+MAPPED_ACCOUNTS = [account for account in ACCOUNTS if account in ACCOUNT_INDUSTRY_MAP and account != "Select Account"]
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Counter of full script runs; pages re-import render_header on every run"""
+    counter = {"count": 0}
+    render_header = shared_header.render_header
+
+    def counting_render_header(*args, **kwargs):
+        counter["count"] += 1
+        return render_header(*args, **kwargs)
+
+    monkeypatch.setattr(shared_header, "render_header", counting_render_header)
+    return counter
+
+
+def script_runs(runs, widget):
+    """Full script runs one widget action costs"""
+    before = runs["count"]
+    at = widget.run()
+    assert not at.exception, [e.value for e in at.exception]
+    return runs["count"] - before
+
+
+@pytest.fixture
+def app(runs):
+    at = AppTest.from_file(WELCOME, default_timeout=60)
+    at.run()
+    at.text_input(key="employee_id_input").input("E1001")
+    return at
+
+
+@pytest.fixture
+def main_app(app, runs):
+    app.button(key="login_btn").click().run()
+    assert app.session_state["page"] == "main_app"
+    return app
+
+
+def _save_problem(at, account, problem="Reduce churn among enterprise customers"):
+    at.selectbox(key="main_app_account_select").select(account).run()
+    at.text_area(key="main_app_problem_textarea").input(problem)
+    at.button(key="main_app_save_btn").click().run()
+
+
+def test_launch_is_one_run(app, runs):
+    assert script_runs(runs, app.button(key="login_btn").click()) == 1
+    assert app.session_state["page"] == "main_app"
+
+
+def test_account_select_is_one_run(main_app, runs):
+    account = MAPPED_ACCOUNTS[0]
+    assert script_runs(runs, main_app.selectbox(key="main_app_account_select").select(account)) == 1
+    assert main_app.session_state["business_industry"] == ACCOUNT_INDUSTRY_MAP[account]
+    assert main_app.selectbox(key="main_app_industry_select").value == ACCOUNT_INDUSTRY_MAP[account]
+
+
+def test_save_is_one_run(main_app, runs):
+    main_app.selectbox(key="main_app_account_select").select(MAPPED_ACCOUNTS[0]).run()
+    main_app.text_area(key="main_app_problem_textarea").input("Reduce churn among enterprise customers")
+    assert script_runs(runs, main_app.button(key="main_app_save_btn").click()) == 1
+    assert main_app.session_state["saved_problem"] == "Reduce churn among enterprise customers"
+    assert main_app.session_state["saved_account"] == MAPPED_ACCOUNTS[0]
+
+
+def test_account_change_cancel_is_one_run_each(main_app, runs):
+    _save_problem(main_app, MAPPED_ACCOUNTS[0])
+    assert script_runs(runs, main_app.selectbox(key="main_app_account_select").select(MAPPED_ACCOUNTS[1])) == 1
+    assert main_app.session_state["main_app_pending_account"] == MAPPED_ACCOUNTS[1]
+    assert script_runs(runs, main_app.button(key="main_app_cancel_edit").click()) == 1
+    assert main_app.session_state["business_account"] == MAPPED_ACCOUNTS[0]
+    assert main_app.selectbox(key="main_app_account_select").value == MAPPED_ACCOUNTS[0]
+
+
+def test_account_change_confirm_is_one_run(main_app, runs):
+    _save_problem(main_app, MAPPED_ACCOUNTS[0])
+    main_app.selectbox(key="main_app_account_select").select(MAPPED_ACCOUNTS[1]).run()
+    assert script_runs(runs, main_app.button(key="main_app_confirm_edit").click()) == 1
+    assert main_app.session_state["business_account"] == MAPPED_ACCOUNTS[1]
+    assert main_app.session_state["business_industry"] == ACCOUNT_INDUSTRY_MAP[MAPPED_ACCOUNTS[1]]
+
+
+def test_logout_is_one_run(main_app, runs):
+    logout = next(button for button in main_app.button if "Logout" in button.label)
+    assert script_runs(runs, logout.click()) == 1
+    assert main_app.session_state["launched_agent"] is None
+
+
+def test_admin_navigation_is_one_run_each(main_app, runs):
+    main_app.session_state["show_admin_panel"] = True
+    main_app.run()
+    assert script_runs(runs, main_app.button(key="cancel_admin_view_btn").click()) == 1
+    assert main_app.session_state["page"] == "login"
+
+    main_app.session_state["show_admin_panel"] = True
+    main_app.run()
+    assert script_runs(runs, main_app.button(key="open_admin_view_btn").click()) == 1
+    assert main_app.session_state["admin_view_selected"]
+    assert script_runs(runs, main_app.button(key="admin_back_btn").click()) == 1
+    assert not main_app.session_state["admin_view_selected"]
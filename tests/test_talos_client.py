@@ -0,0 +1,138 @@
+"""
+Retry policy of talos_client: Retry-After parsing, the backoff delay and
+post_with_retry's handling of retryable statuses, connection errors and the
+shared analysis deadline. post_reasoning is replaced, so nothing goes out.
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import os
+import sys
+import time
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import circuit_breaker
+import talos_client
+from talos_client import _backoff_delay, _retry_after_seconds, post_with_retry
+
+URL = "https://agency/q1"
+
+
+class FakeResponse:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.headers = {"Retry-After": retry_after} if retry_after is not None else {}
+        self.content = b"{}"
+        self.text = "{}"
+        self.elapsed = timedelta(seconds=0.1)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replies handed out in order by a fake post_reasoning; sleeps are recorded, not slept"""
+    state = {"replies": [], "posts": 0, "sleeps": []}
+
+    def fake_post(url, goal, headers, timeout=None, session=None, stream=False):
+        state["posts"] += 1
+        reply = state["replies"].pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(talos_client, "post_reasoning", fake_post)
+    monkeypatch.setattr(talos_client.time, "sleep", state["sleeps"].append)
+    monkeypatch.setattr(circuit_breaker, "_breakers", {})
+    return state
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("3", 3.0),
+    ("1.5", 1.5),
+    ("-4", 0.0),
+    ("soon", None),
+    (None, None),
+])
+def test_retry_after_seconds(value, seconds):
+    assert _retry_after_seconds(FakeResponse(429, value)) == seconds
+
+
+def test_retry_after_http_date():
+    when = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= _retry_after_seconds(FakeResponse(503, when)) <= 30
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert _retry_after_seconds(FakeResponse(503, past)) == 0.0
+
+
+def test_backoff_delay(monkeypatch):
+    # Full jitter draws from [0, cap]; take the top of the range
+    monkeypatch.setattr(talos_client.random, "uniform", lambda low, high: high)
+    assert [_backoff_delay(attempt) for attempt in (1, 2, 3, 10)] == [1.0, 2.0, 4.0, talos_client.BACKOFF_CAP]
+    # Retry-After is a floor, never shortened by the jitter
+    monkeypatch.setattr(talos_client.random, "uniform", lambda low, high: low)
+    assert _backoff_delay(1, retry_after=7.0) == 7.0
+
+
+def test_retries_until_success(calls):
+    calls["replies"] = [FakeResponse(503, "2"), FakeResponse(200)]
+    trace = {}
+    response, attempts = post_with_retry(URL, "goal", {}, trace=trace)
+    assert (response.status_code, attempts) == (200, 2)
+    assert calls["sleeps"][0] >= 2
+    assert trace["status"] == 200
+
+
+def test_non_retryable_status_is_returned_at_once(calls):
+    calls["replies"] = [FakeResponse(400)]
+    response, attempts = post_with_retry(URL, "goal", {})
+    assert (response.status_code, attempts) == (400, 1)
+    assert calls["sleeps"] == []
+
+
+def test_gives_up_after_max_attempts(calls):
+    calls["replies"] = [FakeResponse(503) for _ in range(3)]
+    response, attempts = post_with_retry(URL, "goal", {}, max_attempts=3)
+    assert (response.status_code, attempts) == (503, 3)
+    assert len(calls["sleeps"]) == 2
+
+
+def test_connection_errors_are_retried_then_raised(calls):
+    calls["replies"] = [requests.exceptions.ConnectionError("reset") for _ in range(3)]
+    with pytest.raises(requests.exceptions.ConnectionError) as raised:
+        post_with_retry(URL, "goal", {}, max_attempts=3)
+    assert raised.value.attempts == 3
+
+
+def test_timeout_is_not_retried(calls):
+    calls["replies"] = [requests.exceptions.ReadTimeout("slow")]
+    with pytest.raises(requests.exceptions.Timeout) as raised:
+        post_with_retry(URL, "goal", {})
+    assert raised.value.attempts == 1
+    assert calls["posts"] == 1
+
+
+def test_past_deadline_makes_no_call(calls):
+    with pytest.raises(requests.exceptions.Timeout) as raised:
+        post_with_retry(URL, "goal", {}, deadline=time.monotonic() - 1)
+    assert raised.value.attempts == 0
+    assert calls["posts"] == 0
+
+
+def test_backoff_never_sleeps_past_the_deadline(calls):
+    # The server asks for 30s but only a few seconds of the analysis budget remain
+    calls["replies"] = [FakeResponse(429, "30"), FakeResponse(200)]
+    response, attempts = post_with_retry(URL, "goal", {}, deadline=time.monotonic() + 5)
+    assert (response.status_code, attempts) == (429, 1)
+    assert calls["sleeps"] == []
+
+
+def test_open_breaker_fails_fast(calls):
+    breaker = circuit_breaker.get_breaker(URL)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure("HTTP 503")
+    with pytest.raises(circuit_breaker.CircuitOpenError) as raised:
+        post_with_retry(URL, "goal", {})
+    assert raised.value.attempts == 0
+    assert calls["posts"] == 0
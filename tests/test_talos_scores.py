@@ -0,0 +1,95 @@
+"""
+Golden answers for talos_scores: score and classification parsing of
+Q1-Q12 and Hardness Summary text as the agencies actually word it, and the
+local averaging of the parsed Q1-Q12 scores.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from talos_scores import HARD, MODERATE, NOT_HARD, UNKNOWN, parse_answer, score_dimensions, unscored_questions
+
+BANDS = "[Easy: 0-3.0, Moderate: 3.1-4.0, Hard: 4.1-5.0]"
+
+
+@pytest.mark.parametrize("text, score", [
+    ("Score: 4", 4.0),
+    ("Score (0-5): 3.5\nJustification: volatile market", 3.5),
+    ("Overall Difficulty Score: 4.2/5", 4.2),
+    # Label inside a line, not at its start
+    ("Final Score: 4", 4.0),
+    ("The work is hard. Score: 4", 4.0),
+    ("Taking all of it together, the overall difficulty score - 2.5 for this problem.", 2.5),
+    # The scale is a range, never the score
+    ("Rated on a 0–5 scale. Score: 4", 4.0),
+    ("Scale 0-5\nThe problem rates 3 out of 5", 3.0),
+    ("I would rate it 3/5 overall", 3.0),
+    ("No number at all", None),
+    ("Score: 12", None),
+])
+def test_score(text, score):
+    assert parse_answer("Q1", text).score == score
+
+
+@pytest.mark.parametrize("text, classification", [
+    ("Hardness Level: HARD", HARD),
+    ("Hardness Level: Not Hard", NOT_HARD),
+    # The band list is the scale; the chosen band follows it
+    (f"Hardness Level\n{BANDS}\nModerate", MODERATE),
+    (f"Hardness Level:\nEasy: 0-3.0, Moderate: 3.1-4.0, Hard: 4.1-5.0\nHARD", HARD),
+    (f"Hardness Level: {BANDS} Easy", NOT_HARD),
+    # Only the list - fall back to the score's band
+    (f"Overall Difficulty Score: 3.6\nHardness Level\n{BANDS}", MODERATE),
+    (f"Hardness Level\n{BANDS}", UNKNOWN),
+])
+def test_classification(text, classification):
+    assert parse_answer("hardness_summary", text).classification == classification
+
+
+def test_hardness_summary_golden():
+    text = (
+        "HARDNESS SUMMARY\n"
+        "Overall Difficulty Score: 4.3\n"
+        f"Hardness Level\n{BANDS}\nHARD\n"
+        "SME Justification: Demand swings weekly and the data is incomplete.\n"
+        "Key Takeaways:\n- Volatile demand\n- Sparse data\n"
+    )
+    record = parse_answer("hardness_summary", text)
+    assert record.score == 4.3
+    assert record.classification == HARD
+    assert record.justification == "Demand swings weekly and the data is incomplete."
+    assert record.takeaways == ("Volatile demand", "Sparse data")
+
+
+def _answers(**scores):
+    return {name: f"Analysis of {name}.\nScore: {score}" for name, score in scores.items()}
+
+
+def test_score_dimensions_averages():
+    outputs = _answers(Q1=4, Q2=5, Q3=3, Q4=2, Q5=2, Q6=2, Q10=3, Q11=4, Q12=5)
+    local = score_dimensions(outputs)
+    assert local.dimension_averages == (("Volatility", 4.0), ("Ambiguity", 2.0), ("Uncertainty", 4.0))
+    assert local.score == 3.33
+    assert local.classification == MODERATE
+    assert local.scored_questions == 9
+    assert unscored_questions(outputs) == ()
+
+
+def test_score_dimensions_partial_scores():
+    outputs = _answers(Q1=4, Q4=2, Q5=3, Q10=5)
+    outputs["Q2"] = "Analysis without any number"
+    local = score_dimensions(outputs)
+    # Unscored and missing answers are left out of their dimension's average
+    assert local.dimension_averages == (("Volatility", 4.0), ("Ambiguity", 2.5), ("Uncertainty", 5.0))
+    assert local.scored_questions == 4
+    assert unscored_questions(outputs) == ("Q2",)
+
+
+def test_score_dimensions_needs_every_dimension():
+    outputs = _answers(Q1=4, Q4=2)
+    outputs["Q10"] = "No score given"
+    assert score_dimensions(outputs) is None
+    assert unscored_questions(outputs) == ("Q10",)
@@ -0,0 +1,92 @@
+"""
+Near-duplicate matching in talos_similar: normalization, exact shingle
+similarity, and the per-account ProblemIndex with its bound and replacement
+of re-run problems.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from talos_client import QuestionResult
+from talos_similar import (
+    SIMILAR_THRESHOLD, ProblemIndex, index_analysis, jaccard, minhash, normalize_problem, shingle_hashes
+)
+
+PROBLEM = "Reduce customer churn among enterprise laptop buyers in North America over the next two fiscal quarters"
+REWORDED = "Reduce customer churn among enterprise laptop buyers in North America over the next three fiscal quarters"
+UNRELATED = "Forecast weekly demand for spare parts across European warehouses"
+RESULTS = {"vocabulary": "Churn: customers leaving", "Q1": "Score: 4"}
+
+
+def test_normalize_problem():
+    assert normalize_problem("  Reduce CHURN,\n among   buyers! ") == "reduce churn among buyers"
+
+
+def test_jaccard():
+    a = shingle_hashes(PROBLEM)
+    assert jaccard(a, shingle_hashes(PROBLEM.upper() + "!!")) == 1.0
+    assert jaccard(a, shingle_hashes(UNRELATED)) == 0.0
+    assert SIMILAR_THRESHOLD <= jaccard(a, shingle_hashes(REWORDED)) < 1.0
+
+
+def test_minhash_estimates_the_similarity():
+    a, b = shingle_hashes(PROBLEM), shingle_hashes(REWORDED)
+    estimate = (minhash(a) == minhash(b)).mean()
+    assert abs(estimate - jaccard(a, b)) < 0.15
+    assert np.array_equal(minhash(a), minhash(shingle_hashes(PROBLEM)))
+
+
+def test_find_matches_within_the_same_account():
+    index = ProblemIndex()
+    index.add("Dell", "Technology", PROBLEM, RESULTS)
+
+    exact = index.find("Dell", "Technology", f"  {PROBLEM.lower()}. ")
+    assert exact.similarity == 1.0
+    assert exact.analysis.results == RESULTS
+
+    close = index.find("Dell", "Technology", REWORDED)
+    assert close.analysis.problem == PROBLEM
+    assert close.similarity < 1.0
+
+    assert index.find("Dell", "Technology", UNRELATED) is None
+    assert index.find("HP", "Technology", PROBLEM) is None
+    assert index.find("Dell", "Technology", REWORDED, threshold=0.99) is None
+
+
+def test_rerun_replaces_the_earlier_analysis():
+    index = ProblemIndex()
+    index.add("Dell", "Technology", PROBLEM, {"Q1": "Score: 2"})
+    index.add("Dell", "Technology", PROBLEM + "!", {"Q1": "Score: 4"})
+    assert index.size() == 1
+    assert index.find("Dell", "Technology", PROBLEM).analysis.results == {"Q1": "Score: 4"}
+
+
+def test_index_is_bounded_per_account():
+    index = ProblemIndex(max_entries=2)
+    for problem in (PROBLEM, UNRELATED, "Cut invoice processing time for the finance team"):
+        index.add("Dell", "Technology", problem, RESULTS)
+    index.add("HP", "Technology", PROBLEM, RESULTS)
+    assert index.size() == 3
+    # The oldest analysis of Dell was dropped; HP keeps its own
+    assert index.find("Dell", "Technology", PROBLEM) is None
+    assert index.find("Dell", "Technology", UNRELATED) is not None
+    assert index.find("HP", "Technology", PROBLEM) is not None
+
+
+def test_only_clean_analyses_are_indexed():
+    index = ProblemIndex()
+    failed = {
+        "vocabulary": QuestionResult("Churn: customers leaving", True, False, 1),
+        "Q1": QuestionResult("Request timeout", False, False, 3),
+    }
+    index_analysis(index, "Dell", "Technology", PROBLEM, failed)
+    assert index.size() == 0
+
+    ok = dict(failed, Q1=QuestionResult("Score: 4", True, False, 1))
+    index_analysis(index, "Dell", "Technology", PROBLEM, ok)
+    assert index.find("Dell", "Technology", PROBLEM).analysis.results == {
+        "vocabulary": "Churn: customers leaving", "Q1": "Score: 4"
+    }